@@ -30,18 +30,46 @@ module ReadsUtils {
         Optional parameters:
         interleaved - whether the file is interleaved or not. Setting this to
             true disables sequence ID checks.
+        max_workers - the maximum number of files to validate at the same
+            time, each in a separate process. The largest value given for any
+            file in the list applies. Default 1.
+        split_file - whether to split the file into byte ranges that are
+            validated at the same time by the max_workers processes, for
+            large files. The result is the same as validating the file
+            whole. Default false.
     */
     typedef structure {
         string file_path;
         boolean interleaved;
+        int max_workers;
+        boolean split_file;
     } ValidateFASTQParams;
     
+    /* A problem found in a FASTQ file by the validateFASTQ function.
+        
+        record - the number of the record at fault, counting from 1.
+        line - the number of the line at fault, counting from 1.
+        offset - the byte offset of the start of the line at fault.
+        error - a description of the problem.
+        
+        Line numbers and offsets are in the file after blank lines have been
+        removed.
+    */
+    typedef structure {
+        int record;
+        int line;
+        int offset;
+        string error;
+    } FASTQValidationError;
+
     /* The output of the validateFASTQ function.
         
         validated - whether the file validated successfully or not.
+        errors - the problems found in the file, at most 10, if any.
     */
     typedef structure {
         boolean validated;
+        list<FASTQValidationError> errors;
     } ValidateFASTQOutput;
 
     /* Validate a FASTQ file. The file extensions .fq, .fnq, and .fastq
@@ -53,15 +81,15 @@ module ReadsUtils {
     
     /* Input to the upload_reads function.
         
-        If local files are specified for upload, they must be uncompressed.
-        Files will be gzipped prior to upload.
+        Local, web and staging files may be uncompressed or compressed with
+        gzip, bzip2 or xz. Compressed files are read directly, without being
+        uncompressed to disk first. Files will be gzipped prior to upload.
 
         If web files are specified for upload, a download type one of
         ['Direct Download', 'DropBox', 'FTP', 'Google Drive'] must be specified too. 
-        The downloadable file must be uncompressed (except for FTP, .gz file is acceptable). 
 
-        If staging files are specified for upload, the staging file must be uncompressed
-        and must be accessible by current user.
+        If staging files are specified for upload, the staging file must be accessible
+        by current user.
         
         Note that if a reverse read file is specified, it must be a local file
         if the forward reads file is a local file, or a shock id if not.
@@ -177,6 +205,45 @@ module ReadsUtils {
     /* Loads a set of reads to KBase data stores. */
     funcdef upload_reads(UploadReadsParams params) returns(UploadReadsOutput)
         authentication required;
+
+    /* Input to the upload_reads_batch function.
+        list<UploadReadsParams> reads - the reads libraries to upload, each
+            with the parameters for upload_reads.
+        int max_parallel - the maximum number of libraries to download,
+            validate and compress at the same time. Defaults to 1.
+    */
+    typedef structure {
+        list<UploadReadsParams> reads;
+        int max_parallel;
+    } UploadReadsBatchParams;
+
+    /* The result of uploading one reads library with upload_reads_batch.
+
+        obj_ref - a reference to the new Workspace object, as for
+            upload_reads, if the library was uploaded.
+        error - the error that stopped the library being uploaded, if it
+            failed.
+    */
+    typedef structure {
+        string obj_ref;
+        string error;
+    } UploadReadsResult;
+
+    /* The output of the upload_reads_batch function.
+
+        results - the result for each library, in the order of the input.
+    */
+    typedef structure {
+        list<UploadReadsResult> results;
+    } UploadReadsBatchOutput;
+
+    /* Loads many sets of reads to KBase data stores. Workspace names are
+        translated to IDs once, libraries are prepared on up to max_parallel
+        workers, and the files and objects are saved with a few calls for the
+        whole batch. A library that fails doesn't stop the others.
+    */
+    funcdef upload_reads_batch(UploadReadsBatchParams params)
+        returns(UploadReadsBatchOutput) authentication required;
         
    /* Input parameters for downloading reads objects.
         list<read_lib> read_libraries - the the workspace read library objects
@@ -184,10 +251,26 @@ module ReadsUtils {
         tern interleaved - if true, provide the files in interleaved format if
             they are not already. If false, provide forward and reverse reads
             files. If null or missing, leave files as is.
+        int max_parallel - the maximum number of read libraries to download
+            and process at the same time. Defaults to 1.
+        boolean use_cache - if true, reuse the files from earlier downloads of
+            the same read libraries with the same interleaved option by calls
+            sharing the scratch space, and add the files to the cache. The
+            cached files are provided as read only hard links. Defaults to
+            false.
+        string compression - the compression of the provided files, one of
+            'none', 'gzip', 'gzip-fast', 'zstd' or 'native'. gzip-fast is gzip
+            at the fastest level. Files stored in Shock with the requested
+            compression are provided as is when they need no interleaving or
+            deinterleaving. native provides such files as stored, whatever
+            their compression, and gzips the rest. Defaults to 'none'.
     */
     typedef structure {
         list<read_lib> read_libraries;
         tern interleaved;
+        int max_parallel;
+        boolean use_cache;
+        string compression;
     } DownloadReadsParams;
     
     /* Reads file information.
@@ -205,6 +288,9 @@ module ReadsUtils {
         string otype - the original type of the reads. One of 'single',
             'paired', or 'interleaved'.
         string type - one of 'single', 'paired', or 'interleaved'.
+        string encoding - the compression of the files, one of 'none', 'gzip',
+            'zstd', 'bzip2' or 'xz'. Compressed file names end with .gz, .zst,
+            .bz2 or .xz.
      */
     typedef structure {
         string fwd;
@@ -213,6 +299,7 @@ module ReadsUtils {
         string rev_name;
         string otype;
         string type;
+        string encoding;
     } ReadsFiles;
     
     /* Information about each set of reads.
@@ -303,9 +390,41 @@ module ReadsUtils {
     } ExportOutput;
 
     /* KBase downloader function. Packages a set of reads into a zip file and
-        stores the zip in shock.
+        stores the zip in shock. Reads files are packaged with their
+        compression in Shock, so they're never uncompressed on the way.
      */
     funcdef export_reads(ExportParams params)
                 returns (ExportOutput output) authentication required;
 
+    /* Input for the export_reads_batch function.
+        list<read_lib> input_refs - the reads objects to export.
+        boolean single_archive - if true, package all the objects in one zip
+            file, each in a directory named after the object. Otherwise each
+            object is packaged in its own zip file as by export_reads.
+            Defaults to false.
+        int max_parallel - the maximum number of read libraries to download
+            and process at the same time. Defaults to 1.
+     */
+    typedef structure {
+        list<read_lib> input_refs;
+        boolean single_archive;
+        int max_parallel;
+    } ExportReadsBatchParams;
+
+    /* Output of the export_reads_batch function.
+        mapping<read_lib, string> shock_ids - the ID of the Shock node
+            holding the zip file of each reads object. With single_archive
+            every object maps to the same node.
+     */
+    typedef structure {
+        mapping<read_lib, string> shock_ids;
+    } ExportReadsBatchOutput;
+
+    /* Packages many reads objects as export_reads does, getting the object
+        information in one workspace call and downloading the Shock nodes of
+        all the objects at the same time, shared nodes only once.
+     */
+    funcdef export_reads_batch(ExportReadsBatchParams params)
+                returns (ExportReadsBatchOutput output) authentication required;
+
 };
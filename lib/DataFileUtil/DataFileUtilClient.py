@@ -15,7 +15,6 @@ try:
 except:
     # no they aren't
     from baseclient import BaseClient as _BaseClient  # @Reimport
-import time
 
 
 class DataFileUtil(object):
@@ -40,14 +39,6 @@ class DataFileUtil(object):
             async_job_check_time_scale_percent=async_job_check_time_scale_percent,
             async_job_check_max_time_ms=async_job_check_max_time_ms)
 
-    def _check_job(self, job_id):
-        return self._client._check_job('DataFileUtil', job_id)
-
-    def _shock_to_file_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.shock_to_file', [params],
-             self._service_ver, context)
-
     def shock_to_file(self, params, context=None):
         """
         Download a file from Shock.
@@ -84,22 +75,8 @@ class DataFileUtil(object):
            parameter "file_path" of String, parameter "size" of Long,
            parameter "attributes" of mapping from String to unspecified object
         """
-        job_id = self._shock_to_file_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _shock_to_file_mass_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.shock_to_file_mass', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.shock_to_file',
+                                    [params], self._service_ver, context)
 
     def shock_to_file_mass(self, params, context=None):
         """
@@ -137,22 +114,8 @@ class DataFileUtil(object):
            parameter "file_path" of String, parameter "size" of Long,
            parameter "attributes" of mapping from String to unspecified object
         """
-        job_id = self._shock_to_file_mass_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _file_to_shock_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.file_to_shock', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.shock_to_file_mass',
+                                    [params], self._service_ver, context)
 
     def file_to_shock(self, params, context=None):
         """
@@ -196,22 +159,8 @@ class DataFileUtil(object):
            parameter "type" of String, parameter "remote_md5" of String,
            parameter "node_file_name" of String, parameter "size" of String
         """
-        job_id = self._file_to_shock_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _unpack_file_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.unpack_file', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.file_to_shock',
+                                    [params], self._service_ver, context)
 
     def unpack_file(self, params, context=None):
         """
@@ -225,22 +174,8 @@ class DataFileUtil(object):
         :returns: instance of type "UnpackFileResult" -> structure: parameter
            "file_path" of String
         """
-        job_id = self._unpack_file_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _pack_file_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.pack_file', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.unpack_file',
+                                    [params], self._service_ver, context)
 
     def pack_file(self, params, context=None):
         """
@@ -266,22 +201,8 @@ class DataFileUtil(object):
            pack_file function. file_path - the path to the packed file.) ->
            structure: parameter "file_path" of String
         """
-        job_id = self._pack_file_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _package_for_download_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.package_for_download', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.pack_file',
+                                    [params], self._service_ver, context)
 
     def package_for_download(self, params, context=None):
         """
@@ -310,22 +231,8 @@ class DataFileUtil(object):
            "shock_id" of String, parameter "node_file_name" of String,
            parameter "size" of String
         """
-        job_id = self._package_for_download_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _file_to_shock_mass_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.file_to_shock_mass', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.package_for_download',
+                                    [params], self._service_ver, context)
 
     def file_to_shock_mass(self, params, context=None):
         """
@@ -369,22 +276,8 @@ class DataFileUtil(object):
            parameter "type" of String, parameter "remote_md5" of String,
            parameter "node_file_name" of String, parameter "size" of String
         """
-        job_id = self._file_to_shock_mass_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _copy_shock_node_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.copy_shock_node', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.file_to_shock_mass',
+                                    [params], self._service_ver, context)
 
     def copy_shock_node(self, params, context=None):
         """
@@ -410,22 +303,8 @@ class DataFileUtil(object):
            of String, parameter "type" of String, parameter "remote_md5" of
            String
         """
-        job_id = self._copy_shock_node_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _own_shock_node_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.own_shock_node', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.copy_shock_node',
+                                    [params], self._service_ver, context)
 
     def own_shock_node(self, params, context=None):
         """
@@ -459,22 +338,8 @@ class DataFileUtil(object):
            of String, parameter "type" of String, parameter "remote_md5" of
            String
         """
-        job_id = self._own_shock_node_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _ws_name_to_id_submit(self, name, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.ws_name_to_id', [name],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.own_shock_node',
+                                    [params], self._service_ver, context)
 
     def ws_name_to_id(self, name, context=None):
         """
@@ -482,22 +347,8 @@ class DataFileUtil(object):
         :param name: instance of String
         :returns: instance of Long
         """
-        job_id = self._ws_name_to_id_submit(name, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _save_objects_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.save_objects', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.ws_name_to_id',
+                                    [name], self._service_ver, context)
 
     def save_objects(self, params, context=None):
         """
@@ -542,22 +393,8 @@ class DataFileUtil(object):
            parameter "chsum" of String, parameter "size" of Long, parameter
            "meta" of mapping from String to String
         """
-        job_id = self._save_objects_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _get_objects_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.get_objects', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.save_objects',
+                                    [params], self._service_ver, context)
 
     def get_objects(self, params, context=None):
         """
@@ -596,22 +433,8 @@ class DataFileUtil(object):
            parameter "chsum" of String, parameter "size" of Long, parameter
            "meta" of mapping from String to String
         """
-        job_id = self._get_objects_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _versions_submit(self, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.versions', [],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.get_objects',
+                                    [params], self._service_ver, context)
 
     def versions(self, context=None):
         """
@@ -619,22 +442,8 @@ class DataFileUtil(object):
         :returns: multiple set - (1) parameter "wsver" of String, (2)
            parameter "shockver" of String
         """
-        job_id = self._versions_submit(context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result']
-
-    def _download_staging_file_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.download_staging_file', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.versions',
+                                    [], self._service_ver, context)
 
     def download_staging_file(self, params, context=None):
         """
@@ -652,22 +461,8 @@ class DataFileUtil(object):
            scratch area path) -> structure: parameter "copy_file_path" of
            String
         """
-        job_id = self._download_staging_file_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
-
-    def _download_web_file_submit(self, params, context=None):
-        return self._client._submit_job(
-             'DataFileUtil.download_web_file', [params],
-             self._service_ver, context)
+        return self._client.run_job('DataFileUtil.download_staging_file',
+                                    [params], self._service_ver, context)
 
     def download_web_file(self, params, context=None):
         """
@@ -681,28 +476,9 @@ class DataFileUtil(object):
            download_web_file function. copy_file_path: copied file scratch
            area path) -> structure: parameter "copy_file_path" of String
         """
-        job_id = self._download_web_file_submit(params, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
+        return self._client.run_job('DataFileUtil.download_web_file',
+                                    [params], self._service_ver, context)
 
     def status(self, context=None):
-        job_id = self._client._submit_job('DataFileUtil.status', 
-            [], self._service_ver, context)
-        async_job_check_time = self._client.async_job_check_time
-        while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                self._client.async_job_check_time_scale_percent / 100.0)
-            if async_job_check_time > self._client.async_job_check_max_time:
-                async_job_check_time = self._client.async_job_check_max_time
-            job_state = self._check_job(job_id)
-            if job_state['finished']:
-                return job_state['result'][0]
+        return self._client.run_job('DataFileUtil.status',
+                                    [], self._service_ver, context)
@@ -125,9 +125,17 @@ $out is a reference to a list where each element is a ReadsUtils.ValidateFASTQOu
 ValidateFASTQParams is a reference to a hash where the following keys are defined:
 	file_path has a value which is a string
 	interleaved has a value which is a ReadsUtils.boolean
+	max_workers has a value which is an int
+	split_file has a value which is a ReadsUtils.boolean
 boolean is an int
 ValidateFASTQOutput is a reference to a hash where the following keys are defined:
 	validated has a value which is a ReadsUtils.boolean
+	errors has a value which is a reference to a list where each element is a ReadsUtils.FASTQValidationError
+FASTQValidationError is a reference to a hash where the following keys are defined:
+	record has a value which is an int
+	line has a value which is an int
+	offset has a value which is an int
+	error has a value which is a string
 
 </pre>
 
@@ -140,9 +148,17 @@ $out is a reference to a list where each element is a ReadsUtils.ValidateFASTQOu
 ValidateFASTQParams is a reference to a hash where the following keys are defined:
 	file_path has a value which is a string
 	interleaved has a value which is a ReadsUtils.boolean
+	max_workers has a value which is an int
+	split_file has a value which is a ReadsUtils.boolean
 boolean is an int
 ValidateFASTQOutput is a reference to a hash where the following keys are defined:
 	validated has a value which is a ReadsUtils.boolean
+	errors has a value which is a reference to a list where each element is a ReadsUtils.FASTQValidationError
+FASTQValidationError is a reference to a hash where the following keys are defined:
+	record has a value which is an int
+	line has a value which is an int
+	offset has a value which is an int
+	error has a value which is a string
 
 
 =end text
@@ -381,6 +397,197 @@ Loads a set of reads to KBase data stores.
  
 
 
+=head2 upload_reads_batch
+
+  $return = $obj->upload_reads_batch($params)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$params is a ReadsUtils.UploadReadsBatchParams
+$return is a ReadsUtils.UploadReadsBatchOutput
+UploadReadsBatchParams is a reference to a hash where the following keys are defined:
+	reads has a value which is a reference to a list where each element is a ReadsUtils.UploadReadsParams
+	max_parallel has a value which is an int
+UploadReadsParams is a reference to a hash where the following keys are defined:
+	fwd_id has a value which is a string
+	fwd_file has a value which is a string
+	wsid has a value which is an int
+	wsname has a value which is a string
+	objid has a value which is an int
+	name has a value which is a string
+	rev_id has a value which is a string
+	rev_file has a value which is a string
+	sequencing_tech has a value which is a string
+	single_genome has a value which is a ReadsUtils.boolean
+	strain has a value which is a KBaseCommon.StrainInfo
+	source has a value which is a KBaseCommon.SourceInfo
+	interleaved has a value which is a ReadsUtils.boolean
+	read_orientation_outward has a value which is a ReadsUtils.boolean
+	insert_size_mean has a value which is a float
+	insert_size_std_dev has a value which is a float
+	source_reads_ref has a value which is a string
+	fwd_file_url has a value which is a string
+	rev_file_url has a value which is a string
+	fwd_staging_file_name has a value which is a string
+	rev_staging_file_name has a value which is a string
+	download_type has a value which is a string
+boolean is an int
+StrainInfo is a reference to a hash where the following keys are defined:
+	genetic_code has a value which is an int
+	genus has a value which is a string
+	species has a value which is a string
+	strain has a value which is a string
+	organelle has a value which is a string
+	source has a value which is a KBaseCommon.SourceInfo
+	ncbi_taxid has a value which is an int
+	location has a value which is a KBaseCommon.Location
+SourceInfo is a reference to a hash where the following keys are defined:
+	source has a value which is a string
+	source_id has a value which is a KBaseCommon.source_id
+	project_id has a value which is a KBaseCommon.project_id
+source_id is a string
+project_id is a string
+Location is a reference to a hash where the following keys are defined:
+	lat has a value which is a float
+	lon has a value which is a float
+	elevation has a value which is a float
+	date has a value which is a string
+	description has a value which is a string
+UploadReadsBatchOutput is a reference to a hash where the following keys are defined:
+	results has a value which is a reference to a list where each element is a ReadsUtils.UploadReadsResult
+UploadReadsResult is a reference to a hash where the following keys are defined:
+	obj_ref has a value which is a string
+	error has a value which is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+$params is a ReadsUtils.UploadReadsBatchParams
+$return is a ReadsUtils.UploadReadsBatchOutput
+UploadReadsBatchParams is a reference to a hash where the following keys are defined:
+	reads has a value which is a reference to a list where each element is a ReadsUtils.UploadReadsParams
+	max_parallel has a value which is an int
+UploadReadsParams is a reference to a hash where the following keys are defined:
+	fwd_id has a value which is a string
+	fwd_file has a value which is a string
+	wsid has a value which is an int
+	wsname has a value which is a string
+	objid has a value which is an int
+	name has a value which is a string
+	rev_id has a value which is a string
+	rev_file has a value which is a string
+	sequencing_tech has a value which is a string
+	single_genome has a value which is a ReadsUtils.boolean
+	strain has a value which is a KBaseCommon.StrainInfo
+	source has a value which is a KBaseCommon.SourceInfo
+	interleaved has a value which is a ReadsUtils.boolean
+	read_orientation_outward has a value which is a ReadsUtils.boolean
+	insert_size_mean has a value which is a float
+	insert_size_std_dev has a value which is a float
+	source_reads_ref has a value which is a string
+	fwd_file_url has a value which is a string
+	rev_file_url has a value which is a string
+	fwd_staging_file_name has a value which is a string
+	rev_staging_file_name has a value which is a string
+	download_type has a value which is a string
+boolean is an int
+StrainInfo is a reference to a hash where the following keys are defined:
+	genetic_code has a value which is an int
+	genus has a value which is a string
+	species has a value which is a string
+	strain has a value which is a string
+	organelle has a value which is a string
+	source has a value which is a KBaseCommon.SourceInfo
+	ncbi_taxid has a value which is an int
+	location has a value which is a KBaseCommon.Location
+SourceInfo is a reference to a hash where the following keys are defined:
+	source has a value which is a string
+	source_id has a value which is a KBaseCommon.source_id
+	project_id has a value which is a KBaseCommon.project_id
+source_id is a string
+project_id is a string
+Location is a reference to a hash where the following keys are defined:
+	lat has a value which is a float
+	lon has a value which is a float
+	elevation has a value which is a float
+	date has a value which is a string
+	description has a value which is a string
+UploadReadsBatchOutput is a reference to a hash where the following keys are defined:
+	results has a value which is a reference to a list where each element is a ReadsUtils.UploadReadsResult
+UploadReadsResult is a reference to a hash where the following keys are defined:
+	obj_ref has a value which is a string
+	error has a value which is a string
+
+
+=end text
+
+=item Description
+
+Loads many sets of reads to KBase data stores. Workspace names are
+translated to IDs once, libraries are prepared on up to max_parallel
+workers, and the files and objects are saved with a few calls for the
+whole batch. A library that fails doesn't stop the others.
+
+=back
+
+=cut
+
+ sub upload_reads_batch
+{
+    my($self, @args) = @_;
+
+# Authentication: required
+
+    if ((my $n = @args) != 1)
+    {
+	Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+							       "Invalid argument count for function upload_reads_batch (received $n, expecting 1)");
+    }
+    {
+	my($params) = @args;
+
+	my @_bad_arguments;
+        (ref($params) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 1 \"params\" (value was \"$params\")");
+        if (@_bad_arguments) {
+	    my $msg = "Invalid arguments passed to upload_reads_batch:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+	    Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+								   method_name => 'upload_reads_batch');
+	}
+    }
+
+    my $url = $self->{url};
+    my $result = $self->{client}->call($url, $self->{headers}, {
+	    method => "ReadsUtils.upload_reads_batch",
+	    params => \@args,
+    });
+    if ($result) {
+	if ($result->is_error) {
+	    Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+					       code => $result->content->{error}->{code},
+					       method_name => 'upload_reads_batch',
+					       data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+					      );
+	} else {
+	    return wantarray ? @{$result->result} : $result->result->[0];
+	}
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method upload_reads_batch",
+					    status_line => $self->{client}->status_line,
+					    method_name => 'upload_reads_batch',
+				       );
+    }
+}
+ 
+
+
 =head2 download_reads
 
   $output = $obj->download_reads($params)
@@ -397,8 +604,12 @@ $output is a ReadsUtils.DownloadReadsOutput
 DownloadReadsParams is a reference to a hash where the following keys are defined:
 	read_libraries has a value which is a reference to a list where each element is a ReadsUtils.read_lib
 	interleaved has a value which is a ReadsUtils.tern
+	max_parallel has a value which is an int
+	use_cache has a value which is a ReadsUtils.boolean
+	compression has a value which is a string
 read_lib is a string
 tern is a string
+boolean is an int
 DownloadReadsOutput is a reference to a hash where the following keys are defined:
 	files has a value which is a reference to a hash where the key is a ReadsUtils.read_lib and the value is a ReadsUtils.DownloadedReadLibrary
 DownloadedReadLibrary is a reference to a hash where the following keys are defined:
@@ -431,6 +642,7 @@ ReadsFiles is a reference to a hash where the following keys are defined:
 	rev_name has a value which is a string
 	otype has a value which is a string
 	type has a value which is a string
+	encoding has a value which is a string
 StrainInfo is a reference to a hash where the following keys are defined:
 	genetic_code has a value which is an int
 	genus has a value which is a string
@@ -464,8 +676,12 @@ $output is a ReadsUtils.DownloadReadsOutput
 DownloadReadsParams is a reference to a hash where the following keys are defined:
 	read_libraries has a value which is a reference to a list where each element is a ReadsUtils.read_lib
 	interleaved has a value which is a ReadsUtils.tern
+	max_parallel has a value which is an int
+	use_cache has a value which is a ReadsUtils.boolean
+	compression has a value which is a string
 read_lib is a string
 tern is a string
+boolean is an int
 DownloadReadsOutput is a reference to a hash where the following keys are defined:
 	files has a value which is a reference to a hash where the key is a ReadsUtils.read_lib and the value is a ReadsUtils.DownloadedReadLibrary
 DownloadedReadLibrary is a reference to a hash where the following keys are defined:
@@ -498,6 +714,7 @@ ReadsFiles is a reference to a hash where the following keys are defined:
 	rev_name has a value which is a string
 	otype has a value which is a string
 	type has a value which is a string
+	encoding has a value which is a string
 StrainInfo is a reference to a hash where the following keys are defined:
 	genetic_code has a value which is an int
 	genus has a value which is a string
@@ -617,7 +834,8 @@ ExportOutput is a reference to a hash where the following keys are defined:
 =item Description
 
 KBase downloader function. Packages a set of reads into a zip file and
-stores the zip in shock.
+stores the zip in shock. Reads files are packaged with their
+compression in Shock, so they're never uncompressed on the way.
 
 =back
 
@@ -669,6 +887,106 @@ stores the zip in shock.
     }
 }
  
+
+
+=head2 export_reads_batch
+
+  $output = $obj->export_reads_batch($params)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$params is a ReadsUtils.ExportReadsBatchParams
+$output is a ReadsUtils.ExportReadsBatchOutput
+ExportReadsBatchParams is a reference to a hash where the following keys are defined:
+	input_refs has a value which is a reference to a list where each element is a ReadsUtils.read_lib
+	single_archive has a value which is a ReadsUtils.boolean
+	max_parallel has a value which is an int
+read_lib is a string
+boolean is an int
+ExportReadsBatchOutput is a reference to a hash where the following keys are defined:
+	shock_ids has a value which is a reference to a hash where the key is a ReadsUtils.read_lib and the value is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+$params is a ReadsUtils.ExportReadsBatchParams
+$output is a ReadsUtils.ExportReadsBatchOutput
+ExportReadsBatchParams is a reference to a hash where the following keys are defined:
+	input_refs has a value which is a reference to a list where each element is a ReadsUtils.read_lib
+	single_archive has a value which is a ReadsUtils.boolean
+	max_parallel has a value which is an int
+read_lib is a string
+boolean is an int
+ExportReadsBatchOutput is a reference to a hash where the following keys are defined:
+	shock_ids has a value which is a reference to a hash where the key is a ReadsUtils.read_lib and the value is a string
+
+
+=end text
+
+=item Description
+
+Packages many reads objects as export_reads does, getting the object
+information in one workspace call and downloading the Shock nodes of
+all the objects at the same time, shared nodes only once.
+
+=back
+
+=cut
+
+ sub export_reads_batch
+{
+    my($self, @args) = @_;
+
+# Authentication: required
+
+    if ((my $n = @args) != 1)
+    {
+	Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+							       "Invalid argument count for function export_reads_batch (received $n, expecting 1)");
+    }
+    {
+	my($params) = @args;
+
+	my @_bad_arguments;
+        (ref($params) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 1 \"params\" (value was \"$params\")");
+        if (@_bad_arguments) {
+	    my $msg = "Invalid arguments passed to export_reads_batch:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+	    Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+								   method_name => 'export_reads_batch');
+	}
+    }
+
+    my $url = $self->{url};
+    my $result = $self->{client}->call($url, $self->{headers}, {
+	    method => "ReadsUtils.export_reads_batch",
+	    params => \@args,
+    });
+    if ($result) {
+	if ($result->is_error) {
+	    Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+					       code => $result->content->{error}->{code},
+					       method_name => 'export_reads_batch',
+					       data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+					      );
+	} else {
+	    return wantarray ? @{$result->result} : $result->result->[0];
+	}
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method export_reads_batch",
+					    status_line => $self->{client}->status_line,
+					    method_name => 'export_reads_batch',
+				       );
+    }
+}
+ 
   
 sub status
 {
@@ -712,16 +1030,16 @@ sub version {
             Bio::KBase::Exceptions::JSONRPC->throw(
                 error => $result->error_message,
                 code => $result->content->{code},
-                method_name => 'export_reads',
+                method_name => 'export_reads_batch',
             );
         } else {
             return wantarray ? @{$result->result} : $result->result->[0];
         }
     } else {
         Bio::KBase::Exceptions::HTTP->throw(
-            error => "Error invoking method export_reads",
+            error => "Error invoking method export_reads_batch",
             status_line => $self->{client}->status_line,
-            method_name => 'export_reads',
+            method_name => 'export_reads_batch',
         );
     }
 }
@@ -872,6 +1190,13 @@ Input to the validateFASTQ function.
     Optional parameters:
     interleaved - whether the file is interleaved or not. Setting this to
         true disables sequence ID checks.
+    max_workers - the maximum number of files to validate at the same
+        time, each in a separate process. The largest value given for any
+        file in the list applies. Default 1.
+    split_file - whether to split the file into byte ranges that are
+        validated at the same time by the max_workers processes, for
+        large files. The result is the same as validating the file
+        whole. Default false.
 
 
 =item Definition
@@ -882,6 +1207,8 @@ Input to the validateFASTQ function.
 a reference to a hash where the following keys are defined:
 file_path has a value which is a string
 interleaved has a value which is a ReadsUtils.boolean
+max_workers has a value which is an int
+split_file has a value which is a ReadsUtils.boolean
 
 </pre>
 
@@ -892,6 +1219,57 @@ interleaved has a value which is a ReadsUtils.boolean
 a reference to a hash where the following keys are defined:
 file_path has a value which is a string
 interleaved has a value which is a ReadsUtils.boolean
+max_workers has a value which is an int
+split_file has a value which is a ReadsUtils.boolean
+
+
+=end text
+
+=back
+
+
+
+=head2 FASTQValidationError
+
+=over 4
+
+
+
+=item Description
+
+A problem found in a FASTQ file by the validateFASTQ function.
+
+record - the number of the record at fault, counting from 1.
+line - the number of the line at fault, counting from 1.
+offset - the byte offset of the start of the line at fault.
+error - a description of the problem.
+
+Line numbers and offsets are in the file after blank lines have been
+removed.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+record has a value which is an int
+line has a value which is an int
+offset has a value which is an int
+error has a value which is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+record has a value which is an int
+line has a value which is an int
+offset has a value which is an int
+error has a value which is a string
 
 
 =end text
@@ -911,6 +1289,7 @@ interleaved has a value which is a ReadsUtils.boolean
 The output of the validateFASTQ function.
 
 validated - whether the file validated successfully or not.
+errors - the problems found in the file, at most 10, if any.
 
 
 =item Definition
@@ -920,6 +1299,7 @@ validated - whether the file validated successfully or not.
 <pre>
 a reference to a hash where the following keys are defined:
 validated has a value which is a ReadsUtils.boolean
+errors has a value which is a reference to a list where each element is a ReadsUtils.FASTQValidationError
 
 </pre>
 
@@ -929,6 +1309,7 @@ validated has a value which is a ReadsUtils.boolean
 
 a reference to a hash where the following keys are defined:
 validated has a value which is a ReadsUtils.boolean
+errors has a value which is a reference to a list where each element is a ReadsUtils.FASTQValidationError
 
 
 =end text
@@ -947,15 +1328,15 @@ validated has a value which is a ReadsUtils.boolean
 
 Input to the upload_reads function.
 
-If local files are specified for upload, they must be uncompressed.
-Files will be gzipped prior to upload.
+Local, web and staging files may be uncompressed or compressed with
+gzip, bzip2 or xz. Compressed files are read directly, without being
+uncompressed to disk first. Files will be gzipped prior to upload.
 
 If web files are specified for upload, a download type one of
 ['Direct Download', 'DropBox', 'FTP', 'Google Drive'] must be specified too. 
-The downloadable file must be uncompressed (except for FTP, .gz file is acceptable). 
 
-If staging files are specified for upload, the staging file must be uncompressed
-and must be accessible by current user.
+If staging files are specified for upload, the staging file must be accessible
+by current user.
 
 Note that if a reverse read file is specified, it must be a local file
 if the forward reads file is a local file, or a shock id if not.
@@ -1138,6 +1519,126 @@ obj_ref has a value which is a string
 
 
 
+=head2 UploadReadsBatchParams
+
+=over 4
+
+
+
+=item Description
+
+Input to the upload_reads_batch function.
+list<UploadReadsParams> reads - the reads libraries to upload, each
+    with the parameters for upload_reads.
+int max_parallel - the maximum number of libraries to download,
+    validate and compress at the same time. Defaults to 1.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+reads has a value which is a reference to a list where each element is a ReadsUtils.UploadReadsParams
+max_parallel has a value which is an int
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+reads has a value which is a reference to a list where each element is a ReadsUtils.UploadReadsParams
+max_parallel has a value which is an int
+
+
+=end text
+
+=back
+
+
+
+=head2 UploadReadsResult
+
+=over 4
+
+
+
+=item Description
+
+The result of uploading one reads library with upload_reads_batch.
+
+obj_ref - a reference to the new Workspace object, as for
+    upload_reads, if the library was uploaded.
+error - the error that stopped the library being uploaded, if it
+    failed.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+obj_ref has a value which is a string
+error has a value which is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+obj_ref has a value which is a string
+error has a value which is a string
+
+
+=end text
+
+=back
+
+
+
+=head2 UploadReadsBatchOutput
+
+=over 4
+
+
+
+=item Description
+
+The output of the upload_reads_batch function.
+
+results - the result for each library, in the order of the input.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+results has a value which is a reference to a list where each element is a ReadsUtils.UploadReadsResult
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+results has a value which is a reference to a list where each element is a ReadsUtils.UploadReadsResult
+
+
+=end text
+
+=back
+
+
+
 =head2 DownloadReadsParams
 
 =over 4
@@ -1152,6 +1653,19 @@ list<read_lib> read_libraries - the the workspace read library objects
 tern interleaved - if true, provide the files in interleaved format if
     they are not already. If false, provide forward and reverse reads
     files. If null or missing, leave files as is.
+int max_parallel - the maximum number of read libraries to download
+    and process at the same time. Defaults to 1.
+boolean use_cache - if true, reuse the files from earlier downloads of
+    the same read libraries with the same interleaved option by calls
+    sharing the scratch space, and add the files to the cache. The
+    cached files are provided as read only hard links. Defaults to
+    false.
+string compression - the compression of the provided files, one of
+    'none', 'gzip', 'gzip-fast', 'zstd' or 'native'. gzip-fast is gzip
+    at the fastest level. Files stored in Shock with the requested
+    compression are provided as is when they need no interleaving or
+    deinterleaving. native provides such files as stored, whatever
+    their compression, and gzips the rest. Defaults to 'none'.
 
 
 =item Definition
@@ -1162,6 +1676,9 @@ tern interleaved - if true, provide the files in interleaved format if
 a reference to a hash where the following keys are defined:
 read_libraries has a value which is a reference to a list where each element is a ReadsUtils.read_lib
 interleaved has a value which is a ReadsUtils.tern
+max_parallel has a value which is an int
+use_cache has a value which is a ReadsUtils.boolean
+compression has a value which is a string
 
 </pre>
 
@@ -1172,6 +1689,9 @@ interleaved has a value which is a ReadsUtils.tern
 a reference to a hash where the following keys are defined:
 read_libraries has a value which is a reference to a list where each element is a ReadsUtils.read_lib
 interleaved has a value which is a ReadsUtils.tern
+max_parallel has a value which is an int
+use_cache has a value which is a ReadsUtils.boolean
+compression has a value which is a string
 
 
 =end text
@@ -1203,6 +1723,9 @@ string rev_name - the name of the reverse reads file from Shock, or
 string otype - the original type of the reads. One of 'single',
     'paired', or 'interleaved'.
 string type - one of 'single', 'paired', or 'interleaved'.
+string encoding - the compression of the files, one of 'none', 'gzip',
+    'zstd', 'bzip2' or 'xz'. Compressed file names end with .gz, .zst,
+    .bz2 or .xz.
 
 
 =item Definition
@@ -1217,6 +1740,7 @@ rev has a value which is a string
 rev_name has a value which is a string
 otype has a value which is a string
 type has a value which is a string
+encoding has a value which is a string
 
 </pre>
 
@@ -1231,6 +1755,7 @@ rev has a value which is a string
 rev_name has a value which is a string
 otype has a value which is a string
 type has a value which is a string
+encoding has a value which is a string
 
 
 =end text
@@ -1459,6 +1984,90 @@ shock_id has a value which is a string
 
 
 
+=head2 ExportReadsBatchParams
+
+=over 4
+
+
+
+=item Description
+
+Input for the export_reads_batch function.
+list<read_lib> input_refs - the reads objects to export.
+boolean single_archive - if true, package all the objects in one zip
+    file, each in a directory named after the object. Otherwise each
+    object is packaged in its own zip file as by export_reads.
+    Defaults to false.
+int max_parallel - the maximum number of read libraries to download
+    and process at the same time. Defaults to 1.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+input_refs has a value which is a reference to a list where each element is a ReadsUtils.read_lib
+single_archive has a value which is a ReadsUtils.boolean
+max_parallel has a value which is an int
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+input_refs has a value which is a reference to a list where each element is a ReadsUtils.read_lib
+single_archive has a value which is a ReadsUtils.boolean
+max_parallel has a value which is an int
+
+
+=end text
+
+=back
+
+
+
+=head2 ExportReadsBatchOutput
+
+=over 4
+
+
+
+=item Description
+
+Output of the export_reads_batch function.
+mapping<read_lib, string> shock_ids - the ID of the Shock node
+    holding the zip file of each reads object. With single_archive
+    every object maps to the same node.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+shock_ids has a value which is a reference to a hash where the key is a ReadsUtils.read_lib and the value is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+shock_ids has a value which is a reference to a hash where the key is a ReadsUtils.read_lib and the value is a string
+
+
+=end text
+
+=back
+
+
+
 =cut
 
 package ReadsUtils::ReadsUtilsClient::RpcClient;
@@ -42,14 +42,31 @@ class ReadsUtils(object):
            to the validateFASTQ function. Required parameters: file_path -
            the path to the file to validate. Optional parameters: interleaved
            - whether the file is interleaved or not. Setting this to true
-           disables sequence ID checks.) -> structure: parameter "file_path"
-           of String, parameter "interleaved" of type "boolean" (A boolean -
-           0 for false, 1 for true. @range (0, 1))
+           disables sequence ID checks. max_workers - the maximum number of
+           files to validate at the same time, each in a separate process.
+           The largest value given for any file in the list applies. Default
+           1. split_file - whether to split the file into byte ranges that
+           are validated at the same time by the max_workers processes, for
+           large files. The result is the same as validating the file whole.
+           Default false.) -> structure: parameter "file_path" of String,
+           parameter "interleaved" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1)), parameter "max_workers" of
+           Long, parameter "split_file" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1))
         :returns: instance of list of type "ValidateFASTQOutput" (The output
            of the validateFASTQ function. validated - whether the file
-           validated successfully or not.) -> structure: parameter
-           "validated" of type "boolean" (A boolean - 0 for false, 1 for
-           true. @range (0, 1))
+           validated successfully or not. errors - the problems found in the
+           file, at most 10, if any.) -> structure: parameter "validated" of
+           type "boolean" (A boolean - 0 for false, 1 for true. @range (0,
+           1)), parameter "errors" of list of type "FASTQValidationError" (A
+           problem found in a FASTQ file by the validateFASTQ function.
+           record - the number of the record at fault, counting from 1. line
+           - the number of the line at fault, counting from 1. offset - the
+           byte offset of the start of the line at fault. error - a
+           description of the problem. Line numbers and offsets are in the
+           file after blank lines have been removed.) -> structure: parameter
+           "record" of Long, parameter "line" of Long, parameter "offset" of
+           Long, parameter "error" of String
         """
         return self._client.call_method(
             'ReadsUtils.validateFASTQ',
@@ -59,23 +76,23 @@ class ReadsUtils(object):
         """
         Loads a set of reads to KBase data stores.
         :param params: instance of type "UploadReadsParams" (Input to the
-           upload_reads function. If local files are specified for upload,
-           they must be uncompressed. Files will be gzipped prior to upload.
-           If web files are specified for upload, a download type one of
-           ['Direct Download', 'DropBox', 'FTP', 'Google Drive'] must be
-           specified too. The downloadable file must be uncompressed (except
-           for FTP, .gz file is acceptable). If staging files are specified
-           for upload, the staging file must be uncompressed and must be
-           accessible by current user. Note that if a reverse read file is
-           specified, it must be a local file if the forward reads file is a
-           local file, or a shock id if not. If a reverse web file or staging
-           file is specified, the reverse file category must match the
-           forward file category. If a reverse file is specified the uploader
-           will will automatically intereave the forward and reverse files
-           and store that in shock. Additionally the statistics generated are
-           on the resulting interleaved file. Required parameters: fwd_id -
-           the id of the shock node containing the reads data file: either
-           single end reads, forward/left reads, or interleaved reads. - OR -
+           upload_reads function. Local, web and staging files may be
+           uncompressed or compressed with gzip, bzip2 or xz. Compressed
+           files are read directly, without being uncompressed to disk first.
+           Files will be gzipped prior to upload. If web files are specified
+           for upload, a download type one of ['Direct Download', 'DropBox',
+           'FTP', 'Google Drive'] must be specified too. If staging files are
+           specified for upload, the staging file must be accessible by
+           current user. Note that if a reverse read file is specified, it
+           must be a local file if the forward reads file is a local file, or
+           a shock id if not. If a reverse web file or staging file is
+           specified, the reverse file category must match the forward file
+           category. If a reverse file is specified the uploader will will
+           automatically intereave the forward and reverse files and store
+           that in shock. Additionally the statistics generated are on the
+           resulting interleaved file. Required parameters: fwd_id - the id
+           of the shock node containing the reads data file: either single
+           end reads, forward/left reads, or interleaved reads. - OR -
            fwd_file - a local path to the reads data file: either single end
            reads, forward/left reads, or interleaved reads. - OR -
            fwd_file_url - a download link that contains reads data file:
@@ -187,6 +204,151 @@ class ReadsUtils(object):
             'ReadsUtils.upload_reads',
             [params], self._service_ver, context)
 
+    def upload_reads_batch(self, params, context=None):
+        """
+        Loads many sets of reads to KBase data stores. Workspace names are
+        translated to IDs once, libraries are prepared on up to max_parallel
+        workers, and the files and objects are saved with a few calls for the
+        whole batch. A library that fails doesn't stop the others.
+        :param params: instance of type "UploadReadsBatchParams" (Input to
+           the upload_reads_batch function. list<UploadReadsParams> reads -
+           the reads libraries to upload, each with the parameters for
+           upload_reads. int max_parallel - the maximum number of libraries
+           to download, validate and compress at the same time. Defaults to
+           1.) -> structure: parameter "reads" of list of type
+           "UploadReadsParams" (Input to the upload_reads function. Local,
+           web and staging files may be uncompressed or compressed with gzip,
+           bzip2 or xz. Compressed files are read directly, without being
+           uncompressed to disk first. Files will be gzipped prior to upload.
+           If web files are specified for upload, a download type one of
+           ['Direct Download', 'DropBox', 'FTP', 'Google Drive'] must be
+           specified too. If staging files are specified for upload, the
+           staging file must be accessible by current user. Note that if a
+           reverse read file is specified, it must be a local file if the
+           forward reads file is a local file, or a shock id if not. If a
+           reverse web file or staging file is specified, the reverse file
+           category must match the forward file category. If a reverse file
+           is specified the uploader will will automatically intereave the
+           forward and reverse files and store that in shock. Additionally
+           the statistics generated are on the resulting interleaved file.
+           Required parameters: fwd_id - the id of the shock node containing
+           the reads data file: either single end reads, forward/left reads,
+           or interleaved reads. - OR - fwd_file - a local path to the reads
+           data file: either single end reads, forward/left reads, or
+           interleaved reads. - OR - fwd_file_url - a download link that
+           contains reads data file: either single end reads, forward/left
+           reads, or interleaved reads. download_type - download type
+           ['Direct Download', 'FTP', 'DropBox', 'Google Drive'] - OR -
+           fwd_staging_file_name - reads data file name/ subdirectory path in
+           staging area: either single end reads, forward/left reads, or
+           interleaved reads. sequencing_tech - the sequencing technology
+           used to produce the reads. (If source_reads_ref is specified then
+           sequencing_tech must not be specified) One of: wsid - the id of
+           the workspace where the reads will be saved (preferred). wsname -
+           the name of the workspace where the reads will be saved. One of:
+           objid - the id of the workspace object to save over name - the
+           name to which the workspace object will be saved Optional
+           parameters: rev_id - the shock node id containing the
+           reverse/right reads for paired end, non-interleaved reads. - OR -
+           rev_file - a local path to the reads data file containing the
+           reverse/right reads for paired end, non-interleaved reads, note
+           the reverse file will get interleaved with the forward file. - OR
+           - rev_file_url - a download link that contains reads data file:
+           reverse/right reads for paired end, non-interleaved reads. - OR -
+           rev_staging_file_name - reads data file name in staging area:
+           reverse/right reads for paired end, non-interleaved reads.
+           single_genome - whether the reads are from a single genome or a
+           metagenome. Default is single genome. strain - information about
+           the organism strain that was sequenced. source - information about
+           the organism source. interleaved - specify that the fwd reads file
+           is an interleaved paired end reads file as opposed to a single end
+           reads file. Default true, ignored if rev_id is specified.
+           read_orientation_outward - whether the read orientation is outward
+           from the set of primers. Default is false and is ignored for
+           single end reads. insert_size_mean - the mean size of the genetic
+           fragments. Ignored for single end reads. insert_size_std_dev - the
+           standard deviation of the size of the genetic fragments. Ignored
+           for single end reads. source_reads_ref - A workspace reference to
+           a source reads object. This is used to propogate user defined info
+           from the source reads object to the new reads object (used for
+           filtering or trimming services). Note this causes a passed in
+           insert_size_mean, insert_size_std_dev, sequencing_tech,
+           read_orientation_outward, strain, source and/or single_genome to
+           throw an error.) -> structure: parameter "fwd_id" of String,
+           parameter "fwd_file" of String, parameter "wsid" of Long,
+           parameter "wsname" of String, parameter "objid" of Long, parameter
+           "name" of String, parameter "rev_id" of String, parameter
+           "rev_file" of String, parameter "sequencing_tech" of String,
+           parameter "single_genome" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1)), parameter "strain" of type
+           "StrainInfo" (Information about a strain. genetic_code - the
+           genetic code of the strain. See
+           http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c
+           genus - the genus of the strain species - the species of the
+           strain strain - the identifier for the strain source - information
+           about the source of the strain organelle - the organelle of
+           interest for the related data (e.g. mitochondria) ncbi_taxid - the
+           NCBI taxonomy ID of the strain location - the location from which
+           the strain was collected @optional genetic_code source ncbi_taxid
+           organelle location) -> structure: parameter "genetic_code" of
+           Long, parameter "genus" of String, parameter "species" of String,
+           parameter "strain" of String, parameter "organelle" of String,
+           parameter "source" of type "SourceInfo" (Information about the
+           source of a piece of data. source - the name of the source (e.g.
+           NCBI, JGI, Swiss-Prot) source_id - the ID of the data at the
+           source project_id - the ID of a project encompassing the data at
+           the source @optional source source_id project_id) -> structure:
+           parameter "source" of String, parameter "source_id" of type
+           "source_id" (An ID used for a piece of data at its source. @id
+           external), parameter "project_id" of type "project_id" (An ID used
+           for a project encompassing a piece of data at its source. @id
+           external), parameter "ncbi_taxid" of Long, parameter "location" of
+           type "Location" (Information about a location. lat - latitude of
+           the site, recorded as a decimal number. North latitudes are
+           positive values and south latitudes are negative numbers. lon -
+           longitude of the site, recorded as a decimal number. West
+           longitudes are positive values and east longitudes are negative
+           numbers. elevation - elevation of the site, expressed in meters
+           above sea level. Negative values are allowed. date - date of an
+           event at this location (for example, sample collection), expressed
+           in the format YYYY-MM-DDThh:mm:ss.SSSZ description - a free text
+           description of the location and, if applicable, the associated
+           event. @optional date description) -> structure: parameter "lat"
+           of Double, parameter "lon" of Double, parameter "elevation" of
+           Double, parameter "date" of String, parameter "description" of
+           String, parameter "source" of type "SourceInfo" (Information about
+           the source of a piece of data. source - the name of the source
+           (e.g. NCBI, JGI, Swiss-Prot) source_id - the ID of the data at the
+           source project_id - the ID of a project encompassing the data at
+           the source @optional source source_id project_id) -> structure:
+           parameter "source" of String, parameter "source_id" of type
+           "source_id" (An ID used for a piece of data at its source. @id
+           external), parameter "project_id" of type "project_id" (An ID used
+           for a project encompassing a piece of data at its source. @id
+           external), parameter "interleaved" of type "boolean" (A boolean -
+           0 for false, 1 for true. @range (0, 1)), parameter
+           "read_orientation_outward" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1)), parameter "insert_size_mean" of
+           Double, parameter "insert_size_std_dev" of Double, parameter
+           "source_reads_ref" of String, parameter "fwd_file_url" of String,
+           parameter "rev_file_url" of String, parameter
+           "fwd_staging_file_name" of String, parameter
+           "rev_staging_file_name" of String, parameter "download_type" of
+           String, parameter "max_parallel" of Long
+        :returns: instance of type "UploadReadsBatchOutput" (The output of
+           the upload_reads_batch function. results - the result for each
+           library, in the order of the input.) -> structure: parameter
+           "results" of list of type "UploadReadsResult" (The result of
+           uploading one reads library with upload_reads_batch. obj_ref - a
+           reference to the new Workspace object, as for upload_reads, if the
+           library was uploaded. error - the error that stopped the library
+           being uploaded, if it failed.) -> structure: parameter "obj_ref"
+           of String, parameter "error" of String
+        """
+        return self._client.call_method(
+            'ReadsUtils.upload_reads_batch',
+            [params], self._service_ver, context)
+
     def download_reads(self, params, context=None):
         """
         Download read libraries. Reads compressed with gzip or bzip are
@@ -197,13 +359,28 @@ class ReadsUtils(object):
            download. tern interleaved - if true, provide the files in
            interleaved format if they are not already. If false, provide
            forward and reverse reads files. If null or missing, leave files
-           as is.) -> structure: parameter "read_libraries" of list of type
-           "read_lib" (A reference to a read library stored in the workspace
-           service, whether of the KBaseAssembly or KBaseFile type. Usage of
-           absolute references (e.g. 256/3/6) is strongly encouraged to avoid
-           race conditions, although any valid reference is allowed.),
-           parameter "interleaved" of type "tern" (A ternary. Allowed values
-           are 'false', 'true', or null. Any other value is invalid.)
+           as is. int max_parallel - the maximum number of read libraries to
+           download and process at the same time. Defaults to 1. boolean
+           use_cache - if true, reuse the files from earlier downloads of the
+           same read libraries with the same interleaved option by calls
+           sharing the scratch space, and add the files to the cache. The
+           cached files are provided as read only hard links. Defaults to
+           false. string compression - the compression of the provided files,
+           one of 'none', 'gzip', 'gzip-fast', 'zstd' or 'native'. gzip-fast
+           is gzip at the fastest level. Files stored in Shock with the
+           requested compression are provided as is when they need no
+           interleaving or deinterleaving. native provides such files as
+           stored, whatever their compression, and gzips the rest. Defaults
+           to 'none'.) -> structure: parameter "read_libraries" of list of
+           type "read_lib" (A reference to a read library stored in the
+           workspace service, whether of the KBaseAssembly or KBaseFile type.
+           Usage of absolute references (e.g. 256/3/6) is strongly encouraged
+           to avoid race conditions, although any valid reference is
+           allowed.), parameter "interleaved" of type "tern" (A ternary.
+           Allowed values are 'false', 'true', or null. Any other value is
+           invalid.), parameter "max_parallel" of Long, parameter "use_cache"
+           of type "boolean" (A boolean - 0 for false, 1 for true. @range (0,
+           1)), parameter "compression" of String
         :returns: instance of type "DownloadReadsOutput" (The output of the
            download method. mapping<read_lib, DownloadedReadLibrary> files -
            a mapping of the read library workspace references to information
@@ -256,17 +433,19 @@ class ReadsUtils(object):
            the reads are single end or interleaved. string otype - the
            original type of the reads. One of 'single', 'paired', or
            'interleaved'. string type - one of 'single', 'paired', or
-           'interleaved'.) -> structure: parameter "fwd" of String, parameter
-           "fwd_name" of String, parameter "rev" of String, parameter
-           "rev_name" of String, parameter "otype" of String, parameter
-           "type" of String, parameter "ref" of String, parameter
-           "single_genome" of type "tern" (A ternary. Allowed values are
-           'false', 'true', or null. Any other value is invalid.), parameter
-           "read_orientation_outward" of type "tern" (A ternary. Allowed
-           values are 'false', 'true', or null. Any other value is invalid.),
-           parameter "sequencing_tech" of String, parameter "strain" of type
-           "StrainInfo" (Information about a strain. genetic_code - the
-           genetic code of the strain. See
+           'interleaved'. string encoding - the compression of the files, one
+           of 'none', 'gzip', 'zstd', 'bzip2' or 'xz'. Compressed file names
+           end with .gz, .zst, .bz2 or .xz.) -> structure: parameter "fwd" of
+           String, parameter "fwd_name" of String, parameter "rev" of String,
+           parameter "rev_name" of String, parameter "otype" of String,
+           parameter "type" of String, parameter "encoding" of String,
+           parameter "ref" of String, parameter "single_genome" of type
+           "tern" (A ternary. Allowed values are 'false', 'true', or null.
+           Any other value is invalid.), parameter "read_orientation_outward"
+           of type "tern" (A ternary. Allowed values are 'false', 'true', or
+           null. Any other value is invalid.), parameter "sequencing_tech" of
+           String, parameter "strain" of type "StrainInfo" (Information about
+           a strain. genetic_code - the genetic code of the strain. See
            http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c
            genus - the genus of the strain species - the species of the
            strain strain - the identifier for the strain source - information
@@ -326,7 +505,8 @@ class ReadsUtils(object):
     def export_reads(self, params, context=None):
         """
         KBase downloader function. Packages a set of reads into a zip file and
-        stores the zip in shock.
+        stores the zip in shock. Reads files are packaged with their
+        compression in Shock, so they're never uncompressed on the way.
         :param params: instance of type "ExportParams" (Standard KBase
            downloader input.) -> structure: parameter "input_ref" of String
         :returns: instance of type "ExportOutput" (Standard KBase downloader
@@ -336,6 +516,41 @@ class ReadsUtils(object):
             'ReadsUtils.export_reads',
             [params], self._service_ver, context)
 
+    def export_reads_batch(self, params, context=None):
+        """
+        Packages many reads objects as export_reads does, getting the object
+        information in one workspace call and downloading the Shock nodes of
+        all the objects at the same time, shared nodes only once.
+        :param params: instance of type "ExportReadsBatchParams" (Input for
+           the export_reads_batch function. list<read_lib> input_refs - the
+           reads objects to export. boolean single_archive - if true, package
+           all the objects in one zip file, each in a directory named after
+           the object. Otherwise each object is packaged in its own zip file
+           as by export_reads. Defaults to false. int max_parallel - the
+           maximum number of read libraries to download and process at the
+           same time. Defaults to 1.) -> structure: parameter "input_refs" of
+           list of type "read_lib" (A reference to a read library stored in
+           the workspace service, whether of the KBaseAssembly or KBaseFile
+           type. Usage of absolute references (e.g. 256/3/6) is strongly
+           encouraged to avoid race conditions, although any valid reference
+           is allowed.), parameter "single_archive" of type "boolean" (A
+           boolean - 0 for false, 1 for true. @range (0, 1)), parameter
+           "max_parallel" of Long
+        :returns: instance of type "ExportReadsBatchOutput" (Output of the
+           export_reads_batch function. mapping<read_lib, string> shock_ids -
+           the ID of the Shock node holding the zip file of each reads
+           object. With single_archive every object maps to the same node.)
+           -> structure: parameter "shock_ids" of mapping from type
+           "read_lib" (A reference to a read library stored in the workspace
+           service, whether of the KBaseAssembly or KBaseFile type. Usage of
+           absolute references (e.g. 256/3/6) is strongly encouraged to avoid
+           race conditions, although any valid reference is allowed.) to
+           String
+        """
+        return self._client.call_method(
+            'ReadsUtils.export_reads_batch',
+            [params], self._service_ver, context)
+
     def status(self, context=None):
         return self._client.call_method('ReadsUtils.status',
                                         [], self._service_ver, context)
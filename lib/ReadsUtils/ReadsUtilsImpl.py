@@ -1,19 +1,1376 @@
 # -*- coding: utf-8 -*-
 #BEGIN_HEADER
 import time
-import subprocess
 import os
 import tempfile
 import shutil
 from pprint import pformat
 from DataFileUtil.DataFileUtilClient import DataFileUtil
 from DataFileUtil.baseclient import ServerError as DFUError
-from kb_ea_utils.kb_ea_utilsClient import kb_ea_utils
 from Workspace.WorkspaceClient import Workspace
 from Workspace.baseclient import ServerError as WorkspaceError
 from numbers import Number
 import six
 import uuid
+import re
+import errno
+import gzip
+import bz2
+import zlib
+import struct
+import collections
+import math
+import json
+import zipfile
+import hashlib
+import threading
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+try:
+    import lzma
+except ImportError:  # Python 2
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BLANK_LINES = re.compile(b'\n\n+')
+LEADING_BLANK_LINES = re.compile(b'\n+')
+WHITESPACE_LINES = re.compile(b'\n(?:[ \t\r\x0b\x0c]*\n)+')
+LEADING_WHITESPACE_LINES = re.compile(b'(?:[ \t\r\x0b\x0c]*\n)+')
+
+
+def drop_blank_lines(chunk, skip_whitespace_lines=False):
+    '''
+    Removes the blank lines from a chunk of text that starts at the start of a
+    line. If skip_whitespace_lines is true, lines containing only whitespace
+    are also removed.
+    '''
+    if skip_whitespace_lines:
+        blank, leading_blank = WHITESPACE_LINES, LEADING_WHITESPACE_LINES
+    else:
+        blank, leading_blank = BLANK_LINES, LEADING_BLANK_LINES
+    m = leading_blank.match(chunk)
+    if m:
+        chunk = chunk[m.end():]
+    if blank.search(chunk):
+        chunk = blank.sub(b'\n', chunk)
+    return chunk
+
+
+class FASTQValidator(object):
+    '''
+    Checks the structure of the FASTQ data written to it, applying the checks
+    fastQValidator makes: every record has a sequence identifier line
+    starting with @, a sequence of at least MIN_READ_LENGTH bases, a line
+    starting with + that repeats the sequence identifier line if it has
+    anything after the +, and a quality string of the same length as the
+    sequence. Unless the data is interleaved, the sequence identifiers, up to
+    the first whitespace, must be unique.
+    The data need not be written in whole lines, but blank lines must already
+    have been removed. offset is the byte offset of the start of the data in
+    the file it comes from. Records are checked a block at a time, and only a
+    block that fails the block wide checks is checked record by record.
+    ids holds the sequence identifiers seen so far when they are checked.
+    If id_buckets is given, the identifiers are not checked here but are
+    put, with their record numbers and byte offsets, in one of id_buckets
+    lists chosen by their hash, so that separately validated ranges of a
+    file can be checked for repeats a bucket at a time.
+    '''
+
+    BASES = b'ACGTNacgtn.'
+    QUALITY = bytes(bytearray(range(ord('!'), ord('~') + 1)))
+    MIN_READ_LENGTH = 10
+    MAX_ERRORS = 10
+
+    def __init__(self, interleaved, max_errors=MAX_ERRORS, offset=0,
+                 id_buckets=0):
+        self._check_ids = not interleaved and not id_buckets
+        self._max_errors = max_errors
+        self.ids = set()
+        self.id_buckets = None
+        if id_buckets and not interleaved:
+            self.id_buckets = [[] for _ in range(id_buckets)]
+        self._tail = b''
+        self._offset = offset
+        self.records = 0
+        self.errors = []
+
+    def write(self, data):
+        if not data or len(self.errors) >= self._max_errors:
+            return
+        data = self._tail + data
+        end = data.rfind(b'\n') + 1
+        lines = data[:end].split(b'\n')
+        lines.pop()
+        whole = len(lines) - len(lines) % 4
+        rest = sum(len(line) + 1 for line in lines[whole:])
+        self._tail = data[end - rest:]
+        if whole:
+            self._check(lines[:whole])
+            self._offset += end - rest
+
+    def close(self):
+        '''
+        Checks any data left over and returns the errors found, at most
+        max_errors of them. Each error is a dict with the record and line
+        numbers, counting from 1, the byte offset of the start of the line at
+        fault and a description of the problem.
+        '''
+        tail = self._tail
+        self._tail = b''
+        if tail and len(self.errors) < self._max_errors:
+            if not tail.endswith(b'\n'):
+                tail += b'\n'  # no newline at the end of the data
+            lines = tail.count(b'\n')
+            if lines >= 4:
+                self.write(tail)
+                tail = self._tail
+                lines = tail.count(b'\n')
+            if lines:
+                self._error(0, self._offset,
+                            'Incomplete record, expected 4 lines, got ' +
+                            str(lines))
+        return self.errors
+
+    def _check(self, lines):
+        heads = lines[0::4]
+        seqs = lines[1::4]
+        pluses = lines[2::4]
+        quals = lines[3::4]
+        n = len(heads)
+        ok = (
+            (b'\n' + b'\n'.join(heads)).count(b'\n@') == n and
+            (b'\n' + b'\n'.join(pluses)).count(b'\n+') == n and
+            list(map(len, seqs)) == list(map(len, quals)) and
+            min(map(len, seqs)) >= self.MIN_READ_LENGTH and
+            not b''.join(seqs).translate(None, self.BASES) and
+            not b''.join(quals).translate(None, self.QUALITY))
+        if ok:
+            heads_joined = b'\n' + b'\n'.join(heads) + b'\n'
+            ok = not (heads_joined.count(b'\n@\n') or
+                      heads_joined.count(b'\n@ ') or
+                      heads_joined.count(b'\n@\t'))
+        if ok and len(b''.join(pluses)) != n:
+            ok = all(len(p) == 1 or p[1:] == h[1:]
+                     for h, p in zip(heads, pluses))
+        if ok and self._check_ids:
+            ids = [h.split(None, 1)[0] for h in heads]
+            unique = set(ids)
+            ok = len(unique) == n and self.ids.isdisjoint(unique)
+            if ok:
+                self.ids.update(unique)
+        if ok and self.id_buckets is not None:
+            offset = self._offset
+            for i, (h, s, p, q) in enumerate(zip(heads, seqs, pluses, quals)):
+                self._bucket_id(h, self.records + i + 1, offset)
+                offset += len(h) + len(s) + len(p) + len(q) + 4
+        if ok:
+            self.records += n
+            return
+        offset = self._offset
+        for h, s, p, q in zip(heads, seqs, pluses, quals):
+            problem = self._check_record(h, s, p, q)
+            # the identifier of a record is checked unless its sequence
+            # identifier line is at fault
+            if self.id_buckets is not None and (not problem or problem[0]):
+                self._bucket_id(h, self.records + 1, offset)
+            if problem:
+                line, error = problem
+                self._error(line, offset + sum(
+                    len(part) + 1 for part in (h, s, p, q)[:line]), error)
+                if len(self.errors) >= self._max_errors:
+                    return
+            self.records += 1
+            offset += len(h) + len(s) + len(p) + len(q) + 4
+
+    def _check_record(self, head, seq, plus, qual):
+        if head[:1] != b'@':
+            return 0, 'The sequence identifier line does not start with @'
+        if len(head) == 1 or head[1:2].isspace():
+            return 0, 'No sequence identifier before the comment'
+        if self._check_ids:
+            id_ = head.split(None, 1)[0]
+            if id_ in self.ids:
+                return 0, ('Repeated sequence identifier: ' +
+                           id_[1:].decode('utf-8', 'replace'))
+            self.ids.add(id_)
+        bad = seq.translate(None, self.BASES)
+        if bad:
+            return 1, ("Invalid character ('" + bad[:1].decode('latin-1') +
+                       "') in the sequence")
+        if len(seq) < self.MIN_READ_LENGTH:
+            return 1, ('The sequence is shorter than the minimum read ' +
+                       'length of {}').format(self.MIN_READ_LENGTH)
+        if plus[:1] != b'+':
+            return 2, 'The line after the sequence does not start with +'
+        if len(plus) > 1 and plus[1:] != head[1:]:
+            return 2, ('The sequence identifier on the + line does not ' +
+                       'match the one on the @ line')
+        if len(qual) != len(seq):
+            return 3, ('The quality string length, {}, does not equal the ' +
+                       'sequence length, {}').format(len(qual), len(seq))
+        bad = qual.translate(None, self.QUALITY)
+        if bad:
+            return 3, ("Invalid character ('" + bad[:1].decode('latin-1') +
+                       "') in the quality string")
+        return None
+
+    def _bucket_id(self, head, record, offset):
+        id_ = head.split(None, 1)[0]
+        self.id_buckets[zlib.crc32(id_) % len(self.id_buckets)].append(
+            b' '.join((str(record).encode('ascii'),
+                       str(offset).encode('ascii'), id_)))
+
+    def _error(self, line, offset, error):
+        self.errors.append({'record': self.records + 1,
+                            'line': self.records * 4 + line + 1,
+                            'offset': offset,
+                            'error': error})
+
+
+class FASTAValidator(object):
+    '''
+    Checks the structure of the FASTA data written to it: the first line
+    that is not blank is a header line, every header line starts with > and
+    a sequence identifier and is followed by at least one sequence line, and
+    the sequence lines only hold characters from the alphabet, in either
+    case. The data need not be written in whole lines. Only a block of lines
+    that fails the block wide checks is checked line by line.
+    The alphabets are the IUPAC codes for DNA or RNA and for protein, plus
+    gaps and stops.
+    '''
+
+    ALPHABETS = {'dna': b'ACGTURYKMSWBDHVN.-*',
+                 'protein': b'ABCDEFGHIJKLMNOPQRSTUVWXYZ-*'}
+    MAX_ERRORS = 10
+
+    def __init__(self, alphabet='dna', max_errors=MAX_ERRORS):
+        letters = self.ALPHABETS[alphabet]
+        self._letters = letters + letters.lower() + b'\r'
+        self._max_errors = max_errors
+        self._tail = b''
+        self._offset = 0
+        self._lines = 0
+        self._header = None  # the line and offset of the open record
+        self._has_sequence = False
+        self.records = 0
+        self.errors = []
+
+    def write(self, data):
+        if not data or len(self.errors) >= self._max_errors:
+            return
+        data = self._tail + data
+        end = data.rfind(b'\n') + 1
+        self._tail = data[end:]
+        lines = data[:end].split(b'\n')
+        lines.pop()
+        self._check(lines)
+
+    def close(self):
+        '''
+        Checks any data left over and returns the errors found, at most
+        max_errors of them. Each error is a dict with the record and line
+        numbers, counting from 1, the byte offset of the start of the line at
+        fault and a description of the problem.
+        '''
+        if self._tail and len(self.errors) < self._max_errors:
+            self._check([self._tail])
+        self._tail = b''
+        if len(self.errors) < self._max_errors:
+            if self._header and not self._has_sequence:
+                self._missing_sequence()
+            elif not self.records and not self.errors:
+                self._error(1, 0, 'No sequences in the file')
+        return self.errors
+
+    def _check(self, lines):
+        if self.records and not b''.join(lines).translate(
+                None, self._letters):
+            # only sequence lines
+            self._has_sequence = (self._has_sequence or
+                                  any(line.strip() for line in lines))
+            self._lines += len(lines)
+            self._offset += sum(map(len, lines)) + len(lines)
+            return
+        for line in lines:
+            self._lines += 1
+            if line[:1] == b'>':
+                if self._header and not self._has_sequence:
+                    self._missing_sequence()
+                self.records += 1
+                self._header = (self._lines, self._offset)
+                self._has_sequence = False
+                if not line[1:].split(None, 1):
+                    self._error(self._lines, self._offset,
+                                'No sequence identifier on the header line')
+            elif not line.strip():
+                pass
+            elif not self.records:
+                self.records += 1
+                self._header = None
+                self._error(self._lines, self._offset,
+                            'The first line does not start with >')
+            else:
+                self._has_sequence = True
+                bad = line.translate(None, self._letters)
+                if bad:
+                    self._error(self._lines, self._offset,
+                                "Invalid character ('" +
+                                bad[:1].decode('latin-1') +
+                                "') in the sequence")
+            self._offset += len(line) + 1
+            if len(self.errors) >= self._max_errors:
+                return
+
+    def _missing_sequence(self):
+        line, offset = self._header
+        self.errors.append({'record': self.records, 'line': line,
+                            'offset': offset,
+                            'error': 'The record has no sequence'})
+
+    def _error(self, line, offset, error):
+        self.errors.append({'record': self.records, 'line': line,
+                            'offset': offset, 'error': error})
+
+
+class DecompressingReader(object):
+    '''
+    Reads a file compressed with a format that decompressors made by
+    new_decompressor, such as bz2.BZ2Decompressor, handle, including files
+    made of several compressed streams, like those pbzip2 writes, which the
+    Python 2 BZ2File stops reading after the first of.
+    '''
+
+    def __init__(self, file_path, new_decompressor, block_size):
+        self._file = open(file_path, 'rb')
+        self._new = new_decompressor
+        self._dec = new_decompressor()
+        self._block_size = block_size
+        self._data = b''
+        self._pos = 0
+
+    def read(self, size=-1):
+        '''
+        Returns the next data, up to size bytes if size is not negative. Less
+        data may be returned, but nothing is returned only at the end of the
+        file.
+        '''
+        while self._pos >= len(self._data):
+            compressed = self._file.read(self._block_size)
+            if not compressed:
+                return b''
+            self._data = self._decompress(compressed)
+            self._pos = 0
+        end = len(self._data) if size < 0 else self._pos + size
+        data = self._data[self._pos:end]
+        self._pos += len(data)
+        return data
+
+    def _decompress(self, compressed):
+        out = []
+        while compressed:
+            try:
+                out.append(self._dec.decompress(compressed))
+            except EOFError:  # the last stream ended with the last block
+                self._dec = self._new()
+                continue
+            compressed = self._dec.unused_data
+            if compressed:
+                self._dec = self._new()
+        return b''.join(out)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def gzip_header_end(data, pos=0):
+    '''
+    Returns the offset just past the gzip member header at pos in data, or
+    None if there is no complete gzip header there.
+    '''
+    if data[pos:pos + 3] != b'\x1f\x8b\x08' or len(data) < pos + 10:
+        return None
+    flags = ord(data[pos + 3:pos + 4])
+    if flags & 0xe0:  # reserved
+        return None
+    end = pos + 10
+    if flags & 4:  # FEXTRA
+        if len(data) < end + 2:
+            return None
+        end += 2 + struct.unpack('<H', data[end:end + 2])[0]
+    for flag in (8, 16):  # FNAME, FCOMMENT
+        if flags & flag:
+            end = data.find(b'\x00', end) + 1
+            if not end:
+                return None
+    if flags & 2:  # FHCRC
+        end += 2
+    return end if end <= len(data) else None
+
+
+def gunzip_members(data):
+    '''
+    Decompresses data made of whole gzip members. Returns None if the data
+    is not exactly a run of whole members with matching checksums and sizes.
+    '''
+    out = []
+    pos = 0
+    while pos < len(data):
+        start = gzip_header_end(data, pos)
+        if start is None:
+            return None
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        try:
+            member = decompressor.decompress(data[start:])
+        except zlib.error:
+            return None
+        trailer = decompressor.unused_data
+        if len(trailer) < 8:  # the deflate stream or trailer is cut off
+            return None
+        crc, size = struct.unpack('<LL', trailer[:8])
+        if (crc != zlib.crc32(member) & 0xffffffff or
+                size != len(member) & 0xffffffff):
+            return None
+        out.append(member)
+        pos = len(data) - len(trailer) + 8
+    return b''.join(out)
+
+
+class ParallelGzipReader(object):
+    '''
+    Reads a gzip file made of many members, like those ParallelGzipWriter,
+    bgzip and pigz --independent write, decompressing runs of whole members
+    of at least chunk_size compressed bytes on a pool of threads.
+    Members are found by looking for gzip headers, and each run is checked
+    to end exactly where the next one starts, so a header-like sequence of
+    bytes inside a member is never mistaken for a member. From the first
+    point the file cannot be split this way, such as a file with a single
+    member, the rest is read with the gzip module on one thread.
+    '''
+
+    # the most chunks a run is read to before it is given up on splitting
+    MAX_RUN_CHUNKS = 16
+
+    def __init__(self, file_path, workers, chunk_size):
+        self._file = open(file_path, 'rb')
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._pool = ThreadPool(workers)
+        self._chunks = self._decompress()
+        self._data = b''
+        self._pos = 0
+
+    def read(self, size=-1):
+        '''
+        Returns the next data, up to size bytes if size is not negative. Less
+        data may be returned, but nothing is returned only at the end of the
+        file.
+        '''
+        while self._pos >= len(self._data):
+            self._data = next(self._chunks, None)
+            self._pos = 0
+            if self._data is None:
+                self._data = b''
+                return b''
+        end = len(self._data) if size < 0 else self._pos + size
+        data = self._data[self._pos:end]
+        self._pos += len(data)
+        return data
+
+    def _next_member(self, buf, start):
+        # the first gzip header at or after start, if any
+        pos = buf.find(b'\x1f\x8b\x08', start)
+        while pos >= 0:
+            if gzip_header_end(buf, pos):
+                return pos
+            pos = buf.find(b'\x1f\x8b\x08', pos + 1)
+        return None
+
+    def _runs(self):
+        # yields the file offset and data of each run of what look like
+        # whole members and then, if a run gets too long to split, its
+        # offset and None
+        offset = 0
+        buf = b''
+        while True:
+            data = self._file.read(self._chunk_size)
+            buf += data
+            split = self._next_member(buf, self._chunk_size)
+            while split is not None:
+                yield offset, buf[:split]
+                offset += split
+                buf = buf[split:]
+                split = self._next_member(buf, self._chunk_size)
+            if not data:
+                if buf:
+                    yield offset, buf
+                return
+            if len(buf) >= self.MAX_RUN_CHUNKS * self._chunk_size:
+                yield offset, None
+                return
+
+    def _decompress(self):
+        # yields the decompressed data in order, keeping up to two runs per
+        # thread in flight
+        pending = collections.deque()
+        runs = self._runs()
+        rest = None  # the offset to read the rest of the file from serially
+        more = True
+        while True:
+            while more and len(pending) < 2 * self._workers:
+                offset, run = next(runs, (None, None))
+                if run is None:
+                    rest, more = offset, False
+                else:
+                    pending.append((offset, self._pool.apply_async(
+                        gunzip_members, (run,))))
+            if not pending:
+                break
+            offset, result = pending.popleft()
+            out = result.get()
+            if out is None:
+                # the run is not whole members, but it starts where the
+                # good run before it ended
+                rest = offset
+                break
+            if out:
+                yield out
+        if rest is not None:
+            for out in self._gunzip_from(rest):
+                yield out
+
+    def _gunzip_from(self, offset):
+        self._file.seek(offset)
+        with gzip.GzipFile(fileobj=self._file, mode='rb') as f:
+            while True:
+                data = f.read(self._chunk_size)
+                if not data:
+                    return
+                yield data
+
+    def close(self):
+        if self._pool:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def reads_file_compression(file_path):
+    '''
+    Returns the compression of a reads file, gzip, bzip2 or xz, or None if
+    it is not compressed, recognized from the magic bytes at the start of
+    the file whatever the file is named.
+    '''
+    with open(file_path, 'rb') as f:
+        magic = f.read(6)
+    if magic.startswith(b'\x1f\x8b'):
+        return 'gzip'
+    if magic.startswith(b'BZh'):
+        return 'bzip2'
+    if magic.startswith(b'\xfd7zXZ\x00'):
+        return 'xz'
+    return None
+
+
+def open_reads_file(file_path, block_size, workers=1):
+    '''
+    Opens a reads file for reading bytes, decompressing it on the fly if it
+    is compressed with gzip, bzip2 or xz. gzip files are decompressed on
+    workers threads if workers is more than one.
+    '''
+    compression = reads_file_compression(file_path)
+    if compression == 'gzip':
+        if workers > 1:
+            return ParallelGzipReader(file_path, workers, block_size)
+        return gzip.open(file_path, 'rb')
+    if compression == 'bzip2':
+        return DecompressingReader(file_path, bz2.BZ2Decompressor, block_size)
+    if compression == 'xz':
+        if lzma is None:
+            raise ValueError(('Cannot read xz compressed file {}: the lzma ' +
+                              'module is not installed').format(file_path))
+        return DecompressingReader(file_path, lzma.LZMADecompressor,
+                                   block_size)
+    return open(file_path, 'rb')
+
+
+def gzip_member(data, level, mtime, name=None):
+    '''
+    Compresses data to a complete gzip member with the header the gzip
+    module writes, storing name as the original file name if given.
+    '''
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS,
+                                  zlib.DEF_MEM_LEVEL, 0)
+    xfl = b'\x02' if level == 9 else b'\x04' if level == 1 else b'\x00'
+    header = [b'\x1f\x8b\x08', b'\x08' if name else b'\x00',
+              struct.pack('<L', mtime), xfl, b'\xff']
+    if name:
+        header.append(name + b'\x00')
+    return b''.join(header + [
+        compressor.compress(data), compressor.flush(),
+        struct.pack('<LL', zlib.crc32(data) & 0xffffffff,
+                    len(data) & 0xffffffff)])
+
+
+class ParallelGzipWriter(object):
+    '''
+    Writes a gzip file, compressing blocks of block_size bytes as separate
+    gzip members on a pool of threads, the way pigz --independent and bgzip
+    do. gzip, gunzip and every gzip reader read the members back as one
+    stream. Output that fits in one block is the same size as the gzip
+    module would write.
+    '''
+
+    def __init__(self, file_path, level, workers, block_size):
+        self._file = open(file_path, 'wb')
+        self._level = level
+        self._block_size = block_size
+        self._mtime = int(time.time())
+        name = os.path.basename(file_path)
+        if name.endswith('.gz'):
+            name = name[:-3]
+        if isinstance(name, six.text_type):
+            name = name.encode('latin-1', 'replace')
+        self._name = name
+        self._workers = workers
+        self._pool = ThreadPool(workers) if workers > 1 else None
+        self._pending = collections.deque()
+        self._buf = []
+        self._buf_size = 0
+        self._members = 0
+
+    def write(self, data):
+        self._buf.append(data)
+        self._buf_size += len(data)
+        while self._buf_size >= self._block_size:
+            block = b''.join(self._buf)
+            self._compress(block[:self._block_size])
+            rest = block[self._block_size:]
+            self._buf = [rest]
+            self._buf_size = len(rest)
+
+    def _compress(self, block):
+        args = (block, self._level, self._mtime,
+                None if self._members else self._name)
+        self._members += 1
+        if not self._pool:
+            self._file.write(gzip_member(*args))
+            return
+        # bound the blocks held in memory while still keeping every
+        # thread busy
+        while len(self._pending) >= 2 * self._workers:
+            self._file.write(self._pending.popleft().get())
+        self._pending.append(self._pool.apply_async(gzip_member, args))
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            if self._buf_size or not self._members:
+                self._compress(b''.join(self._buf))
+                self._buf = []
+                self._buf_size = 0
+            while self._pending:
+                self._file.write(self._pending.popleft().get())
+            if self._pool:
+                self._pool.close()
+        finally:
+            self._abort()
+
+    def _abort(self):
+        if self._pool:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._pending.clear()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type:
+            self._abort()
+        else:
+            self.close()
+
+
+class ZstdWriter(object):
+    '''
+    Writes a zstd file, compressing on threads worker threads if threads is
+    more than one.
+    '''
+
+    def __init__(self, file_path, level, threads):
+        self._file = open(file_path, 'wb')
+        self._compressor = zstandard.ZstdCompressor(
+            level=level, threads=threads if threads > 1 else 0).compressobj()
+
+    def write(self, data):
+        self._file.write(self._compressor.compress(data))
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            self._file.write(self._compressor.flush())
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type:
+            self._file.close()
+        else:
+            self.close()
+
+
+def clean_fastq_chunks(file_path, block_size, start=0, end=None,
+                       decompress=False):
+    '''
+    Reads a FASTQ file in blocks and yields tuples of the length of each
+    block, cut back to the last complete line, and the block with blank
+    and whitespace-only lines removed.
+    If start or end are given only that byte range of the file is read;
+    start must be the start of a line. If decompress is true, a compressed
+    file is decompressed as it is read, and start and end cannot be given.
+    '''
+    if decompress:
+        s = open_reads_file(file_path, block_size)
+    else:
+        s = open(file_path, 'rb')
+    with s:
+        if start:
+            s.seek(start)
+        left = None if end is None else end - start
+        tail = b''
+        while True:
+            data = s.read(block_size if left is None else
+                          min(block_size, left))
+            if left is not None:
+                left -= len(data)
+            if data:
+                buf = tail + data
+                cut = buf.rfind(b'\n') + 1
+                chunk, tail = buf[:cut], buf[cut:]
+            else:
+                chunk, tail = tail, b''
+            length = len(chunk)
+            if not data and chunk:
+                chunk += b'\n'  # no newline at the end of the file
+            yield length, drop_blank_lines(chunk, True)
+            if not data:
+                break
+
+
+def _copy_prefix(file_path, length, target, block_size, start=0):
+    with open(file_path, 'rb') as f:
+        if start:
+            f.seek(start)
+        while length > 0:
+            data = f.read(min(length, block_size))
+            if not data:
+                break
+            target.write(data)
+            length -= len(data)
+
+
+def fastq_record_start(file_path, offset, block_size):
+    '''
+    Returns the byte offset of the first FASTQ record in a file that starts
+    at or after offset, or the size of the file if there is none.
+    As a quality line may start with @ as well as a sequence identifier line,
+    a record start is taken to be a line starting with @ where the next but
+    one non-blank line starts with +. After a quality line that line would
+    be a sequence, which cannot start with +.
+    '''
+    if offset <= 0:
+        return 0
+    with open(file_path, 'rb') as f:
+        f.seek(offset - 1)
+        data = b''
+        while True:
+            more = f.read(block_size)
+            data += more
+            start = data.find(b'\n') + 1
+            if not start:
+                if not more:
+                    return offset - 1 + len(data)
+                continue
+            lines = []  # the start and first character of non-blank lines
+            end = data.rfind(b'\n') + 1 if more else len(data)
+            for m in re.finditer(b'[^\n]*(?:\n|$)', data[start:end]):
+                if m.group().strip():
+                    lines.append((start + m.start(), m.group()[:1]))
+            for i, (pos, first) in enumerate(lines):
+                if first != b'@':
+                    continue
+                if i + 2 < len(lines):
+                    if lines[i + 2][1] == b'+':
+                        return offset - 1 + pos
+                elif more:
+                    break
+                else:
+                    # too close to the end of the file to tell, so leave any
+                    # remaining lines to the record before
+                    return offset - 1 + len(data)
+            else:
+                if not more:
+                    return offset - 1 + len(data)
+
+
+def validate_fastq_range(file_path, interleaved, block_size, start, end,
+                         clean_path, id_path=None, id_buckets=0):
+    '''
+    Validates a byte range of a FASTQ file that starts at the start of a
+    record and ends at the start of a record or the end of the file.
+    If the range has blank lines, it is written without them to clean_path.
+    Unless the data is interleaved, the sequence identifiers are not checked
+    for repeats here. Instead they are written to id_path, grouped into
+    id_buckets buckets by their hash, for find_repeated_ids to check a bucket
+    at a time.
+    Returns the line count, the validation errors, with record and line
+    numbers counted from the start of the range and byte offsets from the
+    start of the range in the file, less any blank lines in the range,
+    whether the range had blank lines, its length without them, the time
+    taken in seconds and the byte offsets of the buckets in id_path, which
+    are None if the data is interleaved.
+    This is a function rather than a method so that it can be run in a
+    process pool.
+    '''
+    begin = time.time()
+    validator = FASTQValidator(interleaved, offset=start,
+                               id_buckets=id_buckets)
+    cleaned = None
+    c = 0
+    length = 0
+    try:
+        for size, clean in clean_fastq_chunks(file_path, block_size, start,
+                                              end):
+            if cleaned is None and len(clean) != size:
+                cleaned = open(clean_path, 'wb')
+                _copy_prefix(file_path, length, cleaned, block_size, start)
+            c += clean.count(b'\n')
+            length += len(clean)
+            if cleaned is not None:
+                cleaned.write(clean)
+            validator.write(clean)
+    finally:
+        if cleaned is not None:
+            cleaned.close()
+    errors = validator.close()
+    id_offsets = None
+    if validator.id_buckets is not None:
+        id_offsets = [0]
+        with open(id_path, 'wb') as f:
+            for bucket in validator.id_buckets:
+                if bucket:
+                    f.write(b'\n'.join(bucket) + b'\n')
+                id_offsets.append(f.tell())
+    return (c, errors, cleaned is not None, length, time.time() - begin,
+            id_offsets)
+
+
+def _read_id_bucket(ranges):
+    for id_path, start, end, records, shift in ranges:
+        if start == end:
+            continue
+        with open(id_path, 'rb') as f:
+            f.seek(start)
+            lines = f.read(end - start).split(b'\n')
+        lines.pop()
+        for line in lines:
+            record, offset, id_ = line.split(b' ', 2)
+            yield id_, record, offset, records, shift
+
+
+def find_repeated_ids(ranges):
+    '''
+    Checks one bucket of the sequence identifiers validate_fastq_range wrote
+    for the ranges of a FASTQ file for repeats. ranges holds, for each range
+    in file order, the identifier file, the byte offsets of the start and
+    end of the bucket in it, the number of records before the range and the
+    amount to add to its byte offsets. Returns the errors for the first
+    repeats, at most FASTQValidator.MAX_ERRORS of them, numbered from the
+    start of the file.
+    This is a function rather than a method so that it can be run in a
+    process pool.
+    '''
+    seen = set()
+    errors = []
+    for id_, record, offset, records, shift in _read_id_bucket(ranges):
+        if id_ not in seen:
+            seen.add(id_)
+            continue
+        record = int(record) + records
+        errors.append({'record': record,
+                       'line': record * 4 - 3,
+                       'offset': int(offset) + shift,
+                       'error': 'Repeated sequence identifier: ' +
+                                id_[1:].decode('utf-8', 'replace')})
+        if len(errors) >= FASTQValidator.MAX_ERRORS:
+            break
+    return errors
+
+
+def find_seen_ids(ranges, ids):
+    '''
+    Returns those of ids that are in a bucket of the sequence identifiers
+    validate_fastq_range wrote, with ranges as for find_repeated_ids.
+    This is a function rather than a method so that it can be run in a
+    process pool.
+    '''
+    return set(id_ for id_, _, _, _, _ in _read_id_bucket(ranges)
+               if id_ in ids)
+
+
+def validate_fastq_file(file_path, interleaved, block_size):
+    '''
+    Validates a FASTQ file in one pass. Blank lines are dropped and lines
+    counted block by block and the cleaned blocks are fed to a
+    FASTQValidator. If there are blank lines, the cleaned blocks are also
+    written to a temporary file that then replaces the original.
+    Returns the line count, the validation errors, whether blank lines were
+    removed and the time taken in seconds.
+    This is a function rather than a method so that it can be run in a
+    process pool.
+    '''
+    start = time.time()
+    validator = FASTQValidator(interleaved)
+    cleaned = None
+    c = 0
+    offset = 0
+    try:
+        for length, clean in clean_fastq_chunks(file_path, block_size):
+            if cleaned is None and len(clean) != length:
+                cleaned = tempfile.NamedTemporaryFile(
+                    dir=os.path.dirname(os.path.abspath(file_path)),
+                    delete=False)
+                _copy_prefix(file_path, offset, cleaned, block_size)
+            offset += length
+            c += clean.count(b'\n')
+            if cleaned is not None:
+                cleaned.write(clean)
+            validator.write(clean)
+        errors = validator.close()
+    except Exception:
+        if cleaned is not None:
+            cleaned.close()
+            os.remove(cleaned.name)
+        raise
+    if cleaned is not None:
+        cleaned.close()
+        shutil.copymode(file_path, cleaned.name)
+        os.rename(cleaned.name, file_path)
+    return c, errors, cleaned is not None, time.time() - start
+
+
+_worker_reads_utils = None
+
+
+def _init_reads_worker(reads_utils, compression_threads=None):
+    global _worker_reads_utils
+    _worker_reads_utils = reads_utils
+    if compression_threads is not None:
+        # the worker's own copy, so the parent's count is unchanged
+        reads_utils.compression_threads = compression_threads
+
+
+def process_downloaded_reads(*args):
+    '''
+    Runs ReadsUtils._process_downloaded_reads with the ReadsUtils instance
+    the worker process was started with, which is handed to the worker as
+    it forks rather than pickled with every task.
+    This is a function rather than a method so that it can be run in a
+    process pool.
+    '''
+    return _worker_reads_utils._process_downloaded_reads(*args)
+
+
+def prepare_batch_upload(*args):
+    '''
+    Runs ReadsUtils._prepare_batch_upload with the ReadsUtils instance the
+    worker process was started with, as process_downloaded_reads does.
+    This is a function rather than a method so that it can be run in a
+    process pool.
+    '''
+    return _worker_reads_utils._prepare_batch_upload(*args)
+
+
+class FASTQRecordReader(object):
+    '''
+    Reads a FASTQ file in large blocks, dropping blank lines, and hands back
+    whole four line records without splitting the records into lines.
+    If skip_whitespace_lines is true, lines containing only whitespace are
+    also treated as blank.
+    After the final records have been read, leftover holds the number of
+    trailing non-blank lines that do not make up a complete record.
+    '''
+
+    RECORD = re.compile(b'[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n')
+
+    def __init__(self, file_, block_size, skip_whitespace_lines=False):
+        self._file = file_
+        self._block_size = block_size
+        self._skip_whitespace_lines = skip_whitespace_lines
+        self._records = []
+        self._pos = 0
+        self._tail = b''
+        self._eof = False
+        self.leftover = 0
+
+    def _fill(self):
+        data = self._file.read(self._block_size)
+        if self._pos:
+            del self._records[:self._pos]
+            self._pos = 0
+        if not data:
+            self._eof = True
+            tail = self._tail
+            self._tail = b''
+            if tail and not tail.endswith(b'\n'):
+                tail += b'\n'  # no newline at the end of the file
+            tail = drop_blank_lines(tail, self._skip_whitespace_lines)
+            if tail.count(b'\n') == 4:
+                self._records.append(tail)
+            else:
+                self.leftover = tail.count(b'\n')
+            return
+        chunk = drop_blank_lines(self._tail + data,
+                                 self._skip_whitespace_lines)
+        records = self.RECORD.findall(chunk)
+        self._tail = chunk[sum(map(len, records)):]
+        self._records.extend(records)
+
+    def read_records(self, count):
+        '''
+        Returns the next count records as a list. Fewer records are returned
+        only when the end of the file is reached.
+        '''
+        while len(self._records) - self._pos < count and not self._eof:
+            self._fill()
+        records = self._records[self._pos:self._pos + count]
+        self._pos += len(records)
+        return records
+
+
+class FASTQStatsAccumulator(object):
+    '''
+    Calculates the read statistics ea-utils' fastq-stats reports, as returned
+    by kb_ea_utils.calculate_fastq_stats, from FASTQ data with blank lines
+    removed fed to it in chunks of any size.
+    As in fastq-stats, the base composition, quality and duplicate statistics
+    only cover the first CYCLES bases of each read, and duplicates are only
+    counted in the first DUPLICATE_WINDOW reads.
+    '''
+
+    RECORD = re.compile(b'[^\n]*\n([^\n]*)\n[^\n]*\n([^\n]*)\n')
+    CYCLES = 35
+    DUPLICATE_WINDOW = 2000000
+    BASES = ['A', 'C', 'G', 'T', 'N']
+
+    def __init__(self):
+        self._tail = b''
+        self._reads = 0
+        self._bases = 0
+        self._square_lengths = 0
+        self._cycle_bases = 0
+        self._base_counts = dict((b, 0) for b in self.BASES)
+        self._quals = {}  # quality character code -> count
+        self._qual_chars = b''
+        self._duplicate_reads = 0
+        self._unique_seqs = set()
+
+    def add(self, chunk):
+        data = self._tail + chunk if self._tail else chunk
+        # cut back to the end of the last complete record
+        cut = data.rfind(b'\n') + 1
+        for _ in range(data.count(b'\n', 0, cut) % 4):
+            cut = data.rfind(b'\n', 0, cut - 1) + 1
+        records = self.RECORD.findall(data, 0, cut)
+        self._tail = data[cut:]
+        if not records:
+            return
+        seqs, quals = zip(*records)
+        lengths = list(map(len, seqs))
+        self._reads += len(lengths)
+        self._bases += sum(lengths)
+        self._square_lengths += sum(length * length for length in lengths)
+
+        heads = [s[:self.CYCLES] for s in seqs]
+        cycle_seq = b''.join(heads)
+        self._cycle_bases += len(cycle_seq)
+        for b in self.BASES:
+            self._base_counts[b] += cycle_seq.count(b.encode('ascii'))
+
+        cycle_qual = b''.join([q[:self.CYCLES] for q in quals])
+        new_chars = cycle_qual.translate(None, self._qual_chars)
+        if new_chars:
+            codes = set(bytearray(self._qual_chars + new_chars))
+            self._qual_chars = bytes(bytearray(sorted(codes)))
+        for code in bytearray(self._qual_chars):
+            count = cycle_qual.count(six.int2byte(code))
+            if count:
+                self._quals[code] = self._quals.get(code, 0) + count
+
+        if self._duplicate_reads < self.DUPLICATE_WINDOW:
+            heads = heads[:self.DUPLICATE_WINDOW - self._duplicate_reads]
+            self._duplicate_reads += len(heads)
+            self._unique_seqs.update(heads)
+
+    def _mean_stdev(self, n, total, square_total):
+        if not n:
+            return 0.0, 0.0
+        mean = float(total) / n
+        if n < 2:
+            return mean, 0.0
+        var = float(n * square_total - total * total) / (n * (n - 1))
+        return mean, math.sqrt(max(var, 0.0))
+
+    def get_stats(self):
+        '''
+        Returns the statistics for the records added so far as a dict with
+        the same keys and rounding as kb_ea_utils.calculate_fastq_stats.
+        '''
+        len_mean, len_stdev = self._mean_stdev(
+            self._reads, self._bases, self._square_lengths)
+        qual_count = sum(self._quals.values())
+        qual_mean, qual_stdev = self._mean_stdev(
+            qual_count,
+            sum(q * c for q, c in self._quals.items()),
+            sum(q * q * c for q, c in self._quals.items()))
+        qual_min = min(self._quals) if self._quals else 0
+        qual_max = max(self._quals) if self._quals else 0
+        phred = 33 if not self._quals or qual_min < 64 else 64
+        if qual_count:
+            qual_min -= phred
+            qual_max -= phred
+            qual_mean -= phred
+        percentages = {}
+        for b in self.BASES:
+            percentages[b] = round(100.0 * self._base_counts[b] /
+                                   self._cycle_bases, 4
+                                   ) if self._cycle_bases else 0.0
+        gc = self._base_counts['G'] + self._base_counts['C']
+        return {'read_count': self._reads,
+                'total_bases': self._bases,
+                'gc_content': round(float(gc) / self._cycle_bases, 6
+                                    ) if self._cycle_bases else 0.0,
+                'read_length_mean': round(len_mean, 4),
+                'read_length_stdev': round(len_stdev, 4),
+                'phred_type': str(phred),
+                'number_of_duplicates':
+                    self._duplicate_reads - len(self._unique_seqs),
+                'qual_min': float(qual_min),
+                'qual_max': float(qual_max),
+                'qual_mean': round(qual_mean, 4),
+                'qual_stdev': round(qual_stdev, 4),
+                'base_percentages': percentages
+                }
+
+
+class DownloadCache(object):
+    '''
+    An on-disk cache of downloaded and processed reads files, shared by every
+    ReadsUtils call using the same directory.
+    Each entry is a directory named for its key holding the reads files and a
+    JSON description of them. Entries are published atomically by renaming a
+    complete temporary directory, and cached files are handed out as hard
+    links, so the directory must be on the same file system as the targets.
+    The cached files are made read only as writing to a link would change the
+    cache. Files are copied into the cache, so the files put in it are left
+    as they were and may still be changed. Once the cache is larger than
+    max_size bytes the least recently used entries are removed.
+    '''
+
+    INFO_FILE = 'files.json'
+    READS_FILES = ['fwd', 'rev']
+
+    def __init__(self, directory, max_size):
+        self._dir = directory
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    @staticmethod
+    def key(node_ids, variant, interleave):
+        return hashlib.sha1(json.dumps([node_ids, variant, interleave])
+                            .encode('utf-8')).hexdigest()
+
+    def get(self, key, target_dir):
+        '''
+        Links the files for key into target_dir and returns their description
+        with the paths set to the links, or None if key is not cached.
+        '''
+        entry = os.path.join(self._dir, key)
+        links = []
+        try:
+            with open(os.path.join(entry, self.INFO_FILE)) as f:
+                files = json.load(f)
+            for k in self.READS_FILES:
+                if files[k]:
+                    target = os.path.join(target_dir, files[k])
+                    os.link(os.path.join(entry, files[k]), target)
+                    links.append(target)
+                    files[k] = target
+            os.utime(entry, None)
+        except (IOError, OSError) as e:
+            # don't leave read only links where the files will be downloaded
+            for link in links:
+                os.remove(link)
+            # missing or evicted while reading
+            if e.errno != errno.ENOENT:
+                raise
+            self.misses += 1
+            return None
+        self.hits += 1
+        return files
+
+    def put(self, key, files):
+        '''
+        Adds the reads files described by files, the files entry of a
+        download_reads result, to the cache under key unless already present.
+        '''
+        entry = os.path.join(self._dir, key)
+        if os.path.isdir(entry):
+            return
+        temp = tempfile.mkdtemp(dir=self._dir, prefix='.tmp_')
+        try:
+            info = dict(files)
+            for k in self.READS_FILES:
+                if files[k]:
+                    info[k] = os.path.basename(files[k])
+                    cached = os.path.join(temp, info[k])
+                    shutil.copyfile(files[k], cached)
+                    os.chmod(cached, 0o444)
+            with open(os.path.join(temp, self.INFO_FILE), 'w') as f:
+                json.dump(info, f)
+            os.rename(temp, entry)
+        except (IOError, OSError) as e:
+            shutil.rmtree(temp, True)
+            # another call published the same entry first
+            if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+                raise
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self._dir):
+            if name.startswith('.'):
+                continue
+            path = os.path.join(self._dir, name)
+            try:
+                size = sum(os.path.getsize(os.path.join(path, f))
+                           for f in os.listdir(path))
+                entries.append((os.path.getmtime(path), size, path))
+            except OSError:  # removed by another call
+                continue
+            total += size
+        for _, size, path in sorted(entries):
+            if total <= self._max_size:
+                break
+            shutil.rmtree(path, True)
+            total -= size
+
+
+class WorkspaceIDCache(object):
+    '''
+    A cache of workspace name to ID translations, shared by the threads of
+    the process using it, so that uploads to the same workspace don't each
+    pay for a ws_name_to_id job. Translations expire ttl seconds after they
+    were looked up. A name is dropped from the cache when looking it up
+    fails, and can be dropped explicitly when an ID turns out to be wrong,
+    for example because the workspace was renamed.
+    '''
+
+    def __init__(self, ttl):
+        self._ttl = ttl
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, lookup):
+        '''
+        Returns the ID for a workspace name, calling lookup(name) to
+        translate it if it's not cached or has expired.
+        '''
+        with self._lock:
+            entry = self._ids.get(name)
+        if entry and entry[1] > time.time():
+            return entry[0]
+        try:
+            wsid = lookup(name)
+        except Exception:
+            self.invalidate(name)
+            raise
+        with self._lock:
+            self._ids[name] = (wsid, time.time() + self._ttl)
+        return wsid
+
+    def invalidate(self, name):
+        with self._lock:
+            self._ids.pop(name, None)
+
+
+class ClientRegistry(object):
+    '''
+    Creates each service client once per URL and hands out the same instance
+    from then on, so that calls share the clients, and their connection
+    pools, rather than constructing a client for every use. Clients are
+    created without tokens, as before, since the callback server handles
+    authentication for the calls made through it.
+    The client classes can be replaced, for example with local stand-ins for
+    tests.
+    '''
+
+    def __init__(self, callback_url, ws_url, dfu_class=None, ws_class=None):
+        self._callback_url = callback_url
+        self._ws_url = ws_url
+        self._dfu_class = dfu_class
+        self._ws_class = ws_class
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get(self, client_class, url):
+        key = (client_class, url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = client_class(url)
+                self._clients[key] = client
+        return client
+
+    def dfu(self):
+        return self.get(self._dfu_class or DataFileUtil, self._callback_url)
+
+    def ws(self):
+        return self.get(self._ws_class or Workspace, self._ws_url)
 #END_HEADER
 
 
@@ -41,16 +1398,80 @@ class ReadsUtils:
     TRUE = 'true'
     FALSE = 'false'
 
-    FASTA_JAR = '/opt/lib/FastaValidator-1.0.jar'
-    FASTQ_EXE = 'fastQValidator'
-
     FASTA_EXT = ['.fa', '.fas', '.fasta', '.fna']
     FASTQ_EXT = ['.fq', '.fastq', '.fnq']
 
     COMPRESS_EXT = ['.gz', '.gzip', '.bz', '.bzip', '.bz2', '.bzip2']
+    # the compressed files upload_reads reads directly
+    INPUT_COMPRESS_EXT = COMPRESS_EXT + ['.xz']
+
+    # size of the blocks read from reads files and the number of records
+    # interleaved and written per write call
+    READ_BLOCK_SIZE = 1024 * 1024
+    INTERLEAVE_BATCH_RECORDS = 1000
+
+    # the most files or file ranges validateFASTQ validates at the same time
+    # whatever max_workers is, which bounds the memory and disk bandwidth it
+    # uses, and the largest range a file is split into for validation
+    MAX_VALIDATE_WORKERS = 32
+    VALIDATE_RANGE_SIZE = 256 * 1024 * 1024
+
+    # the compression level DataFileUtil uses when packing files with gzip,
+    # the default for uploads, which can be set with
+    # upload-compression-level in the config along with the number of
+    # threads, upload-compression-threads, that compress blocks of
+    # GZIP_BLOCK_SIZE bytes at once
+    GZIP_COMPRESSION_LEVEL = 3
+    GZIP_BLOCK_SIZE = 8 * 1024 * 1024
 
     PARAM_IN_LIB = 'read_libraries'
     PARAM_IN_INTERLEAVED = 'interleaved'
+    PARAM_IN_MAX_PARALLEL = 'max_parallel'
+    PARAM_IN_USE_CACHE = 'use_cache'
+    PARAM_IN_COMPRESSION = 'compression'
+    PARAM_IN_INPUT_REFS = 'input_refs'
+    PARAM_IN_SINGLE_ARCHIVE = 'single_archive'
+    PARAM_IN_READS = 'reads'
+
+    # the most objects upload_reads_batch saves with one save_objects call
+    UPLOAD_SAVE_BATCH_SIZE = 200
+
+    # the name of the zip file export_reads_batch packages all the reads
+    # objects in when single_archive is set
+    EXPORT_ARCHIVE = 'reads_export'
+    # the file each exported object's information and provenance is written
+    # to in its zip file, named after the object's ref
+    EXPORT_DETAILS_FILE = 'KBase_object_details_{}.json'
+
+    # the compressions download_reads provides files with, in the order
+    # they're listed in errors, mapped to the encoding of the files and the
+    # compression level. Files are compressed on upload-compression-threads
+    # threads, as for uploads. native files that need no conversion keep the
+    # encoding they have in Shock, and converted files are gzipped
+    DOWNLOAD_COMPRESSIONS = ['none', 'gzip', 'gzip-fast', 'zstd', 'native']
+    DOWNLOAD_COMPRESSION = {'none': ('none', None),
+                            'gzip': ('gzip', GZIP_COMPRESSION_LEVEL),
+                            'gzip-fast': ('gzip', 1),
+                            'zstd': ('zstd', 3),
+                            'native': ('gzip', GZIP_COMPRESSION_LEVEL)}
+    ENCODING_EXT = {'none': '', 'gzip': '.gz', 'zstd': '.zst',
+                    'bzip2': '.bz2', 'xz': '.xz'}
+
+    # downloaded files are fetched from Shock as stored and uncompressed
+    # here, gzip files on download-decompression-threads threads, default
+    # the CPU count.
+    # The compression of the files is part of the download cache key.
+    # Uncompressed files use the key variant they had before a compression
+    # could be chosen, so earlier cache entries are still found
+    DOWNLOAD_CACHE_UNCOMPRESSED = 'uncompress'
+    # the download cache directory under scratch and its default size limit
+    # in bytes, which can be set with download-cache-size in the config
+    DOWNLOAD_CACHE_DIR = 'download_cache'
+    DOWNLOAD_CACHE_SIZE = 50 * 1024 ** 3
+    # how long in seconds workspace name to ID translations are cached for,
+    # which can be set with ws-name-cache-ttl in the config. 0 turns the
+    # cache off
+    WS_NAME_CACHE_TTL = 300
 
     SINGLE_END_TYPE = 'SingleEndLibrary'
     PAIRED_END_TYPE = 'PairedEndLibrary'
@@ -90,12 +1511,12 @@ class ReadsUtils:
         if not self.xor(wsid, wsname):
             raise ValueError(
                 'Exactly one of the workspace ID or name must be provided')
-        dfu = DataFileUtil(self.callback_url)
+        dfu = self.clients.dfu()
         if wsname:
             self.log('Translating workspace name to id')
             if not isinstance(wsname, six.string_types):
                 raise ValueError('wsname must be a string')
-            wsid = dfu.ws_name_to_id(wsname)
+            wsid = self.ws_ids.get(wsname, dfu.ws_name_to_id)
             self.log('translation done')
         del wsname
         objid = params.get('objid')
@@ -263,7 +1684,9 @@ class ReadsUtils:
             raise ValueError(self.PARAM_IN_LIB + ' must be a list')
         if not reads:
             raise ValueError('At least one reads library must be provided')
-        reads = list(set(reads))
+        # drop duplicates, keeping the order of the libraries
+        seen = set()
+        reads = [r for r in reads if not (r in seen or seen.add(r))]
         for read_name in reads:
             if not read_name:
                 raise ValueError('Invalid workspace object name: ' +
@@ -272,6 +1695,32 @@ class ReadsUtils:
 
         self.process_ternary(params, self.PARAM_IN_INTERLEAVED)
 
+        self.process_max_parallel(params)
+
+        if params.get(self.PARAM_IN_USE_CACHE) not in (None, 0, 1):
+            raise ValueError(self.PARAM_IN_USE_CACHE + ' must be 0 or 1')
+        params[self.PARAM_IN_USE_CACHE] = bool(
+            params.get(self.PARAM_IN_USE_CACHE))
+
+        compression = params.get(self.PARAM_IN_COMPRESSION) or 'none'
+        if (not isinstance(compression, six.string_types) or
+                compression not in self.DOWNLOAD_COMPRESSION):
+            raise ValueError(self.PARAM_IN_COMPRESSION + ' must be one of ' +
+                             ', '.join(self.DOWNLOAD_COMPRESSIONS))
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError('zstd compression is not available: the ' +
+                             'zstandard module is not installed')
+        params[self.PARAM_IN_COMPRESSION] = compression
+
+    def process_max_parallel(self, params):
+        max_parallel = params.get(self.PARAM_IN_MAX_PARALLEL)
+        if max_parallel is None:
+            params[self.PARAM_IN_MAX_PARALLEL] = 1
+        elif (not isinstance(max_parallel, six.integer_types) or
+                isinstance(max_parallel, bool) or max_parallel < 1):
+            raise ValueError(self.PARAM_IN_MAX_PARALLEL +
+                             ' must be an integer > 0')
+
     def make_ref(self, object_info):
         return str(object_info[6]) + '/' + str(object_info[0]) + \
             '/' + str(object_info[4])
@@ -366,22 +1815,17 @@ class ReadsUtils:
             return True
         return False
 
-    def _download_reads_from_shock(self, ref, obj_name, handle, file_type):
-        params = {'shock_id': handle['id'],
-                  'unpack': 'uncompress',
-                  'file_path': os.path.join(self.scratch, handle['id'])
-                  }
-        # TODO LATER may want to do dl en masse, but that means if there's a bad file it won't be caught until everythings dl'd @IgnorePep8 # noqa
-        # TODO LATER add method to DFU to get shock attribs and check filename prior to download @IgnorePep8 # noqa
-        # TODO LATER at least check handle filename & file type are ok before
-        # download
-        dfu = DataFileUtil(self.callback_url)
-        ret = dfu.shock_to_file(params)
-        fn = ret['node_file_name']
+    def _check_file_names(self, ref, obj_name, handle, file_type,
+                          shock_filename=None):
+        '''
+        Checks the Shock file name, if known, and the handle file name and
+        file type from the reads object are FASTQ names. Returns whether any
+        of the names were available.
+        '''
         if file_type and not file_type.startswith('.'):
             file_type = '.' + file_type
         ok = False
-        for f, n in zip([fn, handle.get('file_name'), file_type],
+        for f, n in zip([shock_filename, handle.get('file_name'), file_type],
                         ['Shock file name',
                          'Handle file name from reads Workspace object',
                          'File type from reads Workspace object']):
@@ -392,6 +1836,24 @@ class ReadsUtils:
                          'object {} ({}). Shock node {}')
                         .format(n, f, obj_name, ref, handle['id']))
                 ok = True
+        return ok
+
+    def _download_reads_from_shock(self, ref, obj_name, handle, file_type,
+                                   scratch=None, downloads=None):
+        '''
+        Downloads a reads file from Shock and checks its names. If downloads,
+        a mapping of Shock node IDs to shock_to_file output, contains the
+        node the file has already been downloaded.
+        '''
+        if downloads and handle['id'] in downloads:
+            ret = downloads[handle['id']]
+        else:
+            # TODO LATER add method to DFU to get shock attribs and check filename prior to download @IgnorePep8 # noqa
+            dfu = self.clients.dfu()
+            ret = dfu.shock_to_file(self._shock_to_file_params(
+                handle, scratch))
+        fn = ret['node_file_name']
+        ok = self._check_file_names(ref, obj_name, handle, file_type, fn)
         # TODO this is untested. You have to try pretty hard to upload a file without a name to Shock. @IgnorePep8 # noqa
         if not ok:
             raise ValueError(
@@ -404,61 +1866,277 @@ class ReadsUtils:
             self.log('Filename from Shock: ' + fn)
         return ret['file_path'], fn
 
+    def _download_path(self, handle, scratch=None, suffix=''):
+        return os.path.join(scratch or self.scratch, handle['id']) + suffix
+
+    def _shock_to_file_params(self, handle, scratch=None, suffix=''):
+        return {'shock_id': handle['id'],
+                'file_path': self._download_path(handle, scratch, suffix)
+                }
+
+    def _expected_encoding(self, handle, file_type):
+        # the encoding a Shock file should have going by its names
+        for name in [handle.get('file_name'), file_type]:
+            if name:
+                ext = self._get_ext(name.lower(), self.COMPRESS_EXT)
+                if not ext:
+                    return 'none'
+                return 'gzip' if ext in ['.gz', '.gzip'] else 'bzip2'
+        return 'none'
+
+    def _download_suffixes(self, reads, interleave, compression):
+        '''
+        Returns the suffix to add to the download path of each of the files
+        of a reads object, in _reads_files order. Files that should need no
+        conversion are downloaded straight to the name they are provided
+        with, and the rest to the bare download path.
+        '''
+        single, _ = self.check_reads(reads)
+        files = self._reads_files(reads)
+        if single:
+            names = ['.single.fastq']
+        elif len(files) == 1:
+            names = ['.inter.fastq' if interleave is not False else None]
+        else:
+            names = ([None, None] if interleave
+                     else ['.fwd.fastq', '.rev.fastq'])
+        encoding = self.DOWNLOAD_COMPRESSION[compression][0]
+        suffixes = []
+        for (handle, file_type), name in zip(files, names):
+            expected = self._expected_encoding(handle, file_type)
+            if name and (compression == 'native' or expected == encoding):
+                suffixes.append(name + self.ENCODING_EXT[expected])
+            else:
+                suffixes.append('')
+        return suffixes
+
+    def _reads_files(self, reads):
+        '''
+        Returns a list of (handle, file type) tuples for the files of a reads
+        object. The file type is None for KBaseAssembly objects.
+        '''
+        data = reads['data']
+        single, kbasefile = self.check_reads(reads)
+        if kbasefile:
+            libs = ['lib'] if single else ['lib1', 'lib2']
+            return [(data[lib]['file'], data[lib]['type'])
+                    for lib in libs if lib in data]
+        handles = ['handle'] if single else ['handle_1', 'handle_2']
+        return [(data[h], None) for h in handles if h in data]
+
+    def _download_shock_batch(self, params, owners):
+        '''
+        Downloads a batch of files with one shock_to_file_mass call. If the
+        batch fails the files are downloaded one at a time so the failing
+        file and the reads object it belongs to can be reported.
+        owners holds the (ref, object name) for each file.
+        '''
+        dfu = self.clients.dfu()
+        try:
+            return dfu.shock_to_file_mass(params)
+        except DFUError:
+            if len(params) == 1:
+                ref, obj_name = owners[0]
+                self.log(('Download failed for Shock node {}. Reads ' +
+                          'object {} ({})').format(params[0]['shock_id'],
+                                                   obj_name, ref))
+                raise
+            self.log(('Batch download of {} files failed, downloading ' +
+                      'files individually').format(len(params)))
+        return [self._download_shock_batch([p], [o])[0]
+                for p, o in zip(params, owners)]
+
+    def _download_reads_files(self, libs, max_parallel):
+        '''
+        Downloads the files for a list of (ref, object name, scratch
+        directory, reads files, download suffixes) tuples in up to
+        max_parallel shock_to_file_mass calls, run at the same time.
+        A Shock node shared by several libraries is only downloaded once and
+        hard linked, or copied, to the paths of the other libraries.
+        Returns a mapping of Shock node ID to shock_to_file output for each
+        library.
+        '''
+        params = []
+        owners = []
+        sources = []  # the index of the download and the target per file
+        first = {}
+        for ref, obj_name, scratch, files, suffixes in libs:
+            for (handle, _), suffix in zip(files, suffixes):
+                p = self._shock_to_file_params(handle, scratch, suffix)
+                if handle['id'] not in first:
+                    first[handle['id']] = len(params)
+                    params.append(p)
+                    owners.append((ref, obj_name))
+                sources.append((first[handle['id']], p['file_path']))
+        batch_size = max(-(-len(params) // max_parallel), 1)  # ceiling
+        batches = [(params[i:i + batch_size], owners[i:i + batch_size])
+                   for i in range(0, len(params), batch_size)]
+        self.log('Downloading {} files from Shock in {} batches'.format(
+            len(params), len(batches)))
+        if len(batches) == 1:
+            rets = self._download_shock_batch(*batches[0])
+        else:
+            pool = ThreadPool(len(batches))
+            try:
+                results = [pool.apply_async(self._download_shock_batch, b)
+                           for b in batches]
+                rets = [r for result in results for r in result.get()]
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
+        shared = []
+        for i, file_path in sources:
+            if params[i]['file_path'] == file_path:
+                shared.append(rets[i])
+                continue
+            try:
+                os.link(rets[i]['file_path'], file_path)
+            except OSError:
+                shutil.copy(rets[i]['file_path'], file_path)
+            ret = dict(rets[i])
+            ret['file_path'] = file_path
+            shared.append(ret)
+        downloads = []
+        shared = iter(shared)
+        for _, _, _, files, _ in libs:
+            downloads.append(dict((handle['id'], next(shared))
+                                  for handle, _ in files))
+        return downloads
+
     def mv(self, oldfile, newfile):
         self.log('Moving {} to {}'.format(oldfile, newfile))
         shutil.move(oldfile, newfile)
 
-    def process_single_end(self, ref, obj_name, handle, file_type=None):
+    def _open_reads(self, file_path):
+        return open_reads_file(file_path, self.READ_BLOCK_SIZE,
+                               self.decompression_threads)
+
+    def _open_output(self, file_path, compression):
+        '''
+        Opens a file for writing bytes with one of the download_reads
+        compressions.
+        '''
+        encoding, level = self.DOWNLOAD_COMPRESSION[compression]
+        if encoding == 'gzip':
+            return ParallelGzipWriter(file_path, level,
+                                      self.compression_threads,
+                                      self.GZIP_BLOCK_SIZE)
+        if encoding == 'zstd':
+            return ZstdWriter(file_path, level, self.compression_threads)
+        return open(file_path, 'wb')
+
+    def _encoding(self, compression, file_path=None):
+        '''
+        Returns the encoding of a file provided with one of the
+        download_reads compressions. For native compression, the encoding of
+        the Shock file at file_path, if given, is kept.
+        '''
+        if compression == 'native' and file_path:
+            return reads_file_compression(file_path) or 'none'
+        return self.DOWNLOAD_COMPRESSION[compression][0]
+
+    def _convert(self, oldfile, newfile, compression='none', encoding=None):
+        '''
+        Provides a downloaded reads file as newfile with encoding, by default
+        that of the download_reads compression. A file that already has the
+        encoding is passed through as is, renamed if it wasn't downloaded to
+        newfile, and any other file is uncompressed and, if need be,
+        compressed again on the way.
+        '''
+        encoding = encoding or self._encoding(compression, oldfile)
+        current = reads_file_compression(oldfile) or 'none'
+        if current == encoding:
+            if oldfile != newfile:
+                self.mv(oldfile, newfile)
+            return
+        if oldfile == newfile:  # not the encoding its names suggested
+            oldfile = newfile + '.download'
+            self.mv(newfile, oldfile)
+        self.log('Converting {} file {} to {} file {}'.format(
+            current, oldfile, encoding, newfile))
+        with self._open_reads(oldfile) as s, \
+                self._open_output(newfile, compression) as t:
+            while True:
+                data = s.read(self.READ_BLOCK_SIZE)
+                if not data:
+                    break
+                t.write(data)
+        os.remove(oldfile)
+
+    def process_single_end(self, ref, obj_name, handle, file_type=None,
+                           scratch=None, downloads=None, compression='none'):
         path, name = self._download_reads_from_shock(
-            ref, obj_name, handle, file_type)
-        np = path + '.single.fastq'
-        self.mv(path, np)
+            ref, obj_name, handle, file_type, scratch, downloads)
+        encoding = self._encoding(compression, path)
+        np = self._download_path(
+            handle, scratch, '.single.fastq' + self.ENCODING_EXT[encoding])
+        self._convert(path, np, compression)
         return {'fwd': np,
                 'fwd_name': name,
                 'rev': None,
                 'rev_name': None,
                 'otype': 'single',
-                'type': 'single'}
+                'type': 'single',
+                'encoding': encoding}
 
-    def get_file_prefix(self):
-        return os.path.join(self.scratch, str(uuid.uuid4()))
+    def get_file_prefix(self, scratch=None):
+        return os.path.join(scratch or self.scratch, str(uuid.uuid4()))
 
     # should probably make an InterleaveProcessor class to avoid these
     # insane method sigs
 
-    def _read_fq_record(self, source_obj_ref, source_obj_name,
-                        shock_filename, shock_node, f,
-                        reads_source, filesource):
-        r = ''
-        for i in xrange(4):
-            l = f.readline()
-            while (l == '\n'):  # skip blank lines
-                l = f.readline()
-            if not l:  # EOF
-                if i != 0:
-                    error_message_bindings = [shock_node, shock_filename]
-                    error_message = 'Reading FASTQ record failed - non-blank lines are ' \
-                                    'not a multiple of four. '
-                    if source_obj_ref is not None and source_obj_name is not None:
-                        error_message += 'Workspace reads object {} ({}), '
-                        error_message_bindings.insert(0, source_obj_ref)
-                        error_message_bindings.insert(0, source_obj_name)
-
-                    if reads_source == 'web':
-                        error_message += 'File URL {}, '
-                        error_message_bindings.insert(0, filesource)
-
-                    if reads_source == 'staging':
-                        error_message += 'Staging file name {}, '
-                        error_message_bindings.insert(0, filesource)
-
-                    error_message += 'Shock node {}, Shock filename {}'
-                    raise ValueError(error_message.format(
-                        *error_message_bindings))
-                else:
-                    return ''
-            r = r + l
-        return r
+    def _fq_record_error(self, source_obj_ref, source_obj_name,
+                         shock_filename, shock_node, reads_source, filesource):
+        error_message_bindings = [shock_node, shock_filename]
+        error_message = 'Reading FASTQ record failed - non-blank lines are ' \
+                        'not a multiple of four. '
+        if source_obj_ref is not None and source_obj_name is not None:
+            error_message += 'Workspace reads object {} ({}), '
+            error_message_bindings.insert(0, source_obj_ref)
+            error_message_bindings.insert(0, source_obj_name)
+
+        if reads_source == 'web':
+            error_message += 'File URL {}, '
+            error_message_bindings.insert(0, filesource)
+
+        if reads_source == 'staging':
+            error_message += 'Staging file name {}, '
+            error_message_bindings.insert(0, filesource)
+
+        error_message += 'Shock node {}, Shock filename {}'
+        return ValueError(error_message.format(*error_message_bindings))
+
+    def _interleave_count_error(self, source_obj_ref, source_obj_name,
+                                fwd_shock_filename, fwd_shock_node,
+                                rev_shock_filename, rev_shock_node,
+                                fwdpath, revpath, reads_source, fwdsource,
+                                revsource):
+        error_message_bindings = list()
+        error_message = 'Interleave failed - reads files do not have '\
+                        'an equal number of records. '
+        if source_obj_name is not None and source_obj_ref is not None:
+            error_message += 'Workspace reads object {} ({}). '
+            error_message_bindings.insert(0, source_obj_ref)
+            error_message_bindings.insert(0, source_obj_name)
+        if fwd_shock_node is not None and rev_shock_node is not None:
+            error_message += 'forward Shock node {}, filename {}, ' \
+                             'reverse Shock node {}, filename {}. '
+            error_message_bindings.extend([fwd_shock_node, fwd_shock_filename,
+                                           rev_shock_node, rev_shock_filename])
+        error_message += 'Forward Path {}, Reverse Path {}.'
+        error_message_bindings.extend([fwdpath, revpath])
+
+        if reads_source == 'web':
+            error_message += 'Forward File URL {}, Reverse File URL {}.'
+            error_message_bindings.extend([fwdsource, revsource])
+
+        if reads_source == 'staging':
+            error_message += 'Forward Staging file name {}, '
+            error_message += 'Reverse Staging file name {}.'
+            error_message_bindings.extend([fwdsource, revsource])
+
+        return ValueError(error_message.format(*error_message_bindings))
 
     # this assumes that the FASTQ files are properly formatted and matched,
     # which they should be if they're in KBase.
@@ -466,71 +2144,92 @@ class ReadsUtils:
     # reads_source, fwdsource, revsource will be None if done from process_paired.
     def interleave(self, source_obj_ref, source_obj_name, fwd_shock_filename,
                    fwd_shock_node, rev_shock_filename, rev_shock_node,
-                   fwdpath, revpath, targetpath, reads_source, fwdsource, revsource):
+                   fwdpath, revpath, targetpath, reads_source, fwdsource, revsource,
+                   compression='none'):
         self.log('Interleaving files {} and {} to {}'.format(
             fwdpath, revpath, targetpath))
-        with open(targetpath, 'w') as t:
-            with open(fwdpath, 'r') as f, open(revpath, 'r') as r:
-                while True:
-                    frec = self._read_fq_record(
+        with self._open_output(targetpath, compression) as t:
+            for chunk in self._interleave_chunks(
+                    source_obj_ref, source_obj_name, fwd_shock_filename,
+                    fwd_shock_node, rev_shock_filename, rev_shock_node,
+                    fwdpath, revpath, reads_source, fwdsource, revsource):
+                t.write(chunk)
+
+    def _interleave_chunks(self, source_obj_ref, source_obj_name,
+                           fwd_shock_filename, fwd_shock_node,
+                           rev_shock_filename, rev_shock_node,
+                           fwdpath, revpath, reads_source, fwdsource,
+                           revsource, skip_whitespace_lines=False):
+        # yields the interleaved records a batch at a time
+        batch = self.INTERLEAVE_BATCH_RECORDS
+        with self._open_reads(fwdpath) as f, self._open_reads(revpath) as r:
+            freader = FASTQRecordReader(f, self.READ_BLOCK_SIZE,
+                                        skip_whitespace_lines)
+            rreader = FASTQRecordReader(r, self.READ_BLOCK_SIZE,
+                                        skip_whitespace_lines)
+            while True:
+                frecs = freader.read_records(batch)
+                rrecs = rreader.read_records(batch)
+                count = min(len(frecs), len(rrecs))
+                if count:
+                    out = [None] * (2 * count)
+                    out[0::2] = frecs[:count]
+                    out[1::2] = rrecs[:count]
+                    yield b''.join(out)
+                if count == batch:
+                    continue
+                # at least one file is exhausted. Check the record after the
+                # last complete pair the same way reading one record at a
+                # time from each file would.
+                fmore = len(frecs) > count
+                rmore = len(rrecs) > count
+                if not fmore and freader.leftover:
+                    raise self._fq_record_error(
                         source_obj_ref, source_obj_name,
-                        fwd_shock_filename, fwd_shock_node, f,
+                        fwd_shock_filename, fwd_shock_node,
                         reads_source, fwdsource)
-                    rrec = self._read_fq_record(
+                if not rmore and rreader.leftover:
+                    raise self._fq_record_error(
                         source_obj_ref, source_obj_name,
-                        rev_shock_filename, rev_shock_node, r,
+                        rev_shock_filename, rev_shock_node,
                         reads_source, revsource)
-                    error_message_bindings = list()
-                    if (not frec and rrec) or (frec and not rrec):
-                        error_message = 'Interleave failed - reads files do not have '\
-                                        'an equal number of records. '
-                        if source_obj_name is not None and source_obj_ref is not None:
-                            error_message += 'Workspace reads object {} ({}). '
-                            error_message_bindings.insert(0, source_obj_ref)
-                            error_message_bindings.insert(0, source_obj_name)
-                        if fwd_shock_node is not None and rev_shock_node is not None:
-                            error_message += 'forward Shock node {}, filename {}, ' \
-                                             'reverse Shock node {}, filename {}. '
-                            error_message_bindings.extend([fwd_shock_node, fwd_shock_filename,
-                                                           rev_shock_node, rev_shock_filename])
-                        error_message += 'Forward Path {}, Reverse Path {}.'
-                        error_message_bindings.extend([fwdpath, revpath])
-
-                        if reads_source == 'web':
-                            error_message += 'Forward File URL {}, Reverse File URL {}.'
-                            error_message_bindings.extend([fwdsource, revsource])
-
-                        if reads_source == 'staging':
-                            error_message += 'Forward Staging file name {}, '
-                            error_message += 'Reverse Staging file name {}.'
-                            error_message_bindings.extend([fwdsource, revsource])
-
-                        raise ValueError(error_message.format(
-                            *error_message_bindings))
-                    if not frec:  # not rrec is implied at this point
-                        break
-                    t.write(frec)
-                    t.write(rrec)
+                if fmore or rmore:
+                    raise self._interleave_count_error(
+                        source_obj_ref, source_obj_name,
+                        fwd_shock_filename, fwd_shock_node,
+                        rev_shock_filename, rev_shock_node,
+                        fwdpath, revpath, reads_source, fwdsource,
+                        revsource)
+                break
 
     # this assumes that the FASTQ file is properly formatted, which it should
-    # be if it's in KBase. Credit:
-    # https://www.biostars.org/p/19446/#117160
+    # be if it's in KBase. Records are routed to the forward and reverse files
+    # a batch at a time rather than line by line.
     def deinterleave(self, source_obj_ref, source_obj_name, shock_filename,
-                     shock_node, filepath, fwdpath, revpath):
+                     shock_node, filepath, fwdpath, revpath,
+                     compression='none'):
         self.log('Deinterleaving file {} to files {} and {}'.format(
             filepath, fwdpath, revpath))
-        with open(filepath, 'r') as s:
-            with open(fwdpath, 'w') as f, open(revpath, 'w') as r:
-                count = 0
-                for line in s:
-                    if not line.strip():
-                        continue
-                    if count % 8 < 4:
-                        f.write(line)
-                    else:
-                        r.write(line)
-                    count += 1
-        if count % 8 != 0:
+        batch = 2 * self.INTERLEAVE_BATCH_RECORDS
+        with self._open_reads(filepath) as s:
+            with self._open_output(fwdpath, compression) as f, \
+                    self._open_output(revpath, compression) as r:
+                reader = FASTQRecordReader(s, self.READ_BLOCK_SIZE,
+                                           skip_whitespace_lines=True)
+                while True:
+                    recs = reader.read_records(batch)
+                    last = len(recs) < batch
+                    # the reader is exhausted on the last batch, so check it
+                    # before writing rather than leave a partial pair behind
+                    valid = not (last and (len(recs) % 2 or reader.leftover))
+                    if valid:
+                        f.write(b''.join(recs[0::2]))
+                        r.write(b''.join(recs[1::2]))
+                    if last or not valid:
+                        break
+        if not valid:
+            for path in (fwdpath, revpath):
+                os.remove(path)
             raise ValueError('Deinterleave failed - line count ' +
                              'is not divisible by 8. Workspace reads object ' +
                              '{} ({}), Shock node {}, Shock filename {}.'
@@ -541,180 +2240,818 @@ class ReadsUtils:
     # make some input classes for starters to fix these gross method sigs
 
     def process_interleaved(self, source_obj_ref, source_obj_name,
-                            handle, interleave, file_type=None):
+                            handle, interleave, file_type=None, scratch=None,
+                            downloads=None, compression='none'):
         path, name = self._download_reads_from_shock(
-            source_obj_ref, source_obj_name, handle, file_type)
+            source_obj_ref, source_obj_name, handle, file_type, scratch,
+            downloads)
 
         ret = {}
         if interleave is not False:  # e.g. True or None
-            np = path + '.inter.fastq'
-            self.mv(path, np)
+            encoding = self._encoding(compression, path)
+            np = self._download_path(
+                handle, scratch, '.inter.fastq' + self.ENCODING_EXT[encoding])
+            self._convert(path, np, compression)
             ret = {'fwd': np,
                    'fwd_name': name,
                    'rev': None,
                    'rev_name': None,
                    'otype': 'interleaved',
-                   'type': 'interleaved'}
+                   'type': 'interleaved',
+                   'encoding': encoding}
         else:
-            fwdpath = os.path.join(self.scratch, self.get_file_prefix() +
-                                   '.fwd.fastq')
-            revpath = os.path.join(self.scratch, self.get_file_prefix() +
-                                   '.rev.fastq')
+            encoding = self._encoding(compression)
+            ext = self.ENCODING_EXT[encoding]
+            fwdpath = self.get_file_prefix(scratch) + '.fwd.fastq' + ext
+            revpath = self.get_file_prefix(scratch) + '.rev.fastq' + ext
             self.deinterleave(source_obj_ref, source_obj_name, name,
-                              handle['id'], path, fwdpath, revpath)
+                              handle['id'], path, fwdpath, revpath,
+                              compression)
             ret = {'fwd': fwdpath,
                    'fwd_name': name,
                    'rev': revpath,
                    'rev_name': None,
                    'otype': 'interleaved',
-                   'type': 'paired'
+                   'type': 'paired',
+                   'encoding': encoding
                    }
         return ret
 
     def process_paired(self, source_obj_ref, source_obj_name,
                        fwdhandle, revhandle, interleave,
-                       fwd_file_type=None, rev_file_type=None):
+                       fwd_file_type=None, rev_file_type=None, scratch=None,
+                       downloads=None, compression='none'):
 
         fwdpath, fwdname = self._download_reads_from_shock(
-            source_obj_ref, source_obj_name, fwdhandle, fwd_file_type)
+            source_obj_ref, source_obj_name, fwdhandle, fwd_file_type,
+            scratch, downloads)
         revpath, revname = self._download_reads_from_shock(
-            source_obj_ref, source_obj_name, revhandle, rev_file_type)
+            source_obj_ref, source_obj_name, revhandle, rev_file_type,
+            scratch, downloads)
 
         ret = {}
         if interleave:
             # we expect the job runner to clean up for us
-            intpath = os.path.join(self.scratch, self.get_file_prefix() +
-                                   '.inter.fastq')
+            encoding = self._encoding(compression)
+            intpath = (self.get_file_prefix(scratch) + '.inter.fastq' +
+                       self.ENCODING_EXT[encoding])
             self.interleave(source_obj_ref, source_obj_name, fwdname, fwdhandle['id'],
-                            revname, revhandle['id'], fwdpath, revpath, intpath, None, None, None)
+                            revname, revhandle['id'], fwdpath, revpath, intpath, None, None, None,
+                            compression)
             ret = {'fwd': intpath,
                    'fwd_name': fwdname,
                    'rev': None,
                    'rev_name': revname,
                    'otype': 'paired',
-                   'type': 'interleaved'
+                   'type': 'interleaved',
+                   'encoding': encoding
                    }
         else:
-            nf = fwdpath + '.fwd.fastq'
-            nr = revpath + '.rev.fastq'
-            self.mv(fwdpath, nf)
-            self.mv(revpath, nr)
+            # native files are only left as they are if both have the same
+            # encoding, as the reads have one encoding
+            encoding = self._encoding(compression, fwdpath)
+            if encoding != self._encoding(compression, revpath):
+                encoding = self._encoding(compression)
+            ext = self.ENCODING_EXT[encoding]
+            nf = self._download_path(fwdhandle, scratch, '.fwd.fastq' + ext)
+            nr = self._download_path(revhandle, scratch, '.rev.fastq' + ext)
+            self._convert(fwdpath, nf, compression, encoding)
+            self._convert(revpath, nr, compression, encoding)
             ret = {'fwd': nf,
                    'fwd_name': fwdname,
                    'rev': nr,
                    'rev_name': revname,
                    'otype': 'paired',
-                   'type': 'paired'
+                   'type': 'paired',
+                   'encoding': encoding
                    }
         return ret
 
-    def process_reads(self, reads, interleave):
-        data = reads['data']
-        info = reads['info']
-        # Object Info Contents
-        # 0 - obj_id objid
-        # 1 - obj_name name
-        # 2 - type_string type
-        # 3 - timestamp save_date
-        # 4 - int version
-        # 5 - username saved_by
-        # 6 - ws_id wsid
-        # 7 - ws_name workspace
-        # 8 - string chsum
-        # 9 - int size
-        # 10 - usermeta meta
+    def process_reads(self, reads, interleave, scratch=None, downloads=None,
+                      compression='none'):
+        data = reads['data']
+        info = reads['info']
+        # Object Info Contents
+        # 0 - obj_id objid
+        # 1 - obj_name name
+        # 2 - type_string type
+        # 3 - timestamp save_date
+        # 4 - int version
+        # 5 - username saved_by
+        # 6 - ws_id wsid
+        # 7 - ws_name workspace
+        # 8 - string chsum
+        # 9 - int size
+        # 10 - usermeta meta
+
+        single, kbasefile = self.check_reads(reads)
+        ret = self.set_up_reads_return(single, kbasefile, reads)
+        obj_name = info[1]
+        ref = ret['ref']
+        self.log('Type: ' + info[2])
+
+        # lib1 = KBaseFile, handle_1 = KBaseAssembly
+        if kbasefile:
+
+            if single:
+                sreads = data['lib']['file']
+                type_ = data['lib']['type']
+                ret['files'] = self.process_single_end(
+                    ref, obj_name, sreads, type_, scratch, downloads,
+                    compression)
+            else:
+                fwd_reads = data['lib1']['file']
+                fwd_type = data['lib1']['type']
+                if 'lib2' in data:  # not interleaved
+                    rev_reads = data['lib2']['file']
+                    rev_type = data['lib2']['type']
+                    ret['files'] = self.process_paired(
+                        ref, obj_name, fwd_reads, rev_reads,
+                        interleave, fwd_type, rev_type, scratch, downloads,
+                        compression)
+                else:
+                    ret['files'] = self.process_interleaved(
+                        ref, obj_name, fwd_reads, interleave, fwd_type,
+                        scratch, downloads, compression)
+        else:  # KBaseAssembly
+            if single:
+                ret['files'] = self.process_single_end(
+                    ref, obj_name, data['handle'], scratch=scratch,
+                    downloads=downloads, compression=compression)
+            else:
+                if 'handle_2' in data:  # not interleaved
+                    ret['files'] = self.process_paired(
+                        ref, obj_name, data['handle_1'],
+                        data['handle_2'], interleave, scratch=scratch,
+                        downloads=downloads, compression=compression)
+                else:
+                    ret['files'] = self.process_interleaved(
+                        ref, obj_name, data['handle_1'], interleave,
+                        scratch=scratch, downloads=downloads,
+                        compression=compression)
+
+        return ret
+
+    def _process_downloaded_reads(self, read_name, reads, interleave,
+                                  scratch, downloads, cache=None, key=None,
+                                  compression='none'):
+        self.log('=== processing read library ' + read_name + '===\n',
+                 prefix_newline=True)
+        ret = self.process_reads(reads, interleave, scratch, downloads,
+                                 compression)
+        if cache:
+            cache.put(key, ret['files'])
+        return ret
+
+    def _cached_reads(self, reads, files):
+        single, kbasefile = self.check_reads(reads)
+        ret = self.set_up_reads_return(single, kbasefile, reads)
+        # entries cached before files had encodings are uncompressed
+        files.setdefault('encoding', 'none')
+        ret['files'] = files
+        return ret
+
+    def _clean_chunks(self, file_path, decompress=False):
+        return clean_fastq_chunks(file_path, self.READ_BLOCK_SIZE,
+                                  decompress=decompress)
+
+    def _check_validation(self, line_count, errors):
+        if line_count % 4 != 0:
+            self.log('Invalid FASTQ file, expected multiple of 4 lines, ' +
+                     'got ' + str(line_count))
+        else:
+            self.log(str(line_count) + ' lines in file')
+        for e in errors:
+            self.log('Record {record}, line {line}, byte {offset}: {error}'
+                     .format(**e))
+        validated = 0 if errors else 1
+        self.log('Validation ' + ('succeeded' if validated else 'failed'))
+        return validated
+
+    def _validate_fastq_stream(self, file_path, interleaved):
+        '''
+        Validates a FASTQ file, removing any blank lines, and returns whether
+        the file is valid and the validation errors.
+        '''
+        self.log('Checking line count and running validator')
+        return self._check_fastq_file(file_path, validate_fastq_file(
+            file_path, interleaved, self.READ_BLOCK_SIZE))
+
+    def _validate_fastq_files(self, params, workers):
+        '''
+        Validates FASTQ files in a pool of worker processes, largest first,
+        and returns whether each file is valid and its validation errors in
+        the order of params. Files with split_file set are split into byte
+        ranges that are validated separately, after which their sequence
+        identifiers are checked for repeats a bucket at a time. Each worker
+        process validates a single file or range or checks a single bucket,
+        so that the memory it used is returned when it finishes.
+        '''
+        self.log('Validating {} FASTQ files with {} workers'.format(
+            len(params), workers))
+        tasks = []
+        ranges = []
+        work_dir = tempfile.mkdtemp(dir=self.scratch)
+        for i, p in enumerate(params):
+            file_path = p['file_path']
+            if p.get('split_file'):
+                bounds = self._fastq_ranges(file_path, workers)
+                ranges.append(bounds)
+                buckets = max(workers, len(bounds) - 1)
+                for r, (start, end) in enumerate(zip(bounds, bounds[1:])):
+                    prefix = os.path.join(work_dir, '{}_{}'.format(i, r))
+                    tasks.append((end - start, i, r, validate_fastq_range, (
+                        file_path, p.get('interleaved'),
+                        self.READ_BLOCK_SIZE, start, end, prefix + '.fastq',
+                        prefix + '.ids', buckets)))
+            else:
+                ranges.append(None)
+                tasks.append((os.path.getsize(file_path), i, 0,
+                              validate_fastq_file, (
+                                  file_path, p.get('interleaved'),
+                                  self.READ_BLOCK_SIZE)))
+        start = time.time()
+        pool = multiprocessing.Pool(workers, maxtasksperchild=1)
+        try:
+            results = [[] for _ in params]
+            for _, i, r, func, args in sorted(tasks, key=lambda t: -t[0]):
+                results[i].append((r, pool.apply_async(func, args)))
+            # collect in input order so the results line up with params and
+            # the first failing file is reported
+            out = []
+            for i, p in enumerate(params):
+                self.log('Validating FASTQ file ' + p['file_path'])
+                rets = [res.get() for _, res in
+                        sorted(results[i], key=lambda x: x[0])]
+                if ranges[i] is None:
+                    ret = rets[0]
+                else:
+                    self.log('Validated {} ranges of {}'.format(
+                        len(rets), p['file_path']))
+                    ret = self._merge_fastq_ranges(
+                        pool, p, ranges[i], rets,
+                        os.path.join(work_dir, str(i)), start)
+                out.append(self._check_fastq_file(p['file_path'], ret))
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return out
+
+    def _fastq_ranges(self, file_path, workers):
+        '''
+        Splits a FASTQ file into at least workers byte ranges of at most
+        VALIDATE_RANGE_SIZE bytes, unless that would make ranges smaller than
+        READ_BLOCK_SIZE, and moves the boundaries to the start of the next
+        record. Returns the boundaries, starting with 0 and ending with the
+        file size.
+        '''
+        size = os.path.getsize(file_path)
+        count = max(workers, -(-size // self.VALIDATE_RANGE_SIZE))
+        count = max(min(count, size // self.READ_BLOCK_SIZE), 1)
+        bounds = [0]
+        for i in range(1, count):
+            start = fastq_record_start(file_path, size * i // count,
+                                       self.READ_BLOCK_SIZE)
+            if start > bounds[-1] and start < size:
+                bounds.append(start)
+        bounds.append(size)
+        return bounds
+
+    def _merge_fastq_ranges(self, pool, params, bounds, results, prefix,
+                            start):
+        '''
+        Combines the validate_fastq_range results for the ranges of a file
+        into a validate_fastq_file result. The errors are renumbered from the
+        start of the file, less any blank lines, and the sequence identifiers
+        are checked for repeats across the ranges a bucket at a time in the
+        pool. If any range had blank lines, the file is replaced by the
+        ranges without them. prefix is the path the range files were named
+        from, less the range number.
+        A range other than the last that ends part way through a record
+        shifts the lines of every record after it, so the file is validated
+        from that record on as validate_fastq_file would, which stops as soon
+        as there are enough errors, instead of using the later ranges'
+        errors.
+        '''
+        file_path = params['file_path']
+        line_count = 0
+        length = 0
+        errors = []
+        offsets = []
+        misframed = None
+        for r, ((c, errs, _, clean_length, _, _), s) in enumerate(
+                zip(results, bounds)):
+            if misframed is None:
+                for e in errs:
+                    e = dict(e)
+                    e['record'] += line_count // 4
+                    e['line'] += line_count
+                    e['offset'] += length - s
+                    errors.append(e)
+                # unless the validator stopped early, the last error is for
+                # the incomplete record
+                if (c % 4 and r < len(results) - 1 and errs and
+                        errs[-1]['record'] == c // 4 + 1):
+                    misframed = errors.pop()
+                    misframed_range = r
+            offsets.append((line_count // 4, length - s))
+            line_count += c
+            length += clean_length
+        id_offsets = [r[5] for r in results]
+        if id_offsets[0] is not None:
+            repeats = [pool.apply_async(find_repeated_ids, (
+                self._id_bucket(prefix, id_offsets, offsets, b),))
+                for b in range(len(id_offsets[0]) - 1)]
+            for res in repeats:
+                errors.extend(res.get())
+        # a record with a repeated identifier may have other problems, but
+        # only the first problem in a record is reported
+        errors.sort(key=lambda e: (e['record'], e['line']))
+        errors = [e for i, e in enumerate(errors)
+                  if not i or e['record'] != errors[i - 1]['record']]
+        cleaned = [r[2] for r in results]
+        if any(cleaned):
+            self._join_fastq_ranges(file_path, bounds, [
+                '{}_{}.fastq'.format(prefix, r) if c else None
+                for r, c in enumerate(cleaned)])
+        if misframed is not None:
+            errors = [e for e in errors
+                      if e['record'] < misframed['record']]
+            errors = errors[:FASTQValidator.MAX_ERRORS]
+            max_errors = FASTQValidator.MAX_ERRORS - len(errors)
+            if max_errors:
+                seen = set()
+                if id_offsets[0] is not None:
+                    seen = self._find_seen_ids(
+                        pool, file_path, misframed, max_errors, prefix,
+                        id_offsets[:misframed_range + 1], offsets)
+                validator = FASTQValidator(params.get('interleaved'),
+                                           max_errors,
+                                           offset=misframed['offset'])
+                validator.records = misframed['record'] - 1
+                validator.ids = seen
+                errors += self._validate_fastq_from(
+                    validator, file_path, misframed['offset'], max_errors)
+        return (line_count, errors[:FASTQValidator.MAX_ERRORS], any(cleaned),
+                time.time() - start)
+
+    def _id_bucket(self, prefix, id_offsets, offsets, bucket):
+        '''
+        Returns the find_repeated_ids ranges argument for a bucket of the
+        sequence identifiers written for the ranges of a file.
+        '''
+        return [('{}_{}.ids'.format(prefix, r), o[bucket], o[bucket + 1]) +
+                offsets[r] for r, o in enumerate(id_offsets)]
+
+    def _validate_fastq_from(self, validator, file_path, start, max_errors):
+        '''
+        Writes a FASTQ file without blank lines to a FASTQValidator from
+        byte offset start until it has found max_errors errors or the file
+        ends, and returns the errors.
+        '''
+        for _, clean in clean_fastq_chunks(file_path, self.READ_BLOCK_SIZE,
+                                           start):
+            validator.write(clean)
+            if len(validator.errors) >= max_errors:
+                break
+        return validator.close()
+
+    def _find_seen_ids(self, pool, file_path, error, max_errors, prefix,
+                       id_offsets, offsets):
+        '''
+        Returns the sequence identifiers that _validate_fastq_from could
+        check from an error on that are among those written for the ranges
+        with id_offsets, which are looked up a bucket at a time in the pool.
+        '''
+        # without the repeat checks the validator reaches at least as far
+        # into the file as it will with them
+        validator = FASTQValidator(False, max_errors, offset=error['offset'],
+                                   id_buckets=1)
+        validator.records = error['record'] - 1
+        self._validate_fastq_from(validator, file_path, error['offset'],
+                                  max_errors)
+        buckets = collections.defaultdict(set)
+        for line in validator.id_buckets[0]:
+            id_ = line.split(b' ', 2)[2]
+            buckets[zlib.crc32(id_) % (len(id_offsets[0]) - 1)].add(id_)
+        found = [pool.apply_async(find_seen_ids, (
+            self._id_bucket(prefix, id_offsets, offsets, b), ids))
+            for b, ids in buckets.items()]
+        seen = set()
+        for res in found:
+            seen.update(res.get())
+        return seen
+
+    def _join_fastq_ranges(self, file_path, bounds, clean_paths):
+        '''
+        Replaces a FASTQ file with its ranges, taking each range from its
+        clean_paths entry, the range without blank lines, if it is not None.
+        The file is kept as it is up to the first range with blank lines.
+        '''
+        first = next(r for r, p in enumerate(clean_paths) if p)
+        joined = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(os.path.abspath(file_path)), delete=False)
+        try:
+            with joined:
+                _copy_prefix(file_path, bounds[first], joined,
+                             self.READ_BLOCK_SIZE)
+                for r in range(first, len(clean_paths)):
+                    if clean_paths[r]:
+                        with open(clean_paths[r], 'rb') as f:
+                            shutil.copyfileobj(f, joined,
+                                               self.READ_BLOCK_SIZE)
+                    else:
+                        _copy_prefix(file_path, bounds[r + 1] - bounds[r],
+                                     joined, self.READ_BLOCK_SIZE, bounds[r])
+            shutil.copymode(file_path, joined.name)
+            os.rename(joined.name, file_path)
+        except Exception:
+            os.remove(joined.name)
+            raise
+
+    def _check_fastq_file(self, file_path, result):
+        '''
+        Logs the result of validate_fastq_file for a file and returns whether
+        the file is valid and the validation errors.
+        '''
+        line_count, errors, cleaned, elapsed = result
+        if cleaned:
+            self.log('Removed blank lines from ' + file_path)
+        self.log('Validated FASTQ file {} in {:.2f} s'.format(
+            file_path, elapsed))
+        return self._check_validation(line_count, errors), errors
+
+    def _prepare_upload(self, ctx, params):
+        '''
+        Downloads, validates, interleaves and gzips the reads for a set of
+        upload_reads params, and adds their stats to the reads object data.
+        Returns the path of the file to upload, the data and the (wsid,
+        name, objid, type, single end) the object is to be saved with.
+        '''
+        o, wsid, name, objid, kbtype, single_end, fwdsource, revsource, reads_source = (
+                                                    self._proc_upload_reads_params(params))
+        # If reads_source == 'shock', fwdsource and revsource are shock nodes
+        # If reads_source == 'web', fwdsource and revsource are urls
+        # If reads_source == 'staging', fwdsource and revsource are file name/subdirectory
+        #                               in staging area
+        # If reads_source == 'local', fwdsource and revsource are file paths
+        fwdname, revname, fwdid, revid = (None,) * 4
+        # each upload downloads from Shock to its own directory, as Shock
+        # files are named after their nodes and uploads can run at the same
+        # time
+        download_dir = None
+        if reads_source == 'shock':
+            download_dir = tempfile.mkdtemp(dir=self.scratch)
+        upload_dir = tempfile.mkdtemp(dir=self.scratch)
+        try:
+            ret = self._process_download(fwdsource, revsource, reads_source,
+                                         params.get('download_type'),
+                                         ctx['user_id'], download_dir)
+
+            fwdpath = ret.get('fwdpath')
+            revpath = ret.get('revpath')
+
+            if reads_source == 'shock':
+                fwdname = ret.get('fwdname')
+                revname = ret.get('revname')
+                fwdid = fwdsource
+                revid = revsource
+
+            actualpath = fwdpath
+            if revpath:
+                uploadpath = (self.get_file_prefix(upload_dir) +
+                              '.inter.fastq.gz')
+            else:
+                if not os.path.isfile(actualpath):
+                    raise ValueError('No such file: ' + str(actualpath))
+                basename, ext = os.path.splitext(os.path.basename(actualpath))
+                if ext.lower() in self.INPUT_COMPRESS_EXT:
+                    basename, ext = os.path.splitext(basename)
+                if ext.lower() not in self.FASTQ_EXT:
+                    raise ValueError('File {} is not a FASTQ file'
+                                     .format(actualpath))
+                uploadpath = os.path.join(upload_dir, basename + ext + '.gz')
+
+            # interleave, validate, gzip and calculate the stats in one pass
+            interleaved = 1 if not single_end else 0
+            stats = FASTQStatsAccumulator()
+            file_valid, errors = self._prepare_upload_file(
+                fwdpath, revpath, uploadpath, interleaved,
+                (None, None, fwdname, fwdid, revname, revid,
+                 reads_source, fwdsource, revsource), stats)
+
+            if not file_valid:
+                location = None
+                if revpath:
+                    # report the source file at fault rather than the
+                    # interleaved stream
+                    actualpath, location = self._interleaved_error_location(
+                        errors[0], fwdpath, revpath)
+                file_info = ret
+                file_info['fwdsource'] = fwdsource
+                file_info['revsource'] = revsource
+                validation_error_message = (
+                    self._generate_validation_error_message(
+                        reads_source, actualpath, file_info, location))
+                raise ValueError(validation_error_message)
+        except Exception:
+            # don't leave a partly written upload file in scratch
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            raise
+        finally:
+            # the downloaded files are no longer needed once gzipped
+            if download_dir:
+                shutil.rmtree(download_dir, ignore_errors=True)
+
+        o.update(stats.get_stats())
+        return uploadpath, o, wsid, name, objid, kbtype, single_end
+
+    def _reads_object(self, o, name, objid, kbtype, single_end,
+                      uploadedfile):
+        '''
+        Returns the save_objects spec for reads object data with the
+        file_to_shock output of the uploaded reads file.
+        '''
+        fwdfile = {'file': uploadedfile['handle'],
+                   'encoding': 'ascii',
+                   'size': uploadedfile['size'],
+                   'type': 'fq'
+                   }
+        if single_end:
+            o['lib'] = fwdfile
+        else:
+            o['lib1'] = fwdfile
+
+        so = {'type': kbtype,
+              'data': o
+              }
+        if name:
+            so['name'] = name
+        else:
+            so['objid'] = objid
+        return so
+
+    def _check_batch_reads(self, params):
+        '''
+        Checks that an upload_reads_batch reads entry is a mapping with the
+        parameters upload_reads requires, before any work is done for it.
+        '''
+        if not isinstance(params, dict):
+            raise ValueError('Each reads library must be a mapping, not ' +
+                             type(params).__name__)
+        self._process_fwd_params(
+            params.get('fwd_id'), params.get('fwd_file'),
+            params.get('fwd_file_url'), params.get('fwd_staging_file_name'),
+            params.get('download_type'))
+        if not self.xor(params.get('wsid'), params.get('wsname')):
+            raise ValueError(
+                'Exactly one of the workspace ID or name must be provided')
+        if not self.xor(params.get('objid'), params.get('name')):
+            raise ValueError(
+                'Exactly one of the object ID or name must be provided')
 
-        single, kbasefile = self.check_reads(reads)
-        ret = self.set_up_reads_return(single, kbasefile, reads)
-        obj_name = info[1]
-        ref = ret['ref']
-        self.log('Type: ' + info[2])
+    def _resolve_ws_names(self, reads, results):
+        '''
+        Checks each of a list of upload_reads params and translates their
+        workspace names to IDs, each name only once. Returns the params with
+        the names replaced by the IDs, or None for libraries that failed the
+        checks or whose workspace name couldn't be translated, with the error
+        set in their results.
+        '''
+        dfu = self.clients.dfu()
+        wsids = {}
+        errors = {}
+        resolved = []
+        for i, (params, result) in enumerate(zip(reads, results)):
+            # failures are recorded rather than raised so the rest of the
+            # batch can carry on
+            try:
+                self._check_batch_reads(params)
+            except Exception as e:
+                self.log('Reads library {} failed: {}'.format(i, e))
+                result['error'] = str(e)
+                resolved.append(None)
+                continue
+            wsname = params.get('wsname')
+            if (params.get('wsid') or
+                    not isinstance(wsname, six.string_types)):
+                # left for _proc_upload_reads_params to check and report
+                resolved.append(params)
+                continue
+            if wsname not in wsids and wsname not in errors:
+                self.log('Translating workspace name {} to id'.format(wsname))
+                try:
+                    wsids[wsname] = self.ws_ids.get(wsname,
+                                                    dfu.ws_name_to_id)
+                except DFUError as e:
+                    errors[wsname] = e.message
+            if wsname in errors:
+                result['error'] = errors[wsname]
+                resolved.append(None)
+                continue
+            params = dict(params)
+            del params['wsname']
+            params['wsid'] = wsids[wsname]
+            resolved.append(params)
+        return resolved
 
-        # lib1 = KBaseFile, handle_1 = KBaseAssembly
-        if kbasefile:
+    def _prepare_batch_upload(self, ctx, params, index):
+        # failures are returned rather than raised so the rest of the batch
+        # can carry on
+        self.log('Preparing reads library {} for upload'.format(index))
+        try:
+            return self._prepare_upload(ctx, params), None
+        except Exception as e:
+            self.log('Reads library {} failed: {}'.format(index, e))
+            return None, str(e)
 
-            if single:
-                sreads = data['lib']['file']
-                type_ = data['lib']['type']
-                ret['files'] = self.process_single_end(
-                    ref, obj_name, sreads, type_)
-            else:
-                fwd_reads = data['lib1']['file']
-                fwd_type = data['lib1']['type']
-                if 'lib2' in data:  # not interleaved
-                    rev_reads = data['lib2']['file']
-                    rev_type = data['lib2']['type']
-                    ret['files'] = self.process_paired(
-                        ref, obj_name, fwd_reads, rev_reads,
-                        interleave, fwd_type, rev_type)
-                else:
-                    ret['files'] = self.process_interleaved(
-                        ref, obj_name, fwd_reads, interleave, fwd_type)
-        else:  # KBaseAssembly
-            if single:
-                ret['files'] = self.process_single_end(
-                    ref, obj_name, data['handle'])
-            else:
-                if 'handle_2' in data:  # not interleaved
-                    ret['files'] = self.process_paired(
-                        ref, obj_name, data['handle_1'],
-                        data['handle_2'], interleave)
-                else:
-                    ret['files'] = self.process_interleaved(
-                        ref, obj_name, data['handle_1'], interleave)
+    def _upload_files(self, file_paths):
+        '''
+        Loads files to Shock with handles in one file_to_shock_mass call. If
+        the call fails the files are loaded one at a time so only the failing
+        files are lost. Returns the file_to_shock output, or the error, for
+        each file.
+        '''
+        dfu = self.clients.dfu()
+        params = [{'file_path': p, 'make_handle': 1} for p in file_paths]
+        try:
+            return dfu.file_to_shock_mass(params)
+        except DFUError as e:
+            if len(params) == 1:
+                return [e]
+            self.log(('Batch upload of {} files failed, uploading files ' +
+                      'individually').format(len(params)))
+        rets = []
+        for p in params:
+            try:
+                rets.append(dfu.file_to_shock(p))
+            except DFUError as e:
+                rets.append(e)
+        return rets
 
-        return ret
+    def _save_reads_objects(self, wsid, objects):
+        '''
+        Saves a list of object specs to a workspace in one save_objects call.
+        If the call fails the objects are saved one at a time so only the
+        failing objects are lost. Returns the object info, or the error, for
+        each object.
+        '''
+        dfu = self.clients.dfu()
+        try:
+            return dfu.save_objects({'id': wsid, 'objects': objects})
+        except DFUError as e:
+            if len(objects) == 1:
+                return [e]
+            self.log(('Saving {} objects to workspace {} failed, saving ' +
+                      'objects individually').format(len(objects), wsid))
+        rets = []
+        for so in objects:
+            try:
+                rets.append(dfu.save_objects({'id': wsid,
+                                              'objects': [so]})[0])
+            except DFUError as e:
+                rets.append(e)
+        return rets
+
+    def _prepare_upload_file(self, fwdpath, revpath, targetpath, interleaved,
+                             interleave_info, stats=None):
+        '''
+        Produces the gzipped file to upload in a single pass over the reads.
+        The forward and reverse reads, if any, are interleaved, blank lines
+        dropped and lines counted, and the result is piped through the FASTQ
+        validator and gzipped to targetpath at the same time, on the
+        configured number of compression threads.
+        interleave_info is a tuple of the source object ref and name, the
+        forward and reverse Shock file names and nodes, the reads source and
+        the forward and reverse sources used for interleave error messages.
+        If stats, a FASTQStatsAccumulator, is provided the reads are also
+        added to it.
+        Returns whether the reads are valid and the validation errors.
+        '''
+        if revpath:
+            (source_obj_ref, source_obj_name, fwd_shock_filename,
+             fwd_shock_node, rev_shock_filename, rev_shock_node,
+             reads_source, fwdsource, revsource) = interleave_info
+            self.log(('Interleaving, validating and compressing files {} ' +
+                      'and {} to {}').format(fwdpath, revpath, targetpath))
+            chunks = self._interleave_chunks(
+                source_obj_ref, source_obj_name, fwd_shock_filename,
+                fwd_shock_node, rev_shock_filename, rev_shock_node,
+                fwdpath, revpath, reads_source, fwdsource, revsource,
+                skip_whitespace_lines=True)
+        else:
+            self.log('Validating and compressing file {} to {}'.format(
+                fwdpath, targetpath))
+            chunks = (clean for _, clean in
+                      self._clean_chunks(fwdpath, decompress=True))
+        validator = FASTQValidator(interleaved)
+        c = 0
+        with ParallelGzipWriter(targetpath, self.compression_level,
+                                self.compression_threads,
+                                self.GZIP_BLOCK_SIZE) as t:
+            for chunk in chunks:
+                c += chunk.count(b'\n')
+                validator.write(chunk)
+                t.write(chunk)
+                if stats is not None:
+                    stats.add(chunk)
+        errors = validator.close()
+        return self._check_validation(c, errors), errors
+
+    def _interleaved_error_location(self, error, fwdpath, revpath):
+        '''
+        Returns the path of the file a validation error in the interleaved
+        reads from fwdpath and revpath comes from, and the record and line
+        numbers of the error in that file. Line numbers are counted after
+        blank lines have been removed.
+        '''
+        record = error['record']
+        file_record = (record + 1) // 2
+        path = fwdpath if record % 2 else revpath
+        return path, (file_record,
+                      error['line'] - (record - file_record) * 4)
 
     def validateFASTA(self, ctx, params):
         """
         Validate a FASTA file. The file extensions .fa, .fas, .fna. and .fasta
         are accepted.
-        :param file_path: instance of String
-        :returns: instance of type "boolean" (A boolean - 0 for false, 1 for
-           true. @range (0, 1))
+        :param params: instance of type "ValidateFASTAParams" (Input to the
+           validateFASTA function, or a list of them to validate several
+           files in one call. Required parameters: file_path - the path to
+           the file to validate. Optional parameters: alphabet - the
+           alphabet of the sequences, dna or protein. Default dna.) ->
+           structure: parameter "file_path" of String, parameter "alphabet"
+           of String
+        :returns: instance of type "ValidateFASTAOutput" (The output of the
+           validateFASTA function, or a list of them for a list of files.
+           valid - whether the file validated successfully or not. errors -
+           the problems found in the file, at most 10, if any.) ->
+           structure: parameter "valid" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1)), parameter "errors" of list of
+           type "FASTAValidationError" (A problem found in a FASTA file by
+           the validateFASTA function. record - the number of the record at
+           fault, counting from 1. line - the number of the line at fault,
+           counting from 1. offset - the byte offset of the start of the
+           line at fault. error - a description of the problem.) ->
+           structure: parameter "record" of Long, parameter "line" of Long,
+           parameter "offset" of Long, parameter "error" of String
         """
         # ctx is the context object
         # return variables are: validated
         # OLD BEGIN validateFASTA
         del ctx
-        file_path = params.get('file_path')
-        if not file_path or not os.path.isfile(file_path):
-            raise ValueError('No such file: ' + str(file_path))
-        if os.path.splitext(file_path)[1].lower() not in self.FASTA_EXT:
-            raise ValueError('File {} is not a FASTA file'.format(file_path))
-        self.log('Validating FASTA file ' + file_path)
-        # TODO per transform service notes, we need a better fasta validator
-        # a good start would be not calling FVTester but writing our own
-        # wrapper (Py4J?) that takes options for types etc.
-        # see https://github.com/jwaldman/FastaValidator/blob/master/src/demo/FVTester.java
-        # note the version in jars returns non-zero error codes:
-        # https://github.com/srividya22/FastaValidator/commit/67e2d860f1869b9a76033e71fb2aaff910b7c2e3
-        # Better yet, move this to a Java SDK module, don't make a system
-        # call and expose useful options.
-        retcode = subprocess.call(
-            ['java', '-classpath', self.FASTA_JAR, 'FVTester', file_path])
-        self.log('Validation return code: ' + str(retcode))
-        validated = 1 if retcode == 0 else 0
-        self.log('Validation ' + ('succeeded' if validated else 'failed'))
-        out = {'valid': validated}
+        batch = isinstance(params, list)
+        for p in params if batch else [params]:
+            file_path = p.get('file_path')
+            if not file_path or not os.path.isfile(file_path):
+                raise ValueError('No such file: ' + str(file_path))
+            if os.path.splitext(file_path)[1].lower() not in self.FASTA_EXT:
+                raise ValueError('File {} is not a FASTA file'.format(
+                    file_path))
+            if p.get('alphabet', 'dna') not in FASTAValidator.ALPHABETS:
+                raise ValueError('alphabet must be one of ' + ', '.join(
+                    sorted(FASTAValidator.ALPHABETS)))
+        out = []
+        for p in params if batch else [params]:
+            self.log('Validating FASTA file ' + p['file_path'])
+            validator = FASTAValidator(p.get('alphabet', 'dna'))
+            with open(p['file_path'], 'rb') as f:
+                for data in iter(lambda: f.read(self.READ_BLOCK_SIZE), b''):
+                    validator.write(data)
+            errors = validator.close()
+            self.log('{} sequences in file'.format(validator.records))
+            for e in errors:
+                self.log('Record {record}, line {line}, byte {offset}: '
+                         '{error}'.format(**e))
+            validated = 0 if errors else 1
+            self.log('Validation ' + ('succeeded' if validated else 'failed'))
+            out.append({'valid': validated, 'errors': errors})
+        if not batch:
+            out = out[0]
         # OLD END validateFASTA
 
         # At some point might do deeper type checking...
-        if not isinstance(out, dict):
+        if not isinstance(out, (dict, list)):
             raise ValueError('Method validateFASTA return value ' +
-                             'out is not type dict as required.')
+                             'out is not type dict or list as required.')
         # return the results
         return [out]
 
     def get_fq_stats(self, reads_object, file_path):
-        eautils = kb_ea_utils(self.callback_url)
-        ea_stats_dict = eautils.calculate_fastq_stats(
-            {'read_library_path': file_path})
-        for key in ea_stats_dict:
-            reads_object[key] = ea_stats_dict[key]
+        '''
+        Adds the read statistics for an uncompressed FASTQ file to
+        reads_object.
+        '''
+        stats = FASTQStatsAccumulator()
+        for _, chunk in self._clean_chunks(file_path):
+            stats.add(chunk)
+        reads_object.update(stats.get_stats())
         return reads_object
 
-    def _process_download(self, fwd, rev, reads_source, download_type, user_id):
+    def _process_download(self, fwd, rev, reads_source, download_type, user_id,
+                          scratch=None):
         """
         _process_download: processing different type of downloads
 
@@ -727,6 +3064,8 @@ class ReadsUtils:
         reads_source: one of 'shock', 'web' or 'staging'
         download_type: one of ['Direct Download', 'FTP', 'DropBox', 'Google Drive']
         user_id: current token user
+        scratch: the directory Shock files are downloaded to, by default the
+               scratch directory
         """
 
         # return values
@@ -734,16 +3073,16 @@ class ReadsUtils:
         revname = None
         revpath = None
 
-        dfu = DataFileUtil(self.callback_url)
+        dfu = self.clients.dfu()
         if reads_source == 'shock':
-            # Grab files from Shock
+            # Grab files from Shock as stored, compressed files are read
+            # directly like files from the other sources
+            scratch = scratch or self.scratch
             fileinput = [{'shock_id': fwd,
-                          'file_path': self.scratch + '/fwd/',
-                          'unpack': 'uncompress'}]
+                          'file_path': scratch + '/fwd/'}]
             if rev:
                 fileinput.append({'shock_id': rev,
-                                  'file_path': self.scratch + '/rev/',
-                                  'unpack': 'uncompress'})
+                                  'file_path': scratch + '/rev/'})
             self.log('downloading reads file(s) from Shock')
             files = dfu.shock_to_file_mass(fileinput)
             fwdpath = files[0]["file_path"]
@@ -752,21 +3091,16 @@ class ReadsUtils:
                 revpath = files[1]["file_path"]
                 revname = files[1]["node_file_name"]
         elif reads_source == 'web':
-            fwdpath = dfu.download_web_file(
-                        {'file_url': fwd,
-                        'download_type': download_type}).get(
-                                        'copy_file_path')
-            revpath = dfu.download_web_file(
-                        {'file_url': rev,
-                        'download_type': download_type}).get(
-                                        'copy_file_path') if rev else None
+            fwdpath, revpath = self._download_pair(
+                lambda url: dfu.download_web_file(
+                    {'file_url': url,
+                     'download_type': download_type}).get('copy_file_path'),
+                fwd, rev)
         elif reads_source == 'staging':
-            fwdpath = dfu.download_staging_file(
-                        {'staging_file_subdir_path': fwd}).get(
-                                        'copy_file_path')
-            revpath = dfu.download_staging_file(
-                        {'staging_file_subdir_path': rev}).get(
-                                        'copy_file_path') if rev else None
+            fwdpath, revpath = self._download_pair(
+                lambda path: dfu.download_staging_file(
+                    {'staging_file_subdir_path': path}).get('copy_file_path'),
+                fwd, rev)
         elif reads_source == 'local':
             fwdpath = fwd
             revpath = rev
@@ -781,7 +3115,36 @@ class ReadsUtils:
 
         return returnVal
 
-    def _generate_validation_error_message(self, reads_source, actualpath, file_info):
+    def _download_pair(self, download, fwd, rev):
+        '''
+        Runs download, a function that downloads a file and returns its path,
+        on the forward and, if provided, reverse sources at the same time.
+        A forward failure is reported in preference to a reverse failure.
+        Returns the forward and reverse paths.
+        '''
+        if not rev:
+            return download(fwd), None
+        pool = ThreadPool(2)
+        try:
+            results = [pool.apply_async(download, (source,))
+                       for source in (fwd, rev)]
+            paths = []
+            for direction, source, result in zip(
+                    ['forward', 'reverse'], [fwd, rev], results):
+                try:
+                    paths.append(result.get())
+                except Exception:
+                    self.log('Downloading the {} reads file {} failed'
+                             .format(direction, source))
+                    raise
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+        return paths
+
+    def _generate_validation_error_message(self, reads_source, actualpath, file_info,
+                                           location=None):
         fwdpath = file_info.get('fwdpath')
         revpath = file_info.get('revpath')
         fwdname = file_info.get('fwdname')
@@ -789,7 +3152,10 @@ class ReadsUtils:
         fwdsource = file_info.get('fwdsource')
         revsource = file_info.get('revsource')
 
-        validation_error_message = "Invalid FASTQ file - Path: " + actualpath + "."
+        validation_error_message = "Invalid FASTQ file - Path: " + actualpath
+        if location:
+            validation_error_message += ", record {}, line {}".format(*location)
+        validation_error_message += "."
         if reads_source == 'shock':
             if revsource:
                 validation_error_message += (
@@ -831,6 +3197,130 @@ class ReadsUtils:
 
         return validation_error_message
 
+    def _package_for_download(self, packages, max_parallel=None):
+        '''
+        Zips and loads each of a list of (zip file path, objects) tuples to
+        Shock, with up to max_parallel packages being built at the same time.
+        objects lists the (directory in the zip, ref, workspace object
+        without data, files) of the objects in the zip, where files are the
+        (file path, encoding) of the object's reads files, which are deleted
+        once they are in the zip. The information and provenance of each
+        object are written to the zip as DataFileUtil package_for_download
+        does. Files that are already compressed are stored as they are rather
+        than deflated again, so the time and scratch space a package takes
+        scale with the size of the compressed files. Returns the
+        file_to_shock output for each package.
+        '''
+        dfu = self.clients.dfu()
+        count = sum(len(objects) for _, objects in packages)
+        placed = [0, 0]  # objects and packages done
+        lock = threading.Lock()
+
+        def package(zip_path, objects):
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED,
+                                 allowZip64=True) as z:
+                for directory, ref, obj, files in objects:
+                    z.writestr(os.path.join(
+                        directory, self.EXPORT_DETAILS_FILE.format(
+                            ref.replace('/', '_'))),
+                        json.dumps(obj, indent=4, sort_keys=True))
+                    for file_path, encoding in files:
+                        z.write(file_path, os.path.join(
+                            directory, os.path.basename(file_path)),
+                            zipfile.ZIP_DEFLATED if encoding == 'none'
+                            else zipfile.ZIP_STORED)
+                        os.remove(file_path)
+                    with lock:
+                        placed[0] += 1
+                        self.log('Packaged reads object {} ({}), {} of {}'
+                                 .format(ref, obj['info'][1], placed[0],
+                                         count))
+            try:
+                ret = dfu.file_to_shock({'file_path': zip_path,
+                                         'make_handle': 0})
+            finally:
+                os.remove(zip_path)
+            with lock:
+                placed[1] += 1
+                self.log('Packaged {}/{}: {}'.format(
+                    placed[1], len(packages), ret['node_file_name']))
+            return ret
+        workers = min(max_parallel or 1, len(packages))
+        if workers <= 1:
+            return [package(*p) for p in packages]
+        pool = ThreadPool(workers)
+        try:
+            results = [pool.apply_async(package, p) for p in packages]
+            rets = [r.get() for r in results]
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+        return rets
+
+    def _export_reads(self, ctx, refs, single_archive=False,
+                      max_parallel=None):
+        '''
+        Packages a list of reads objects into zip files in Shock, either one
+        per object or, if single_archive is set, one for all the objects with
+        each object in a directory named after it. The object information
+        comes from one workspace call and the reads files from one
+        download_reads call, so Shock nodes are downloaded at the same time
+        and shared nodes only once. The reads files are zipped from where
+        download_reads puts them, not copied. Returns a mapping of the refs
+        to the Shock node with their zip file.
+        '''
+        ws = self.clients.ws()
+        try:
+            objects = ws.get_objects2(
+                {'objects': [{'ref': ref} for ref in refs],
+                 'no_data': 1})['data']
+        except WorkspaceError as wse:
+            self.log('Logging workspace exception')
+            self.log(str(wse))
+            raise
+
+        # fetch the files as stored in Shock where possible, so compressed
+        # files are never uncompressed and compressed again
+        reads = self.download_reads(
+            ctx, {self.PARAM_IN_LIB: refs,
+                  self.PARAM_IN_COMPRESSION: 'native',
+                  self.PARAM_IN_MAX_PARALLEL: max_parallel}
+            )[0]['files']
+
+        names = collections.Counter(o['info'][1] for o in objects)
+        tempdir = tempfile.mkdtemp(dir=self.scratch)
+        try:
+            packages = []
+            if single_archive:
+                packages.append((os.path.join(
+                    tempdir, self.EXPORT_ARCHIVE + '.zip'), []))
+            for i, (ref, obj) in enumerate(zip(refs, objects)):
+                info = obj['info']
+                name = info[1]
+                if single_archive:
+                    directory = name
+                    if names[name] > 1:
+                        directory = '{}_{}'.format(
+                            name, self.make_ref(info).replace('/', '_'))
+                else:
+                    # each object in its own directory, as object names in
+                    # different workspaces can be the same
+                    os.mkdir(os.path.join(tempdir, str(i)))
+                    directory = ''
+                    packages.append((os.path.join(tempdir, str(i),
+                                                  name + '.zip'), []))
+                files = reads[ref]['files']
+                packages[-1][1].append((directory, ref, obj, [
+                    (f, files['encoding'])
+                    for f in [files['fwd'], files.get('rev')] if f]))
+            rets = self._package_for_download(packages, max_parallel)
+        finally:
+            shutil.rmtree(tempdir, ignore_errors=True)
+        if single_archive:
+            return dict((ref, rets[0]['shock_id']) for ref in refs)
+        return dict((ref, ret['shock_id']) for ref, ret in zip(refs, rets))
+
     #END_CLASS_HEADER
 
     # config contains contents of config file in a hash or None if it couldn't
@@ -840,6 +3330,27 @@ class ReadsUtils:
         self.scratch = config['scratch']
         self.callback_url = os.environ['SDK_CALLBACK_URL']
         self.ws_url = config['workspace-url']
+        self.download_cache_size = int(config.get(
+            'download-cache-size', self.DOWNLOAD_CACHE_SIZE))
+        self.compression_level = int(config.get(
+            'upload-compression-level', self.GZIP_COMPRESSION_LEVEL))
+        if not 1 <= self.compression_level <= 9:
+            raise ValueError('upload-compression-level must be from 1 to 9')
+        self.compression_threads = int(config.get(
+            'upload-compression-threads', multiprocessing.cpu_count()))
+        if self.compression_threads < 1:
+            raise ValueError('upload-compression-threads must be at least 1')
+        self.decompression_threads = int(config.get(
+            'download-decompression-threads', multiprocessing.cpu_count()))
+        if self.decompression_threads < 1:
+            raise ValueError(
+                'download-decompression-threads must be at least 1')
+        ws_name_cache_ttl = int(config.get(
+            'ws-name-cache-ttl', self.WS_NAME_CACHE_TTL))
+        if ws_name_cache_ttl < 0:
+            raise ValueError('ws-name-cache-ttl must be at least 0')
+        self.ws_ids = WorkspaceIDCache(ws_name_cache_ttl)
+        self.clients = ClientRegistry(self.callback_url, self.ws_url)
         #END_CONSTRUCTOR
         pass
 
@@ -853,21 +3364,38 @@ class ReadsUtils:
            to the validateFASTQ function. Required parameters: file_path -
            the path to the file to validate. Optional parameters: interleaved
            - whether the file is interleaved or not. Setting this to true
-           disables sequence ID checks.) -> structure: parameter "file_path"
-           of String, parameter "interleaved" of type "boolean" (A boolean -
-           0 for false, 1 for true. @range (0, 1))
+           disables sequence ID checks. max_workers - the maximum number of
+           files to validate at the same time, each in a separate process.
+           The largest value given for any file in the list applies. Default
+           1. split_file - whether to split the file into byte ranges that
+           are validated at the same time by the max_workers processes, for
+           large files. The result is the same as validating the file whole.
+           Default false.) -> structure: parameter "file_path" of String,
+           parameter "interleaved" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1)), parameter "max_workers" of
+           Long, parameter "split_file" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1))
         :returns: instance of list of type "ValidateFASTQOutput" (The output
            of the validateFASTQ function. validated - whether the file
-           validated successfully or not.) -> structure: parameter
-           "validated" of type "boolean" (A boolean - 0 for false, 1 for
-           true. @range (0, 1))
+           validated successfully or not. errors - the problems found in the
+           file, at most 10, if any.) -> structure: parameter "validated" of
+           type "boolean" (A boolean - 0 for false, 1 for true. @range (0,
+           1)), parameter "errors" of list of type "FASTQValidationError" (A
+           problem found in a FASTQ file by the validateFASTQ function.
+           record - the number of the record at fault, counting from 1. line
+           - the number of the line at fault, counting from 1. offset - the
+           byte offset of the start of the line at fault. error - a
+           description of the problem. Line numbers and offsets are in the
+           file after blank lines have been removed.) -> structure: parameter
+           "record" of Long, parameter "line" of Long, parameter "offset" of
+           Long, parameter "error" of String
         """
         # ctx is the context object
         # return variables are: out
         #BEGIN validateFASTQ
         del ctx
-        # TODO try and parse the validator output and return errors
-        out = []
+        max_workers = 1
+        split = False
         for p in params:
             file_path = p.get('file_path')
             if not file_path or not os.path.isfile(file_path):
@@ -876,50 +3404,29 @@ class ReadsUtils:
             if os.path.splitext(file_path)[1].lower() not in self.FASTQ_EXT:
                 raise ValueError('File {} is not a FASTQ file'
                                  .format(file_path))
-            self.log('Validating FASTQ file ' + file_path)
-            self.log('Checking line count')
-            c = 0
-            blank = False
-            # open assumes ascii, which is ok for reads
-            with open(file_path) as f:  # run & count until we hit a blank line
-                for l in f:
-                    if not l.strip():
-                        blank = True
-                        break
-                    c += 1
-            if blank:
-                c = 0
-                self.log('Removing blank lines')
-                with open(file_path) as s, tempfile.NamedTemporaryFile(
-                        mode='w', dir=self.scratch) as t:
-                    for l in s:
-                        l = l.strip()
-                        if l:
-                            t.write(l + '\n')
-                            c += 1
-                    s.close()
-                    t.flush()
-                    shutil.copy2(t.name, file_path)
-            validated = 1
-            if c % 4 != 0:
-                err = ('Invalid FASTQ file, expected multiple of 4 lines, ' +
-                       'got ' + str(c))
-                self.log(err)
-                validated = 0
-            else:
-                self.log(str(c) + ' lines in file')
-
-            if validated:
-                arguments = [self.FASTQ_EXE, '--file', file_path,
-                             '--maxErrors', '10']
-                if p.get('interleaved'):
-                    arguments.append('--disableSeqIDCheck')
-                retcode = subprocess.call(arguments)
-                self.log('Validation return code: ' + str(retcode))
-                validated = 1 if retcode == 0 else 0
-                self.log('Validation ' +
-                         ('succeeded' if validated else 'failed'))
-            out.append({'validated': validated})
+            workers = p.get('max_workers')
+            if workers is not None:
+                if (not isinstance(workers, six.integer_types) or
+                        isinstance(workers, bool) or workers < 1):
+                    raise ValueError('max_workers must be an integer > 0')
+                max_workers = max(max_workers, workers)
+            if p.get('split_file') not in (None, 0, 1):
+                raise ValueError('split_file must be 0 or 1')
+            split = split or bool(p.get('split_file'))
+        workers = min(max_workers, self.MAX_VALIDATE_WORKERS,
+                      multiprocessing.cpu_count())
+        if not split:
+            workers = min(workers, len(params))
+        if workers <= 1:
+            results = []
+            for p in params:
+                self.log('Validating FASTQ file ' + p['file_path'])
+                results.append(self._validate_fastq_stream(
+                    p['file_path'], p.get('interleaved')))
+        else:
+            results = self._validate_fastq_files(params, workers)
+        out = [{'validated': validated, 'errors': errors}
+               for validated, errors in results]
         #END validateFASTQ
 
         # At some point might do deeper type checking...
@@ -933,23 +3440,23 @@ class ReadsUtils:
         """
         Loads a set of reads to KBase data stores.
         :param params: instance of type "UploadReadsParams" (Input to the
-           upload_reads function. If local files are specified for upload,
-           they must be uncompressed. Files will be gzipped prior to upload.
-           If web files are specified for upload, a download type one of
-           ['Direct Download', 'DropBox', 'FTP', 'Google Drive'] must be
-           specified too. The downloadable file must be uncompressed (except
-           for FTP, .gz file is acceptable). If staging files are specified
-           for upload, the staging file must be uncompressed and must be
-           accessible by current user. Note that if a reverse read file is
-           specified, it must be a local file if the forward reads file is a
-           local file, or a shock id if not. If a reverse web file or staging
-           file is specified, the reverse file category must match the
-           forward file category. If a reverse file is specified the uploader
-           will will automatically intereave the forward and reverse files
-           and store that in shock. Additionally the statistics generated are
-           on the resulting interleaved file. Required parameters: fwd_id -
-           the id of the shock node containing the reads data file: either
-           single end reads, forward/left reads, or interleaved reads. - OR -
+           upload_reads function. Local, web and staging files may be
+           uncompressed or compressed with gzip, bzip2 or xz. Compressed
+           files are read directly, without being uncompressed to disk first.
+           Files will be gzipped prior to upload. If web files are specified
+           for upload, a download type one of ['Direct Download', 'DropBox',
+           'FTP', 'Google Drive'] must be specified too. If staging files are
+           specified for upload, the staging file must be accessible by
+           current user. Note that if a reverse read file is specified, it
+           must be a local file if the forward reads file is a local file, or
+           a shock id if not. If a reverse web file or staging file is
+           specified, the reverse file category must match the forward file
+           category. If a reverse file is specified the uploader will will
+           automatically intereave the forward and reverse files and store
+           that in shock. Additionally the statistics generated are on the
+           resulting interleaved file. Required parameters: fwd_id - the id
+           of the shock node containing the reads data file: either single
+           end reads, forward/left reads, or interleaved reads. - OR -
            fwd_file - a local path to the reads data file: either single end
            reads, forward/left reads, or interleaved reads. - OR -
            fwd_file_url - a download link that contains reads data file:
@@ -1061,79 +3568,24 @@ class ReadsUtils:
         # return variables are: returnVal
         #BEGIN upload_reads
         self.log('Starting upload reads, parsing args')
-        o, wsid, name, objid, kbtype, single_end, fwdsource, revsource, reads_source = (
-                                                    self._proc_upload_reads_params(params))
-        # If reads_source == 'shock', fwdsource and revsource are shock nodes
-        # If reads_source == 'web', fwdsource and revsource are urls
-        # If reads_source == 'staging', fwdsource and revsource are file name/subdirectory
-        #                               in staging area
-        # If reads_source == 'local', fwdsource and revsource are file paths
-        dfu = DataFileUtil(self.callback_url)
-        fwdname, revname, fwdid, revid = (None,) * 4
-        ret = self._process_download(fwdsource, revsource, reads_source,
-                                     params.get('download_type'), ctx['user_id'])
-
-        fwdpath = ret.get('fwdpath')
-        revpath = ret.get('revpath')
-
-        if reads_source == 'shock':
-            fwdname = ret.get('fwdname')
-            revname = ret.get('revname')
-            fwdid = fwdsource
-            revid = revsource
-
-        actualpath = fwdpath
-        if revpath:
-            # now interleave the files
-            actualpath = os.path.join(
-                self.scratch, self.get_file_prefix() + '.inter.fastq')
-            self.interleave(None, None, fwdname, fwdid,
-                            revname, revid, fwdpath, revpath, actualpath,
-                            reads_source, fwdsource, revsource)
-
-        interleaved = 1 if not single_end else 0
-        file_valid = self.validateFASTQ({}, [{'file_path': actualpath,
-                                              'interleaved': interleaved}])
-
-        if not file_valid[0][0]['validated']:
-            file_info = ret
-            file_info['fwdsource'] = fwdsource
-            file_info['revsource'] = revsource
-            validation_error_message = self._generate_validation_error_message(
-                reads_source, actualpath, file_info)
-            raise ValueError(validation_error_message)
+        uploadpath, o, wsid, name, objid, kbtype, single_end = (
+            self._prepare_upload(ctx, params))
 
         self.log('validation complete, uploading files to shock')
-
-        uploadedfile = dfu.file_to_shock({'file_path': actualpath,
-                                          'make_handle': 1,
-                                          'pack': 'gzip'})
-        fhandle = uploadedfile['handle']
-        fsize = uploadedfile['size']
-
-        # calculate the stats for file.
-        o = self.get_fq_stats(o, actualpath)
-
-        fwdfile = {'file': fhandle,
-                   'encoding': 'ascii',
-                   'size': fsize,
-                   'type': 'fq'
-                   }
-        if single_end:
-            o['lib'] = fwdfile
-        else:
-            o['lib1'] = fwdfile
-
-        so = {'type': kbtype,
-              'data': o
-              }
-        if name:
-            so['name'] = name
-        else:
-            so['objid'] = objid
+        dfu = self.clients.dfu()
+        uploadedfile = dfu.file_to_shock({'file_path': uploadpath,
+                                          'make_handle': 1})
+        so = self._reads_object(o, name, objid, kbtype, single_end,
+                                uploadedfile)
         self.log('saving workspace object')
 
-        oi = dfu.save_objects({'id': wsid, 'objects': [so]})[0]
+        try:
+            oi = dfu.save_objects({'id': wsid, 'objects': [so]})[0]
+        except DFUError:
+            # the cached ID for the workspace name may be out of date
+            if isinstance(params.get('wsname'), six.string_types):
+                self.ws_ids.invalidate(params['wsname'])
+            raise
         self.log('save complete')
 
         returnVal = {'obj_ref': str(oi[6]) + '/' + str(oi[0]) + '/' +
@@ -1147,6 +3599,236 @@ class ReadsUtils:
         # return the results
         return [returnVal]
 
+    def upload_reads_batch(self, ctx, params):
+        """
+        Loads many sets of reads to KBase data stores. Workspace names are
+        translated to IDs once, libraries are prepared on up to max_parallel
+        workers, and the files and objects are saved with a few calls for the
+        whole batch. A library that fails doesn't stop the others.
+        :param params: instance of type "UploadReadsBatchParams" (Input to
+           the upload_reads_batch function. list<UploadReadsParams> reads -
+           the reads libraries to upload, each with the parameters for
+           upload_reads. int max_parallel - the maximum number of libraries
+           to download, validate and compress at the same time. Defaults to
+           1.) -> structure: parameter "reads" of list of type
+           "UploadReadsParams" (Input to the upload_reads function. Local,
+           web and staging files may be uncompressed or compressed with gzip,
+           bzip2 or xz. Compressed files are read directly, without being
+           uncompressed to disk first. Files will be gzipped prior to upload.
+           If web files are specified for upload, a download type one of
+           ['Direct Download', 'DropBox', 'FTP', 'Google Drive'] must be
+           specified too. If staging files are specified for upload, the
+           staging file must be accessible by current user. Note that if a
+           reverse read file is specified, it must be a local file if the
+           forward reads file is a local file, or a shock id if not. If a
+           reverse web file or staging file is specified, the reverse file
+           category must match the forward file category. If a reverse file
+           is specified the uploader will will automatically intereave the
+           forward and reverse files and store that in shock. Additionally
+           the statistics generated are on the resulting interleaved file.
+           Required parameters: fwd_id - the id of the shock node containing
+           the reads data file: either single end reads, forward/left reads,
+           or interleaved reads. - OR - fwd_file - a local path to the reads
+           data file: either single end reads, forward/left reads, or
+           interleaved reads. - OR - fwd_file_url - a download link that
+           contains reads data file: either single end reads, forward/left
+           reads, or interleaved reads. download_type - download type
+           ['Direct Download', 'FTP', 'DropBox', 'Google Drive'] - OR -
+           fwd_staging_file_name - reads data file name/ subdirectory path in
+           staging area: either single end reads, forward/left reads, or
+           interleaved reads. sequencing_tech - the sequencing technology
+           used to produce the reads. (If source_reads_ref is specified then
+           sequencing_tech must not be specified) One of: wsid - the id of
+           the workspace where the reads will be saved (preferred). wsname -
+           the name of the workspace where the reads will be saved. One of:
+           objid - the id of the workspace object to save over name - the
+           name to which the workspace object will be saved Optional
+           parameters: rev_id - the shock node id containing the
+           reverse/right reads for paired end, non-interleaved reads. - OR -
+           rev_file - a local path to the reads data file containing the
+           reverse/right reads for paired end, non-interleaved reads, note
+           the reverse file will get interleaved with the forward file. - OR
+           - rev_file_url - a download link that contains reads data file:
+           reverse/right reads for paired end, non-interleaved reads. - OR -
+           rev_staging_file_name - reads data file name in staging area:
+           reverse/right reads for paired end, non-interleaved reads.
+           single_genome - whether the reads are from a single genome or a
+           metagenome. Default is single genome. strain - information about
+           the organism strain that was sequenced. source - information about
+           the organism source. interleaved - specify that the fwd reads file
+           is an interleaved paired end reads file as opposed to a single end
+           reads file. Default true, ignored if rev_id is specified.
+           read_orientation_outward - whether the read orientation is outward
+           from the set of primers. Default is false and is ignored for
+           single end reads. insert_size_mean - the mean size of the genetic
+           fragments. Ignored for single end reads. insert_size_std_dev - the
+           standard deviation of the size of the genetic fragments. Ignored
+           for single end reads. source_reads_ref - A workspace reference to
+           a source reads object. This is used to propogate user defined info
+           from the source reads object to the new reads object (used for
+           filtering or trimming services). Note this causes a passed in
+           insert_size_mean, insert_size_std_dev, sequencing_tech,
+           read_orientation_outward, strain, source and/or single_genome to
+           throw an error.) -> structure: parameter "fwd_id" of String,
+           parameter "fwd_file" of String, parameter "wsid" of Long,
+           parameter "wsname" of String, parameter "objid" of Long, parameter
+           "name" of String, parameter "rev_id" of String, parameter
+           "rev_file" of String, parameter "sequencing_tech" of String,
+           parameter "single_genome" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1)), parameter "strain" of type
+           "StrainInfo" (Information about a strain. genetic_code - the
+           genetic code of the strain. See
+           http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c
+           genus - the genus of the strain species - the species of the
+           strain strain - the identifier for the strain source - information
+           about the source of the strain organelle - the organelle of
+           interest for the related data (e.g. mitochondria) ncbi_taxid - the
+           NCBI taxonomy ID of the strain location - the location from which
+           the strain was collected @optional genetic_code source ncbi_taxid
+           organelle location) -> structure: parameter "genetic_code" of
+           Long, parameter "genus" of String, parameter "species" of String,
+           parameter "strain" of String, parameter "organelle" of String,
+           parameter "source" of type "SourceInfo" (Information about the
+           source of a piece of data. source - the name of the source (e.g.
+           NCBI, JGI, Swiss-Prot) source_id - the ID of the data at the
+           source project_id - the ID of a project encompassing the data at
+           the source @optional source source_id project_id) -> structure:
+           parameter "source" of String, parameter "source_id" of type
+           "source_id" (An ID used for a piece of data at its source. @id
+           external), parameter "project_id" of type "project_id" (An ID used
+           for a project encompassing a piece of data at its source. @id
+           external), parameter "ncbi_taxid" of Long, parameter "location" of
+           type "Location" (Information about a location. lat - latitude of
+           the site, recorded as a decimal number. North latitudes are
+           positive values and south latitudes are negative numbers. lon -
+           longitude of the site, recorded as a decimal number. West
+           longitudes are positive values and east longitudes are negative
+           numbers. elevation - elevation of the site, expressed in meters
+           above sea level. Negative values are allowed. date - date of an
+           event at this location (for example, sample collection), expressed
+           in the format YYYY-MM-DDThh:mm:ss.SSSZ description - a free text
+           description of the location and, if applicable, the associated
+           event. @optional date description) -> structure: parameter "lat"
+           of Double, parameter "lon" of Double, parameter "elevation" of
+           Double, parameter "date" of String, parameter "description" of
+           String, parameter "source" of type "SourceInfo" (Information about
+           the source of a piece of data. source - the name of the source
+           (e.g. NCBI, JGI, Swiss-Prot) source_id - the ID of the data at the
+           source project_id - the ID of a project encompassing the data at
+           the source @optional source source_id project_id) -> structure:
+           parameter "source" of String, parameter "source_id" of type
+           "source_id" (An ID used for a piece of data at its source. @id
+           external), parameter "project_id" of type "project_id" (An ID used
+           for a project encompassing a piece of data at its source. @id
+           external), parameter "interleaved" of type "boolean" (A boolean -
+           0 for false, 1 for true. @range (0, 1)), parameter
+           "read_orientation_outward" of type "boolean" (A boolean - 0 for
+           false, 1 for true. @range (0, 1)), parameter "insert_size_mean" of
+           Double, parameter "insert_size_std_dev" of Double, parameter
+           "source_reads_ref" of String, parameter "fwd_file_url" of String,
+           parameter "rev_file_url" of String, parameter
+           "fwd_staging_file_name" of String, parameter
+           "rev_staging_file_name" of String, parameter "download_type" of
+           String, parameter "max_parallel" of Long
+        :returns: instance of type "UploadReadsBatchOutput" (The output of
+           the upload_reads_batch function. results - the result for each
+           library, in the order of the input.) -> structure: parameter
+           "results" of list of type "UploadReadsResult" (The result of
+           uploading one reads library with upload_reads_batch. obj_ref - a
+           reference to the new Workspace object, as for upload_reads, if the
+           library was uploaded. error - the error that stopped the library
+           being uploaded, if it failed.) -> structure: parameter "obj_ref"
+           of String, parameter "error" of String
+        """
+        # ctx is the context object
+        # return variables are: returnVal
+        #BEGIN upload_reads_batch
+        self.log('Starting batch upload of reads')
+        if self.PARAM_IN_READS not in params:
+            raise ValueError(self.PARAM_IN_READS + ' parameter is required')
+        reads = params[self.PARAM_IN_READS]
+        if not isinstance(reads, list):
+            raise ValueError(self.PARAM_IN_READS + ' must be a list')
+        if not reads:
+            raise ValueError('At least one reads library must be provided')
+        self.process_max_parallel(params)
+        max_parallel = min(params[self.PARAM_IN_MAX_PARALLEL], len(reads))
+
+        results = [{} for _ in reads]
+        # only the user ID is needed to prepare a library, and unlike the
+        # context it can be handed to a worker process
+        user_ctx = {'user_id': ctx['user_id']}
+        jobs = [(user_ctx, p, i) for i, p in
+                enumerate(self._resolve_ws_names(reads, results)) if p]
+        max_parallel = min(max_parallel, len(jobs))
+        if max_parallel <= 1:
+            prepared = [self._prepare_batch_upload(*job) for job in jobs]
+        else:
+            # validation, interleaving and compression hold the GIL, so each
+            # library is prepared in its own process, and the compression
+            # threads are shared out between the processes
+            self.log('Preparing {} reads libraries with {} workers'.format(
+                len(jobs), max_parallel))
+            pool = multiprocessing.Pool(
+                max_parallel, _init_reads_worker,
+                (self, max(1, self.compression_threads // max_parallel)),
+                maxtasksperchild=1)
+            try:
+                prepared = [r.get() for r in
+                            [pool.apply_async(prepare_batch_upload, job)
+                             for job in jobs]]
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
+        uploads = []
+        for (_, _, i), (upload, error) in zip(jobs, prepared):
+            if error is not None:
+                results[i]['error'] = error
+            else:
+                uploads.append((i, upload))
+
+        self.log('validation complete, uploading {} files to shock'.format(
+            len(uploads)))
+        saves = collections.OrderedDict()
+        if uploads:
+            uploaded = self._upload_files([u[0] for _, u in uploads])
+            for (i, upload), uploadedfile in zip(uploads, uploaded):
+                if isinstance(uploadedfile, DFUError):
+                    results[i]['error'] = uploadedfile.message
+                    continue
+                uploadpath, o, wsid, name, objid, kbtype, single_end = upload
+                saves.setdefault(wsid, []).append((i, self._reads_object(
+                    o, name, objid, kbtype, single_end, uploadedfile)))
+
+        self.log('saving workspace objects')
+        for wsid, objects in saves.items():
+            for b in range(0, len(objects), self.UPLOAD_SAVE_BATCH_SIZE):
+                batch = objects[b:b + self.UPLOAD_SAVE_BATCH_SIZE]
+                infos = self._save_reads_objects(wsid, [so for _, so in batch])
+                for (i, _), oi in zip(batch, infos):
+                    if isinstance(oi, DFUError):
+                        results[i]['error'] = oi.message
+                        # the cached ID for the workspace name may be out of
+                        # date
+                        wsname = reads[i].get('wsname')
+                        if isinstance(wsname, six.string_types):
+                            self.ws_ids.invalidate(wsname)
+                    else:
+                        results[i]['obj_ref'] = self.make_ref(oi)
+        self.log('save complete, {} of {} reads libraries uploaded'.format(
+            sum('obj_ref' in r for r in results), len(results)))
+
+        returnVal = {'results': results}
+        #END upload_reads_batch
+
+        # At some point might do deeper type checking...
+        if not isinstance(returnVal, dict):
+            raise ValueError('Method upload_reads_batch return value ' +
+                             'returnVal is not type dict as required.')
+        # return the results
+        return [returnVal]
+
     def download_reads(self, ctx, params):
         """
         Download read libraries. Reads compressed with gzip or bzip are
@@ -1157,13 +3839,28 @@ class ReadsUtils:
            download. tern interleaved - if true, provide the files in
            interleaved format if they are not already. If false, provide
            forward and reverse reads files. If null or missing, leave files
-           as is.) -> structure: parameter "read_libraries" of list of type
-           "read_lib" (A reference to a read library stored in the workspace
-           service, whether of the KBaseAssembly or KBaseFile type. Usage of
-           absolute references (e.g. 256/3/6) is strongly encouraged to avoid
-           race conditions, although any valid reference is allowed.),
-           parameter "interleaved" of type "tern" (A ternary. Allowed values
-           are 'false', 'true', or null. Any other value is invalid.)
+           as is. int max_parallel - the maximum number of read libraries to
+           download and process at the same time. Defaults to 1. boolean
+           use_cache - if true, reuse the files from earlier downloads of the
+           same read libraries with the same interleaved option by calls
+           sharing the scratch space, and add the files to the cache. The
+           cached files are provided as read only hard links. Defaults to
+           false. string compression - the compression of the provided files,
+           one of 'none', 'gzip', 'gzip-fast', 'zstd' or 'native'. gzip-fast
+           is gzip at the fastest level. Files stored in Shock with the
+           requested compression are provided as is when they need no
+           interleaving or deinterleaving. native provides such files as
+           stored, whatever their compression, and gzips the rest. Defaults
+           to 'none'.) -> structure: parameter "read_libraries" of list of
+           type "read_lib" (A reference to a read library stored in the
+           workspace service, whether of the KBaseAssembly or KBaseFile type.
+           Usage of absolute references (e.g. 256/3/6) is strongly encouraged
+           to avoid race conditions, although any valid reference is
+           allowed.), parameter "interleaved" of type "tern" (A ternary.
+           Allowed values are 'false', 'true', or null. Any other value is
+           invalid.), parameter "max_parallel" of Long, parameter "use_cache"
+           of type "boolean" (A boolean - 0 for false, 1 for true. @range (0,
+           1)), parameter "compression" of String
         :returns: instance of type "DownloadReadsOutput" (The output of the
            download method. mapping<read_lib, DownloadedReadLibrary> files -
            a mapping of the read library workspace references to information
@@ -1216,17 +3913,19 @@ class ReadsUtils:
            the reads are single end or interleaved. string otype - the
            original type of the reads. One of 'single', 'paired', or
            'interleaved'. string type - one of 'single', 'paired', or
-           'interleaved'.) -> structure: parameter "fwd" of String, parameter
-           "fwd_name" of String, parameter "rev" of String, parameter
-           "rev_name" of String, parameter "otype" of String, parameter
-           "type" of String, parameter "ref" of String, parameter
-           "single_genome" of type "tern" (A ternary. Allowed values are
-           'false', 'true', or null. Any other value is invalid.), parameter
-           "read_orientation_outward" of type "tern" (A ternary. Allowed
-           values are 'false', 'true', or null. Any other value is invalid.),
-           parameter "sequencing_tech" of String, parameter "strain" of type
-           "StrainInfo" (Information about a strain. genetic_code - the
-           genetic code of the strain. See
+           'interleaved'. string encoding - the compression of the files, one
+           of 'none', 'gzip', 'zstd', 'bzip2' or 'xz'. Compressed file names
+           end with .gz, .zst, .bz2 or .xz.) -> structure: parameter "fwd" of
+           String, parameter "fwd_name" of String, parameter "rev" of String,
+           parameter "rev_name" of String, parameter "otype" of String,
+           parameter "type" of String, parameter "encoding" of String,
+           parameter "ref" of String, parameter "single_genome" of type
+           "tern" (A ternary. Allowed values are 'false', 'true', or null.
+           Any other value is invalid.), parameter "read_orientation_outward"
+           of type "tern" (A ternary. Allowed values are 'false', 'true', or
+           null. Any other value is invalid.), parameter "sequencing_tech" of
+           String, parameter "strain" of type "StrainInfo" (Information about
+           a strain. genetic_code - the genetic code of the strain. See
            http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c
            genus - the genus of the strain species - the species of the
            strain strain - the identifier for the strain source - information
@@ -1285,9 +3984,6 @@ class ReadsUtils:
         ''' potential improvements:
             Add continue_on_failure mode that reports errors for each failed
                 conversion rather than failing completely.
-            Parallelize - probably not worth it, this is all IO bound. Try if
-                there's nothing better to do. If so, each process/thread needs
-                its own shock_tmp folder.
             Add user specified failure conditions - e.g. fail if is/is not
                 metagenome, outwards reads, etc.
         '''
@@ -1298,7 +3994,7 @@ class ReadsUtils:
         self.process_params(params)
 #         self.log('\n' + pformat(params))
 
-        dfu = DataFileUtil(self.callback_url)
+        dfu = self.clients.dfu()
         # Get the reads library
         ws_reads_ids = params[self.PARAM_IN_LIB]
         try:
@@ -1307,12 +4003,78 @@ class ReadsUtils:
             self.log('Logging stacktrace from workspace exception:\n' + e.data)
             raise
 
+        interleave = params[self.PARAM_IN_INTERLEAVED]
+        compression = params[self.PARAM_IN_COMPRESSION]
+        cache = None
+        if params[self.PARAM_IN_USE_CACHE]:
+            cache = DownloadCache(
+                os.path.join(self.scratch, self.DOWNLOAD_CACHE_DIR),
+                self.download_cache_size)
+
+        # check the file names and types of every library before downloading.
+        # Each library gets its own scratch subdirectory so that libraries
+        # never share file paths, even when they share Shock nodes.
         output = {}
+        libs = []
         for read_name, read in zip(ws_reads_ids, reads):
-            self.log('=== processing read library ' + read_name + '===\n',
-                     prefix_newline=True)
-            output[read_name] = self.process_reads(
-                read, params[self.PARAM_IN_INTERLEAVED])
+            ref, obj_name = self.make_ref(read['info']), read['info'][1]
+            files = self._reads_files(read)
+            for handle, file_type in files:
+                self._check_file_names(ref, obj_name, handle, file_type)
+            scratch = tempfile.mkdtemp(dir=self.scratch, prefix='download_')
+            key = None
+            if cache:
+                variant = (self.DOWNLOAD_CACHE_UNCOMPRESSED
+                           if compression == 'none' else compression)
+                key = cache.key([handle['id'] for handle, _ in files],
+                                variant, interleave)
+                cached = cache.get(key, scratch)
+                if cached:
+                    self.log('Using cached files for read library ' +
+                             read_name)
+                    output[read_name] = self._cached_reads(read, cached)
+                    continue
+            libs.append((read_name, read, ref, obj_name, scratch, files, key,
+                         self._download_suffixes(read, interleave,
+                                                 compression)))
+        if cache:
+            self.log('Download cache: {} hits, {} misses'.format(
+                cache.hits, cache.misses))
+
+        max_parallel = min(params[self.PARAM_IN_MAX_PARALLEL], len(libs))
+        downloads = []
+        if libs:
+            downloads = self._download_reads_files(
+                [(ref, obj_name, scratch, files, suffixes)
+                 for _, _, ref, obj_name, scratch, files, _, suffixes
+                 in libs],
+                max_parallel)
+        jobs = [(read_name, read, interleave, scratch, dls, cache, key,
+                 compression)
+                for (read_name, read, _, _, scratch, _, key, _), dls
+                in zip(libs, downloads)]
+        if max_parallel <= 1:
+            for job in jobs:
+                output[job[0]] = self._process_downloaded_reads(*job)
+        else:
+            # the downloads above are I/O and run on threads, but
+            # interleaving, deinterleaving and compression hold the GIL, so
+            # each library is converted in its own process
+            self.log('Processing {} read libraries with {} workers'.format(
+                len(jobs), max_parallel))
+            pool = multiprocessing.Pool(max_parallel, _init_reads_worker,
+                                        (self,), maxtasksperchild=1)
+            try:
+                results = [pool.apply_async(process_downloaded_reads, job)
+                           for job in jobs]
+                # collect in input order so the first failing library, not
+                # the first to fail, is reported
+                for job, result in zip(jobs, results):
+                    output[job[0]] = result.get()
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
         output = {'files': output}
         #END download_reads
 
@@ -1326,7 +4088,8 @@ class ReadsUtils:
     def export_reads(self, ctx, params):
         """
         KBase downloader function. Packages a set of reads into a zip file and
-        stores the zip in shock.
+        stores the zip in shock. Reads files are packaged with their
+        compression in Shock, so they're never uncompressed on the way.
         :param params: instance of type "ExportParams" (Standard KBase
            downloader input.) -> structure: parameter "input_ref" of String
         :returns: instance of type "ExportOutput" (Standard KBase downloader
@@ -1340,35 +4103,8 @@ class ReadsUtils:
         if not inref:
             raise ValueError('No input_ref specified')
 
-        # get WS metadata to get obj_name
-        ws = Workspace(self.ws_url)
-        try:
-            info = ws.get_object_info_new({'objects': [{'ref': inref}]})[0]
-        except WorkspaceError as wse:
-            self.log('Logging workspace exception')
-            self.log(str(wse))
-            raise
-
-        files = self.download_reads(
-            ctx, {self.PARAM_IN_LIB: [inref]})[0]['files'][inref]['files']
-
-        # create the output directory and move the file there
-        tempdir = tempfile.mkdtemp(dir=self.scratch)
-        export_dir = os.path.join(tempdir, info[1])
-        os.makedirs(export_dir)
-        fwd = files['fwd']
-        shutil.move(fwd, os.path.join(export_dir, os.path.basename(fwd)))
-        rev = files.get('rev')
-        if rev:
-            shutil.move(rev, os.path.join(export_dir, os.path.basename(rev)))
-
-        # package and load to shock
-        dfu = DataFileUtil(self.callback_url)
-        ret = dfu.package_for_download({'file_path': export_dir,
-                                        'ws_refs': [inref]
-                                        })
-
-        output = {'shock_id': ret['shock_id']}
+        shock_ids = self._export_reads(ctx, [inref])
+        output = {'shock_id': shock_ids[inref]}
 
         #END export_reads
 
@@ -1378,6 +4114,73 @@ class ReadsUtils:
                              'output is not type dict as required.')
         # return the results
         return [output]
+
+    def export_reads_batch(self, ctx, params):
+        """
+        Packages many reads objects as export_reads does, getting the object
+        information in one workspace call and downloading the Shock nodes of
+        all the objects at the same time, shared nodes only once.
+        :param params: instance of type "ExportReadsBatchParams" (Input for
+           the export_reads_batch function. list<read_lib> input_refs - the
+           reads objects to export. boolean single_archive - if true, package
+           all the objects in one zip file, each in a directory named after
+           the object. Otherwise each object is packaged in its own zip file
+           as by export_reads. Defaults to false. int max_parallel - the
+           maximum number of read libraries to download and process at the
+           same time. Defaults to 1.) -> structure: parameter "input_refs" of
+           list of type "read_lib" (A reference to a read library stored in
+           the workspace service, whether of the KBaseAssembly or KBaseFile
+           type. Usage of absolute references (e.g. 256/3/6) is strongly
+           encouraged to avoid race conditions, although any valid reference
+           is allowed.), parameter "single_archive" of type "boolean" (A
+           boolean - 0 for false, 1 for true. @range (0, 1)), parameter
+           "max_parallel" of Long
+        :returns: instance of type "ExportReadsBatchOutput" (Output of the
+           export_reads_batch function. mapping<read_lib, string> shock_ids -
+           the ID of the Shock node holding the zip file of each reads
+           object. With single_archive every object maps to the same node.)
+           -> structure: parameter "shock_ids" of mapping from type
+           "read_lib" (A reference to a read library stored in the workspace
+           service, whether of the KBaseAssembly or KBaseFile type. Usage of
+           absolute references (e.g. 256/3/6) is strongly encouraged to avoid
+           race conditions, although any valid reference is allowed.) to
+           String
+        """
+        # ctx is the context object
+        # return variables are: output
+        #BEGIN export_reads_batch
+
+        if self.PARAM_IN_INPUT_REFS not in params:
+            raise ValueError(self.PARAM_IN_INPUT_REFS +
+                             ' parameter is required')
+        refs = params[self.PARAM_IN_INPUT_REFS]
+        if not isinstance(refs, list):
+            raise ValueError(self.PARAM_IN_INPUT_REFS + ' must be a list')
+        if not refs:
+            raise ValueError('At least one reads object must be provided')
+        for ref in refs:
+            if not ref:
+                raise ValueError('Invalid workspace object name: ' + str(ref))
+        # drop duplicates, keeping the order of the objects
+        seen = set()
+        refs = [r for r in refs if not (r in seen or seen.add(r))]
+        single_archive = params.get(self.PARAM_IN_SINGLE_ARCHIVE)
+        if single_archive not in (None, 0, 1):
+            raise ValueError(self.PARAM_IN_SINGLE_ARCHIVE + ' must be 0 or 1')
+
+        shock_ids = self._export_reads(
+            ctx, refs, bool(single_archive),
+            params.get(self.PARAM_IN_MAX_PARALLEL))
+        output = {'shock_ids': shock_ids}
+
+        #END export_reads_batch
+
+        # At some point might do deeper type checking...
+        if not isinstance(output, dict):
+            raise ValueError('Method export_reads_batch return value ' +
+                             'output is not type dict as required.')
+        # return the results
+        return [output]
     def status(self, ctx):
         #BEGIN_STATUS
         del ctx
@@ -341,6 +341,10 @@ class Application(object):
                              name='ReadsUtils.upload_reads',
                              types=[dict])
         self.method_authentication['ReadsUtils.upload_reads'] = 'required'  # noqa
+        self.rpc_service.add(impl_ReadsUtils.upload_reads_batch,
+                             name='ReadsUtils.upload_reads_batch',
+                             types=[dict])
+        self.method_authentication['ReadsUtils.upload_reads_batch'] = 'required'  # noqa
         self.rpc_service.add(impl_ReadsUtils.download_reads,
                              name='ReadsUtils.download_reads',
                              types=[dict])
@@ -349,6 +353,10 @@ class Application(object):
                              name='ReadsUtils.export_reads',
                              types=[dict])
         self.method_authentication['ReadsUtils.export_reads'] = 'required'  # noqa
+        self.rpc_service.add(impl_ReadsUtils.export_reads_batch,
+                             name='ReadsUtils.export_reads_batch',
+                             types=[dict])
+        self.method_authentication['ReadsUtils.export_reads_batch'] = 'required'  # noqa
         self.rpc_service.add(impl_ReadsUtils.status,
                              name='ReadsUtils.status',
                              types=[dict])
@@ -11,6 +11,8 @@ import json as _json
 import requests as _requests
 import random as _random
 import os as _os
+import threading as _threading
+import collections as _collections
 
 try:
     from configparser import ConfigParser as _ConfigParser  # py 3
@@ -21,12 +23,99 @@ try:
     from urllib.parse import urlparse as _urlparse  # py3
 except ImportError:
     from urlparse import urlparse as _urlparse  # py2
+
+try:
+    from urllib3.util.retry import Retry as _Retry
+except ImportError:
+    from requests.packages.urllib3.util.retry import Retry as _Retry
 import time
 
 _CT = 'content-type'
 _AJ = 'application/json'
 _URL_SCHEME = frozenset(['http', 'https'])
 
+_session_lock = _threading.Lock()
+_sessions = {}
+
+
+def _get_retry(retries, idempotent):
+    '''
+    Returns the retry policy for calls to a service. Failures to connect are
+    always retried, as nothing has reached the server. Idempotent calls are
+    also retried if the connection fails after the request was sent, such as
+    when the server has closed a pooled keep-alive connection, whatever the
+    HTTP method.
+    '''
+    kwargs = {'total': retries, 'connect': retries,
+              'read': retries if idempotent else 0, 'status': 0,
+              'backoff_factor': 0.5}
+    if not idempotent:
+        return _Retry(**kwargs)
+    try:
+        return _Retry(allowed_methods=False, **kwargs)
+    except TypeError:  # urllib3 < 1.26
+        return _Retry(method_whitelist=False, **kwargs)
+
+
+def _get_session(url, pool_size, retries, idempotent=False):
+    '''
+    Returns the requests session shared by every client in this process for
+    the scheme and host of url and for idempotent or other calls, creating it
+    on first use. The session keeps connections alive and retries failures as
+    _get_retry describes. Sessions are keyed by process id, so a forked
+    process never uses the kept-alive connections it inherits.
+    '''
+    scheme, netloc, _, _, _, _ = _urlparse(url)
+    key = (_os.getpid(), scheme, netloc, idempotent)
+    with _session_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _requests.Session()
+            session.mount(scheme + '://', _requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=pool_size,
+                max_retries=_get_retry(retries, idempotent)))
+            _sessions[key] = session
+    return session
+
+
+# how much the rolling average job duration for a method moves towards the
+# duration of each new job
+_JOB_DURATION_WEIGHT = 0.3
+_JOB_METRICS_SIZE = 1000
+
+_job_lock = _threading.Lock()
+_job_durations = {}
+_job_metrics = _collections.deque(maxlen=_JOB_METRICS_SIZE)
+
+
+def _expected_job_duration(service_method):
+    with _job_lock:
+        return _job_durations.get(service_method)
+
+
+def _record_job(service_method, job_id, duration, polls, last_wait):
+    with _job_lock:
+        avg = _job_durations.get(service_method)
+        _job_durations[service_method] = duration if avg is None else (
+            avg + _JOB_DURATION_WEIGHT * (duration - avg))
+        _job_metrics.append({'method': service_method,
+                             'job_id': job_id,
+                             'duration': duration,
+                             'polls': polls,
+                             'max_notice_delay': last_wait})
+
+
+def get_job_metrics():
+    '''
+    Returns the latency metrics for the most recent asynchronous jobs run by
+    any client in this process, oldest first. Each is a dict with the
+    service method, the job id, the duration in seconds from submission to
+    noticing the job had finished, the number of job state checks, and the
+    last wait between checks, which bounds how late the job was noticed.
+    '''
+    with _job_lock:
+        return [dict(m) for m in _job_metrics]
+
 
 def _get_token(user_id, password, auth_svc):
     # This is bandaid helper function until we get a full
@@ -116,6 +205,24 @@ class BaseClient(object):
     lookup_url - set to true when contacting KBase dynamic services.
     async_job_check_time_ms - the wait time between checking job state for
         asynchronous jobs run with the run_job method.
+    async_job_check_time_scale_percent - the percentage the wait time grows
+        by after each check.
+    async_job_check_max_time_ms - the maximum wait time between checks.
+    async_job_check_late_percent - once a job has run longer than the
+        average for its method, or if there is no average yet, the wait time
+        is limited to this percentage of the time the job has been running,
+        but not to less than async_job_check_late_min_ms.
+    async_job_check_late_min_ms - the smallest wait time the limit above
+        imposes.
+    async_job_check_jitter_percent - the wait time is randomly varied by up
+        to this percentage so that concurrent jobs are not checked in step.
+    pool_size - the maximum number of connections kept open to a host. The
+        connections are shared by every client in the process that contacts
+        the host, and the first of those clients sets the size.
+    connection_retries - the number of times to retry a failed connection to
+        the service with backoff. Job state checks and service url lookups,
+        which are safe to repeat, are also retried if the connection drops
+        during the call.
     '''
     def __init__(
             self, url=None, timeout=30 * 60, user_id=None,
@@ -125,7 +232,12 @@ class BaseClient(object):
             lookup_url=False,
             async_job_check_time_ms=100,
             async_job_check_time_scale_percent=150,
-            async_job_check_max_time_ms=300000):
+            async_job_check_max_time_ms=300000,
+            async_job_check_late_percent=20,
+            async_job_check_late_min_ms=1000,
+            async_job_check_jitter_percent=10,
+            pool_size=10,
+            connection_retries=3):
         if url is None:
             raise ValueError('A url is required')
         scheme, _, _, _, _, _ = _urlparse(url)
@@ -136,10 +248,15 @@ class BaseClient(object):
         self._headers = dict()
         self.trust_all_ssl_certificates = trust_all_ssl_certificates
         self.lookup_url = lookup_url
+        self.pool_size = pool_size
+        self.connection_retries = connection_retries
         self.async_job_check_time = async_job_check_time_ms / 1000.0
         self.async_job_check_time_scale_percent = (
             async_job_check_time_scale_percent)
         self.async_job_check_max_time = async_job_check_max_time_ms / 1000.0
+        self.async_job_check_late_percent = async_job_check_late_percent
+        self.async_job_check_late_min = async_job_check_late_min_ms / 1000.0
+        self.async_job_check_jitter_percent = async_job_check_jitter_percent
         # token overrides user_id and password
         if token is not None:
             self._headers['AUTHORIZATION'] = token
@@ -160,7 +277,7 @@ class BaseClient(object):
         if self.timeout < 1:
             raise ValueError('Timeout value must be at least 1 second')
 
-    def _call(self, url, method, params, context=None):
+    def _call(self, url, method, params, context=None, idempotent=False):
         arg_hash = {'method': method,
                     'params': params,
                     'version': '1.1',
@@ -172,9 +289,11 @@ class BaseClient(object):
             arg_hash['context'] = context
 
         body = _json.dumps(arg_hash, cls=_JSONObjectEncoder)
-        ret = _requests.post(url, data=body, headers=self._headers,
-                             timeout=self.timeout,
-                             verify=not self.trust_all_ssl_certificates)
+        session = _get_session(url, self.pool_size, self.connection_retries,
+                               idempotent)
+        ret = session.post(url, data=body, headers=self._headers,
+                           timeout=self.timeout,
+                           verify=not self.trust_all_ssl_certificates)
         ret.encoding = 'utf-8'
         if ret.status_code == 500:
             if ret.headers.get(_CT) == _AJ:
@@ -202,7 +321,8 @@ class BaseClient(object):
         service, _ = service_method.split('.')
         service_status_ret = self._call(
             self.url, 'ServiceWizard.get_service_status',
-            [{'module_name': service, 'version': service_version}])
+            [{'module_name': service, 'version': service_version}],
+            idempotent=True)
         return service_status_ret['url']
 
     def _set_up_context(self, service_ver=None, context=None):
@@ -213,7 +333,8 @@ class BaseClient(object):
         return context
 
     def _check_job(self, service, job_id):
-        return self._call(self.url, service + '._check_job', [job_id])
+        return self._call(self.url, service + '._check_job', [job_id],
+                          idempotent=True)
 
     def _submit_job(self, service_method, args, service_ver=None,
                     context=None):
@@ -233,23 +354,45 @@ class BaseClient(object):
             or dev/beta/release.
         context - the rpc context dict.
         '''
-        mod, _ = service_method.split('.')
         job_id = self._submit_job(service_method, args, service_ver, context)
-        async_job_check_time = self.async_job_check_time
+        job_state = self._wait_for_job(service_method, job_id)
+        if not job_state['result']:
+            return
+        if len(job_state['result']) == 1:
+            return job_state['result'][0]
+        return job_state['result']
+
+    def _wait_for_job(self, service_method, job_id):
+        '''
+        Waits for an asynchronous job to finish and returns its final state.
+        The wait between checks grows geometrically, but is cut short at the
+        end of the job's expected duration, the rolling average for the
+        method, and from then on is kept to a fraction of the time the job
+        has been running, so a finished job is never noticed much later than
+        its run time warrants.
+        '''
+        mod, _ = service_method.split('.')
+        expected = _expected_job_duration(service_method)
+        start = time.time()
+        wait = self.async_job_check_time
+        polls = 0
         while True:
-            time.sleep(async_job_check_time)
-            async_job_check_time = (async_job_check_time *
-                                    self.async_job_check_time_scale_percent /
-                                    100.0)
-            if async_job_check_time > self.async_job_check_max_time:
-                async_job_check_time = self.async_job_check_max_time
+            jitter = self.async_job_check_jitter_percent / 100.0
+            time.sleep(wait * _random.uniform(1 - jitter, 1 + jitter))
+            polls += 1
             job_state = self._check_job(mod, job_id)
+            elapsed = time.time() - start
             if job_state['finished']:
-                if not job_state['result']:
-                    return
-                if len(job_state['result']) == 1:
-                    return job_state['result'][0]
-                return job_state['result']
+                _record_job(service_method, job_id, elapsed, polls, wait)
+                return job_state
+            wait = min(wait * self.async_job_check_time_scale_percent / 100.0,
+                       self.async_job_check_max_time)
+            if expected is not None and elapsed < expected:
+                limit = max(expected - elapsed, self.async_job_check_time)
+            else:
+                limit = max(elapsed * self.async_job_check_late_percent / 100.0,
+                            self.async_job_check_late_min)
+            wait = min(wait, limit)
 
     def call_method(self, service_method, args, service_ver=None,
                     context=None):
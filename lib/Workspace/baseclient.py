@@ -11,6 +11,7 @@ import json as _json
 import requests as _requests
 import random as _random
 import os as _os
+import threading as _threading
 
 try:
     from configparser import ConfigParser as _ConfigParser  # py 3
@@ -21,12 +22,60 @@ try:
     from urllib.parse import urlparse as _urlparse  # py3
 except ImportError:
     from urlparse import urlparse as _urlparse  # py2
+
+try:
+    from urllib3.util.retry import Retry as _Retry
+except ImportError:
+    from requests.packages.urllib3.util.retry import Retry as _Retry
 import time
 
 _CT = 'content-type'
 _AJ = 'application/json'
 _URL_SCHEME = frozenset(['http', 'https'])
 
+_session_lock = _threading.Lock()
+_sessions = {}
+
+
+def _get_retry(retries, idempotent):
+    '''
+    Returns the retry policy for calls to a service. Failures to connect are
+    always retried, as nothing has reached the server. Idempotent calls are
+    also retried if the connection fails after the request was sent, such as
+    when the server has closed a pooled keep-alive connection, whatever the
+    HTTP method.
+    '''
+    kwargs = {'total': retries, 'connect': retries,
+              'read': retries if idempotent else 0, 'status': 0,
+              'backoff_factor': 0.5}
+    if not idempotent:
+        return _Retry(**kwargs)
+    try:
+        return _Retry(allowed_methods=False, **kwargs)
+    except TypeError:  # urllib3 < 1.26
+        return _Retry(method_whitelist=False, **kwargs)
+
+
+def _get_session(url, pool_size, retries, idempotent=False):
+    '''
+    Returns the requests session shared by every client in this process for
+    the scheme and host of url and for idempotent or other calls, creating it
+    on first use. The session keeps connections alive and retries failures as
+    _get_retry describes. Sessions are keyed by process id, so a forked
+    process never uses the kept-alive connections it inherits.
+    '''
+    scheme, netloc, _, _, _, _ = _urlparse(url)
+    key = (_os.getpid(), scheme, netloc, idempotent)
+    with _session_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _requests.Session()
+            session.mount(scheme + '://', _requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=pool_size,
+                max_retries=_get_retry(retries, idempotent)))
+            _sessions[key] = session
+    return session
+
 
 def _get_token(user_id, password, auth_svc):
     # This is bandaid helper function until we get a full
@@ -116,6 +165,13 @@ class BaseClient(object):
     lookup_url - set to true when contacting KBase dynamic services.
     async_job_check_time_ms - the wait time between checking job state for
         asynchronous jobs run with the run_job method.
+    pool_size - the maximum number of connections kept open to a host. The
+        connections are shared by every client in the process that contacts
+        the host, and the first of those clients sets the size.
+    connection_retries - the number of times to retry a failed connection to
+        the service with backoff. Job state checks and service url lookups,
+        which are safe to repeat, are also retried if the connection drops
+        during the call.
     '''
     def __init__(
             self, url=None, timeout=30 * 60, user_id=None,
@@ -123,7 +179,9 @@ class BaseClient(object):
             trust_all_ssl_certificates=False,
             auth_svc='https://kbase.us/services/authorization/Sessions/Login',
             lookup_url=False,
-            async_job_check_time_ms=5000):
+            async_job_check_time_ms=5000,
+            pool_size=10,
+            connection_retries=3):
         if url is None:
             raise ValueError('A url is required')
         scheme, _, _, _, _, _ = _urlparse(url)
@@ -134,6 +192,8 @@ class BaseClient(object):
         self._headers = dict()
         self.trust_all_ssl_certificates = trust_all_ssl_certificates
         self.lookup_url = lookup_url
+        self.pool_size = pool_size
+        self.connection_retries = connection_retries
         self.async_job_check_time = async_job_check_time_ms / 1000.0
         # token overrides user_id and password
         if token is not None:
@@ -155,7 +215,7 @@ class BaseClient(object):
         if self.timeout < 1:
             raise ValueError('Timeout value must be at least 1 second')
 
-    def _call(self, url, method, params, context=None):
+    def _call(self, url, method, params, context=None, idempotent=False):
         arg_hash = {'method': method,
                     'params': params,
                     'version': '1.1',
@@ -167,9 +227,11 @@ class BaseClient(object):
             arg_hash['context'] = context
 
         body = _json.dumps(arg_hash, cls=_JSONObjectEncoder)
-        ret = _requests.post(url, data=body, headers=self._headers,
-                             timeout=self.timeout,
-                             verify=not self.trust_all_ssl_certificates)
+        session = _get_session(url, self.pool_size, self.connection_retries,
+                               idempotent)
+        ret = session.post(url, data=body, headers=self._headers,
+                           timeout=self.timeout,
+                           verify=not self.trust_all_ssl_certificates)
         ret.encoding = 'utf-8'
         if ret.status_code == 500:
             if ret.headers.get(_CT) == _AJ:
@@ -197,7 +259,8 @@ class BaseClient(object):
         service, _ = service_method.split('.')
         service_status_ret = self._call(
             self.url, 'ServiceWizard.get_service_status',
-            [{'module_name': service, 'version': service_version}])
+            [{'module_name': service, 'version': service_version}],
+            idempotent=True)
         return service_status_ret['url']
 
     def _set_up_context(self, service_ver=None, context=None):
@@ -208,7 +271,8 @@ class BaseClient(object):
         return context
 
     def _check_job(self, service, job_id):
-        return self._call(self.url, service + '._check_job', [job_id])
+        return self._call(self.url, service + '._check_job', [job_id],
+                          idempotent=True)
 
     def _submit_job(self, service_method, args, service_ver=None,
                     context=None):
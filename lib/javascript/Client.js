@@ -45,6 +45,19 @@ function ReadsUtils(url, auth, auth_cb, timeout, async_job_check_time_ms, servic
             [params], 1, _callback, _errorCallback);
     };
  
+     this.upload_reads_batch = function (params, _callback, _errorCallback) {
+        if (typeof params === 'function')
+            throw 'Argument params can not be a function';
+        if (_callback && typeof _callback !== 'function')
+            throw 'Argument _callback must be a function if defined';
+        if (_errorCallback && typeof _errorCallback !== 'function')
+            throw 'Argument _errorCallback must be a function if defined';
+        if (typeof arguments === 'function' && arguments.length > 1+2)
+            throw 'Too many arguments ('+arguments.length+' instead of '+(1+2)+')';
+        return json_call_ajax(_url, "ReadsUtils.upload_reads_batch",
+            [params], 1, _callback, _errorCallback);
+    };
+ 
      this.download_reads = function (params, _callback, _errorCallback) {
         if (typeof params === 'function')
             throw 'Argument params can not be a function';
@@ -70,6 +83,19 @@ function ReadsUtils(url, auth, auth_cb, timeout, async_job_check_time_ms, servic
         return json_call_ajax(_url, "ReadsUtils.export_reads",
             [params], 1, _callback, _errorCallback);
     };
+ 
+     this.export_reads_batch = function (params, _callback, _errorCallback) {
+        if (typeof params === 'function')
+            throw 'Argument params can not be a function';
+        if (_callback && typeof _callback !== 'function')
+            throw 'Argument _callback must be a function if defined';
+        if (_errorCallback && typeof _errorCallback !== 'function')
+            throw 'Argument _errorCallback must be a function if defined';
+        if (typeof arguments === 'function' && arguments.length > 1+2)
+            throw 'Too many arguments ('+arguments.length+' instead of '+(1+2)+')';
+        return json_call_ajax(_url, "ReadsUtils.export_reads_batch",
+            [params], 1, _callback, _errorCallback);
+    };
   
     this.status = function (_callback, _errorCallback) {
         if (_callback && typeof _callback !== 'function')
@@ -21,6 +21,19 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  * tern interleaved - if true, provide the files in interleaved format if
  *     they are not already. If false, provide forward and reverse reads
  *     files. If null or missing, leave files as is.
+ * int max_parallel - the maximum number of read libraries to download
+ *     and process at the same time. Defaults to 1.
+ * boolean use_cache - if true, reuse the files from earlier downloads of
+ *     the same read libraries with the same interleaved option by calls
+ *     sharing the scratch space, and add the files to the cache. The
+ *     cached files are provided as read only hard links. Defaults to
+ *     false.
+ * string compression - the compression of the provided files, one of
+ *     'none', 'gzip', 'gzip-fast', 'zstd' or 'native'. gzip-fast is gzip
+ *     at the fastest level. Files stored in Shock with the requested
+ *     compression are provided as is when they need no interleaving or
+ *     deinterleaving. native provides such files as stored, whatever
+ *     their compression, and gzips the rest. Defaults to 'none'.
  * </pre>
  * 
  */
@@ -28,7 +41,10 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
 @Generated("com.googlecode.jsonschema2pojo")
 @JsonPropertyOrder({
     "read_libraries",
-    "interleaved"
+    "interleaved",
+    "max_parallel",
+    "use_cache",
+    "compression"
 })
 public class DownloadReadsParams {
 
@@ -36,6 +52,12 @@ public class DownloadReadsParams {
     private List<String> readLibraries;
     @JsonProperty("interleaved")
     private java.lang.String interleaved;
+    @JsonProperty("max_parallel")
+    private Long maxParallel;
+    @JsonProperty("use_cache")
+    private Long useCache;
+    @JsonProperty("compression")
+    private java.lang.String compression;
     private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("read_libraries")
@@ -68,6 +90,51 @@ public class DownloadReadsParams {
         return this;
     }
 
+    @JsonProperty("max_parallel")
+    public Long getMaxParallel() {
+        return maxParallel;
+    }
+
+    @JsonProperty("max_parallel")
+    public void setMaxParallel(Long maxParallel) {
+        this.maxParallel = maxParallel;
+    }
+
+    public DownloadReadsParams withMaxParallel(Long maxParallel) {
+        this.maxParallel = maxParallel;
+        return this;
+    }
+
+    @JsonProperty("use_cache")
+    public Long getUseCache() {
+        return useCache;
+    }
+
+    @JsonProperty("use_cache")
+    public void setUseCache(Long useCache) {
+        this.useCache = useCache;
+    }
+
+    public DownloadReadsParams withUseCache(Long useCache) {
+        this.useCache = useCache;
+        return this;
+    }
+
+    @JsonProperty("compression")
+    public java.lang.String getCompression() {
+        return compression;
+    }
+
+    @JsonProperty("compression")
+    public void setCompression(java.lang.String compression) {
+        this.compression = compression;
+    }
+
+    public DownloadReadsParams withCompression(java.lang.String compression) {
+        this.compression = compression;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -80,7 +147,7 @@ public class DownloadReadsParams {
 
     @Override
     public java.lang.String toString() {
-        return ((((((("DownloadReadsParams"+" [readLibraries=")+ readLibraries)+", interleaved=")+ interleaved)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((((("DownloadReadsParams"+" [readLibraries=")+ readLibraries)+", interleaved=")+ interleaved)+", maxParallel=")+ maxParallel)+", useCache=")+ useCache)+", compression=")+ compression)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
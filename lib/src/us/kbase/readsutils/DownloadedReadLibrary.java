@@ -100,6 +100,9 @@ public class DownloadedReadLibrary {
      * string otype - the original type of the reads. One of 'single',
      *     'paired', or 'interleaved'.
      * string type - one of 'single', 'paired', or 'interleaved'.
+     * string encoding - the compression of the files, one of 'none', 'gzip',
+     *     'zstd', 'bzip2' or 'xz'. Compressed file names end with .gz, .zst,
+     *     .bz2 or .xz.
      * </pre>
      * 
      */
@@ -195,6 +198,9 @@ public class DownloadedReadLibrary {
      * string otype - the original type of the reads. One of 'single',
      *     'paired', or 'interleaved'.
      * string type - one of 'single', 'paired', or 'interleaved'.
+     * string encoding - the compression of the files, one of 'none', 'gzip',
+     *     'zstd', 'bzip2' or 'xz'. Compressed file names end with .gz, .zst,
+     *     .bz2 or .xz.
      * </pre>
      * 
      */
@@ -220,6 +226,9 @@ public class DownloadedReadLibrary {
      * string otype - the original type of the reads. One of 'single',
      *     'paired', or 'interleaved'.
      * string type - one of 'single', 'paired', or 'interleaved'.
+     * string encoding - the compression of the files, one of 'none', 'gzip',
+     *     'zstd', 'bzip2' or 'xz'. Compressed file names end with .gz, .zst,
+     *     .bz2 or .xz.
      * </pre>
      * 
      */
@@ -0,0 +1,65 @@
+
+package us.kbase.readsutils;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: ExportReadsBatchOutput</p>
+ * <pre>
+ * Output of the export_reads_batch function.
+ * mapping<read_lib, string> shock_ids - the ID of the Shock node
+ *     holding the zip file of each reads object. With single_archive
+ *     every object maps to the same node.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "shock_ids"
+})
+public class ExportReadsBatchOutput {
+
+    @JsonProperty("shock_ids")
+    private Map<String, String> shockIds;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("shock_ids")
+    public Map<String, String> getShockIds() {
+        return shockIds;
+    }
+
+    @JsonProperty("shock_ids")
+    public void setShockIds(Map<String, String> shockIds) {
+        this.shockIds = shockIds;
+    }
+
+    public ExportReadsBatchOutput withShockIds(Map<String, String> shockIds) {
+        this.shockIds = shockIds;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((("ExportReadsBatchOutput"+" [shockIds=")+ shockIds)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
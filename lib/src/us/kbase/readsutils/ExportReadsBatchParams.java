@@ -0,0 +1,106 @@
+
+package us.kbase.readsutils;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: ExportReadsBatchParams</p>
+ * <pre>
+ * Input for the export_reads_batch function.
+ * list<read_lib> input_refs - the reads objects to export.
+ * boolean single_archive - if true, package all the objects in one zip
+ *     file, each in a directory named after the object. Otherwise each
+ *     object is packaged in its own zip file as by export_reads.
+ *     Defaults to false.
+ * int max_parallel - the maximum number of read libraries to download
+ *     and process at the same time. Defaults to 1.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "input_refs",
+    "single_archive",
+    "max_parallel"
+})
+public class ExportReadsBatchParams {
+
+    @JsonProperty("input_refs")
+    private List<String> inputRefs;
+    @JsonProperty("single_archive")
+    private Long singleArchive;
+    @JsonProperty("max_parallel")
+    private Long maxParallel;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("input_refs")
+    public List<String> getInputRefs() {
+        return inputRefs;
+    }
+
+    @JsonProperty("input_refs")
+    public void setInputRefs(List<String> inputRefs) {
+        this.inputRefs = inputRefs;
+    }
+
+    public ExportReadsBatchParams withInputRefs(List<String> inputRefs) {
+        this.inputRefs = inputRefs;
+        return this;
+    }
+
+    @JsonProperty("single_archive")
+    public Long getSingleArchive() {
+        return singleArchive;
+    }
+
+    @JsonProperty("single_archive")
+    public void setSingleArchive(Long singleArchive) {
+        this.singleArchive = singleArchive;
+    }
+
+    public ExportReadsBatchParams withSingleArchive(Long singleArchive) {
+        this.singleArchive = singleArchive;
+        return this;
+    }
+
+    @JsonProperty("max_parallel")
+    public Long getMaxParallel() {
+        return maxParallel;
+    }
+
+    @JsonProperty("max_parallel")
+    public void setMaxParallel(Long maxParallel) {
+        this.maxParallel = maxParallel;
+    }
+
+    public ExportReadsBatchParams withMaxParallel(Long maxParallel) {
+        this.maxParallel = maxParallel;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((((((("ExportReadsBatchParams"+" [inputRefs=")+ inputRefs)+", singleArchive=")+ singleArchive)+", maxParallel=")+ maxParallel)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -0,0 +1,122 @@
+
+package us.kbase.readsutils;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: FASTQValidationError</p>
+ * <pre>
+ * A problem found in a FASTQ file by the validateFASTQ function.
+ * record - the number of the record at fault, counting from 1.
+ * line - the number of the line at fault, counting from 1.
+ * offset - the byte offset of the start of the line at fault.
+ * error - a description of the problem.
+ * Line numbers and offsets are in the file after blank lines have been
+ * removed.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "record",
+    "line",
+    "offset",
+    "error"
+})
+public class FASTQValidationError {
+
+    @JsonProperty("record")
+    private Long record;
+    @JsonProperty("line")
+    private Long line;
+    @JsonProperty("offset")
+    private Long offset;
+    @JsonProperty("error")
+    private String error;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("record")
+    public Long getRecord() {
+        return record;
+    }
+
+    @JsonProperty("record")
+    public void setRecord(Long record) {
+        this.record = record;
+    }
+
+    public FASTQValidationError withRecord(Long record) {
+        this.record = record;
+        return this;
+    }
+
+    @JsonProperty("line")
+    public Long getLine() {
+        return line;
+    }
+
+    @JsonProperty("line")
+    public void setLine(Long line) {
+        this.line = line;
+    }
+
+    public FASTQValidationError withLine(Long line) {
+        this.line = line;
+        return this;
+    }
+
+    @JsonProperty("offset")
+    public Long getOffset() {
+        return offset;
+    }
+
+    @JsonProperty("offset")
+    public void setOffset(Long offset) {
+        this.offset = offset;
+    }
+
+    public FASTQValidationError withOffset(Long offset) {
+        this.offset = offset;
+        return this;
+    }
+
+    @JsonProperty("error")
+    public String getError() {
+        return error;
+    }
+
+    @JsonProperty("error")
+    public void setError(String error) {
+        this.error = error;
+    }
+
+    public FASTQValidationError withError(String error) {
+        this.error = error;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((((((("FASTQValidationError"+" [record=")+ record)+", line=")+ line)+", offset=")+ offset)+", error=")+ error)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -28,6 +28,9 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  * string otype - the original type of the reads. One of 'single',
  *     'paired', or 'interleaved'.
  * string type - one of 'single', 'paired', or 'interleaved'.
+ * string encoding - the compression of the files, one of 'none', 'gzip',
+ *     'zstd', 'bzip2' or 'xz'. Compressed file names end with .gz, .zst,
+ *     .bz2 or .xz.
  * </pre>
  * 
  */
@@ -39,7 +42,8 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
     "rev",
     "rev_name",
     "otype",
-    "type"
+    "type",
+    "encoding"
 })
 public class ReadsFiles {
 
@@ -55,6 +59,8 @@ public class ReadsFiles {
     private String otype;
     @JsonProperty("type")
     private String type;
+    @JsonProperty("encoding")
+    private String encoding;
     private Map<String, Object> additionalProperties = new HashMap<String, Object>();
 
     @JsonProperty("fwd")
@@ -147,6 +153,21 @@ public class ReadsFiles {
         return this;
     }
 
+    @JsonProperty("encoding")
+    public String getEncoding() {
+        return encoding;
+    }
+
+    @JsonProperty("encoding")
+    public void setEncoding(String encoding) {
+        this.encoding = encoding;
+    }
+
+    public ReadsFiles withEncoding(String encoding) {
+        this.encoding = encoding;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -159,7 +180,7 @@ public class ReadsFiles {
 
     @Override
     public String toString() {
-        return ((((((((((((((("ReadsFiles"+" [fwd=")+ fwd)+", fwdName=")+ fwdName)+", rev=")+ rev)+", revName=")+ revName)+", otype=")+ otype)+", type=")+ type)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((((((((("ReadsFiles"+" [fwd=")+ fwd)+", fwdName=")+ fwdName)+", rev=")+ rev)+", revName=")+ revName)+", otype=")+ otype)+", type=")+ type)+", encoding=")+ encoding)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
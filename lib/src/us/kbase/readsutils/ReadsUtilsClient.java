@@ -200,6 +200,27 @@ public class ReadsUtilsClient {
         return res.get(0);
     }
 
+    /**
+     * <p>Original spec-file function name: upload_reads_batch</p>
+     * <pre>
+     * Loads many sets of reads to KBase data stores. Workspace names are
+     * translated to IDs once, libraries are prepared on up to max_parallel
+     * workers, and the files and objects are saved with a few calls for the
+     * whole batch. A library that fails doesn't stop the others.
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.readsutils.UploadReadsBatchParams UploadReadsBatchParams}
+     * @return   instance of type {@link us.kbase.readsutils.UploadReadsBatchOutput UploadReadsBatchOutput}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public UploadReadsBatchOutput uploadReadsBatch(UploadReadsBatchParams params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        List<Object> args = new ArrayList<Object>();
+        args.add(params);
+        TypeReference<List<UploadReadsBatchOutput>> retType = new TypeReference<List<UploadReadsBatchOutput>>() {};
+        List<UploadReadsBatchOutput> res = caller.jsonrpcCall("ReadsUtils.upload_reads_batch", args, retType, true, true, jsonRpcContext, this.serviceVersion);
+        return res.get(0);
+    }
+
     /**
      * <p>Original spec-file function name: download_reads</p>
      * <pre>
@@ -223,7 +244,8 @@ public class ReadsUtilsClient {
      * <p>Original spec-file function name: export_reads</p>
      * <pre>
      * KBase downloader function. Packages a set of reads into a zip file and
-     * stores the zip in shock.
+     * stores the zip in shock. Reads files are packaged with their
+     * compression in Shock, so they're never uncompressed on the way.
      * </pre>
      * @param   params   instance of type {@link us.kbase.readsutils.ExportParams ExportParams}
      * @return   parameter "output" of type {@link us.kbase.readsutils.ExportOutput ExportOutput}
@@ -238,6 +260,26 @@ public class ReadsUtilsClient {
         return res.get(0);
     }
 
+    /**
+     * <p>Original spec-file function name: export_reads_batch</p>
+     * <pre>
+     * Packages many reads objects as export_reads does, getting the object
+     * information in one workspace call and downloading the Shock nodes of
+     * all the objects at the same time, shared nodes only once.
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.readsutils.ExportReadsBatchParams ExportReadsBatchParams}
+     * @return   parameter "output" of type {@link us.kbase.readsutils.ExportReadsBatchOutput ExportReadsBatchOutput}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public ExportReadsBatchOutput exportReadsBatch(ExportReadsBatchParams params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        List<Object> args = new ArrayList<Object>();
+        args.add(params);
+        TypeReference<List<ExportReadsBatchOutput>> retType = new TypeReference<List<ExportReadsBatchOutput>>() {};
+        List<ExportReadsBatchOutput> res = caller.jsonrpcCall("ReadsUtils.export_reads_batch", args, retType, true, true, jsonRpcContext, this.serviceVersion);
+        return res.get(0);
+    }
+
     public Map<String, Object> status(RpcContext... jsonRpcContext) throws IOException, JsonClientException {
         List<Object> args = new ArrayList<Object>();
         TypeReference<List<Map<String, Object>>> retType = new TypeReference<List<Map<String, Object>>>() {};
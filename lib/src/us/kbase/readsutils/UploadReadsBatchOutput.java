@@ -0,0 +1,64 @@
+
+package us.kbase.readsutils;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: UploadReadsBatchOutput</p>
+ * <pre>
+ * The output of the upload_reads_batch function.
+ * results - the result for each library, in the order of the input.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "results"
+})
+public class UploadReadsBatchOutput {
+
+    @JsonProperty("results")
+    private List<UploadReadsResult> results;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("results")
+    public List<UploadReadsResult> getResults() {
+        return results;
+    }
+
+    @JsonProperty("results")
+    public void setResults(List<UploadReadsResult> results) {
+        this.results = results;
+    }
+
+    public UploadReadsBatchOutput withResults(List<UploadReadsResult> results) {
+        this.results = results;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((("UploadReadsBatchOutput"+" [results=")+ results)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -0,0 +1,85 @@
+
+package us.kbase.readsutils;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: UploadReadsBatchParams</p>
+ * <pre>
+ * Input to the upload_reads_batch function.
+ * list<UploadReadsParams> reads - the reads libraries to upload, each
+ *     with the parameters for upload_reads.
+ * int max_parallel - the maximum number of libraries to download,
+ *     validate and compress at the same time. Defaults to 1.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "reads",
+    "max_parallel"
+})
+public class UploadReadsBatchParams {
+
+    @JsonProperty("reads")
+    private List<UploadReadsParams> reads;
+    @JsonProperty("max_parallel")
+    private Long maxParallel;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("reads")
+    public List<UploadReadsParams> getReads() {
+        return reads;
+    }
+
+    @JsonProperty("reads")
+    public void setReads(List<UploadReadsParams> reads) {
+        this.reads = reads;
+    }
+
+    public UploadReadsBatchParams withReads(List<UploadReadsParams> reads) {
+        this.reads = reads;
+        return this;
+    }
+
+    @JsonProperty("max_parallel")
+    public Long getMaxParallel() {
+        return maxParallel;
+    }
+
+    @JsonProperty("max_parallel")
+    public void setMaxParallel(Long maxParallel) {
+        this.maxParallel = maxParallel;
+    }
+
+    public UploadReadsBatchParams withMaxParallel(Long maxParallel) {
+        this.maxParallel = maxParallel;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((("UploadReadsBatchParams"+" [reads=")+ reads)+", maxParallel=")+ maxParallel)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -17,13 +17,13 @@ import us.kbase.kbasecommon.StrainInfo;
  * <p>Original spec-file type: UploadReadsParams</p>
  * <pre>
  * Input to the upload_reads function.
- * If local files are specified for upload, they must be uncompressed.
- * Files will be gzipped prior to upload.
+ * Local, web and staging files may be uncompressed or compressed with
+ * gzip, bzip2 or xz. Compressed files are read directly, without being
+ * uncompressed to disk first. Files will be gzipped prior to upload.
  * If web files are specified for upload, a download type one of
  * ['Direct Download', 'DropBox', 'FTP', 'Google Drive'] must be specified too. 
- * The downloadable file must be uncompressed (except for FTP, .gz file is acceptable). 
- * If staging files are specified for upload, the staging file must be uncompressed
- * and must be accessible by current user.
+ * If staging files are specified for upload, the staging file must be accessible
+ * by current user.
  * Note that if a reverse read file is specified, it must be a local file
  * if the forward reads file is a local file, or a shock id if not.
  * If a reverse web file or staging file is specified, the reverse file category must match 
@@ -0,0 +1,84 @@
+
+package us.kbase.readsutils;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: UploadReadsResult</p>
+ * <pre>
+ * The result of uploading one reads library with upload_reads_batch.
+ * obj_ref - a reference to the new Workspace object, as for
+ *     upload_reads, if the library was uploaded.
+ * error - the error that stopped the library being uploaded, if it
+ *     failed.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "obj_ref",
+    "error"
+})
+public class UploadReadsResult {
+
+    @JsonProperty("obj_ref")
+    private String objRef;
+    @JsonProperty("error")
+    private String error;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("obj_ref")
+    public String getObjRef() {
+        return objRef;
+    }
+
+    @JsonProperty("obj_ref")
+    public void setObjRef(String objRef) {
+        this.objRef = objRef;
+    }
+
+    public UploadReadsResult withObjRef(String objRef) {
+        this.objRef = objRef;
+        return this;
+    }
+
+    @JsonProperty("error")
+    public String getError() {
+        return error;
+    }
+
+    @JsonProperty("error")
+    public void setError(String error) {
+        this.error = error;
+    }
+
+    public UploadReadsResult withError(String error) {
+        this.error = error;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((("UploadReadsResult"+" [objRef=")+ objRef)+", error=")+ error)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -2,6 +2,7 @@
 package us.kbase.readsutils;
 
 import java.util.HashMap;
+import java.util.List;
 import java.util.Map;
 import javax.annotation.Generated;
 import com.fasterxml.jackson.annotation.JsonAnyGetter;
@@ -16,18 +17,22 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  * <pre>
  * The output of the validateFASTQ function.
  * validated - whether the file validated successfully or not.
+ * errors - the problems found in the file, at most 10, if any.
  * </pre>
  * 
  */
 @JsonInclude(JsonInclude.Include.NON_NULL)
 @Generated("com.googlecode.jsonschema2pojo")
 @JsonPropertyOrder({
-    "validated"
+    "validated",
+    "errors"
 })
 public class ValidateFASTQOutput {
 
     @JsonProperty("validated")
     private Long validated;
+    @JsonProperty("errors")
+    private List<FASTQValidationError> errors;
     private Map<String, Object> additionalProperties = new HashMap<String, Object>();
 
     @JsonProperty("validated")
@@ -45,6 +50,21 @@ public class ValidateFASTQOutput {
         return this;
     }
 
+    @JsonProperty("errors")
+    public List<FASTQValidationError> getErrors() {
+        return errors;
+    }
+
+    @JsonProperty("errors")
+    public void setErrors(List<FASTQValidationError> errors) {
+        this.errors = errors;
+    }
+
+    public ValidateFASTQOutput withErrors(List<FASTQValidationError> errors) {
+        this.errors = errors;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -57,7 +77,7 @@ public class ValidateFASTQOutput {
 
     @Override
     public String toString() {
-        return ((((("ValidateFASTQOutput"+" [validated=")+ validated)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((("ValidateFASTQOutput"+" [validated=")+ validated)+", errors=")+ errors)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
@@ -21,6 +21,13 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  *     Optional parameters:
  *     interleaved - whether the file is interleaved or not. Setting this to
  *         true disables sequence ID checks.
+ *     max_workers - the maximum number of files to validate at the same
+ *         time, each in a separate process. The largest value given for any
+ *         file in the list applies. Default 1.
+ *     split_file - whether to split the file into byte ranges that are
+ *         validated at the same time by the max_workers processes, for
+ *         large files. The result is the same as validating the file
+ *         whole. Default false.
  * </pre>
  * 
  */
@@ -28,7 +35,9 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
 @Generated("com.googlecode.jsonschema2pojo")
 @JsonPropertyOrder({
     "file_path",
-    "interleaved"
+    "interleaved",
+    "max_workers",
+    "split_file"
 })
 public class ValidateFASTQParams {
 
@@ -36,6 +45,10 @@ public class ValidateFASTQParams {
     private String filePath;
     @JsonProperty("interleaved")
     private Long interleaved;
+    @JsonProperty("max_workers")
+    private Long maxWorkers;
+    @JsonProperty("split_file")
+    private Long splitFile;
     private Map<String, Object> additionalProperties = new HashMap<String, Object>();
 
     @JsonProperty("file_path")
@@ -68,6 +81,36 @@ public class ValidateFASTQParams {
         return this;
     }
 
+    @JsonProperty("max_workers")
+    public Long getMaxWorkers() {
+        return maxWorkers;
+    }
+
+    @JsonProperty("max_workers")
+    public void setMaxWorkers(Long maxWorkers) {
+        this.maxWorkers = maxWorkers;
+    }
+
+    public ValidateFASTQParams withMaxWorkers(Long maxWorkers) {
+        this.maxWorkers = maxWorkers;
+        return this;
+    }
+
+    @JsonProperty("split_file")
+    public Long getSplitFile() {
+        return splitFile;
+    }
+
+    @JsonProperty("split_file")
+    public void setSplitFile(Long splitFile) {
+        this.splitFile = splitFile;
+    }
+
+    public ValidateFASTQParams withSplitFile(Long splitFile) {
+        this.splitFile = splitFile;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -80,7 +123,7 @@ public class ValidateFASTQParams {
 
     @Override
     public String toString() {
-        return ((((((("ValidateFASTQParams"+" [filePath=")+ filePath)+", interleaved=")+ interleaved)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((("ValidateFASTQParams"+" [filePath=")+ filePath)+", interleaved=")+ interleaved)+", maxWorkers=")+ maxWorkers)+", splitFile=")+ splitFile)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
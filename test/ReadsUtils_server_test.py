@@ -1,24 +1,34 @@
+import bz2
+import gzip
 import hashlib
 import inspect
+import multiprocessing
 import os
 import shutil
+import socket
+import struct
 import subprocess
 import tempfile
+import threading
 import time
 import unittest
 import re
 from os import environ
 from pprint import pprint
-from zipfile import ZipFile
+from zipfile import ZipFile, ZIP_STORED
 import ftplib
 from mock import patch
 
 import requests
 from biokbase.AbstractHandle.Client import AbstractHandle as HandleService  # @UnresolvedImport
+import DataFileUtil.baseclient as dfu_baseclient
 from DataFileUtil.baseclient import ServerError as DFUError
 from DataFileUtil.DataFileUtilClient import DataFileUtil
-from ReadsUtils.ReadsUtilsImpl import ReadsUtils
+from ReadsUtils.ReadsUtilsImpl import (
+    ReadsUtils, ClientRegistry, DownloadCache, ParallelGzipWriter,
+    WorkspaceIDCache, fastq_record_start, open_reads_file, lzma)
 from ReadsUtils.ReadsUtilsServer import MethodContext
+import ReadsUtils.baseclient as ru_baseclient
 from Workspace.baseclient import ServerError as WorkspaceError
 from Workspace.WorkspaceClient import Workspace
 from ReadsUtils.authclient import KBaseAuth as _KBaseAuth
@@ -516,8 +526,8 @@ class ReadsUtilsTest(unittest.TestCase):
     def make_ref(self, objinfo):
         return str(objinfo[6]) + '/' + str(objinfo[0]) + '/' + str(objinfo[4])
 
-    def md5(self, filename):
-        with open(filename, 'rb') as file_:
+    def md5(self, filename, open_=open):
+        with open_(filename, 'rb') as file_:
             hash_md5 = hashlib.md5()
             buf = file_.read(65536)
             while len(buf) > 0:
@@ -581,6 +591,41 @@ class ReadsUtilsTest(unittest.TestCase):
         self.check_FASTA('data/sample.fasta', 1)
         self.check_FASTA('data/sample_missing_data.fa', 0)
 
+    def test_FASTA_validation_multiple(self):
+        out = self.impl.validateFASTA(
+            self.ctx, [{'file_path': 'data/sample.fa'},
+                       {'file_path': 'data/sample_missing_data.fa'},
+                       {'file_path': 'data/sample.fna',
+                        'alphabet': 'protein'}])[0]
+        self.assertEqual(out, [
+            {'valid': 1, 'errors': []},
+            {'valid': 0, 'errors': [
+                {'record': 2, 'line': 6, 'offset': 295,
+                 'error': 'The record has no sequence'}]},
+            {'valid': 1, 'errors': []}])
+
+    def test_FASTA_validation_errors(self):
+        f = os.path.join(self.scratch, 'bad.fa')
+        with open(f, 'w') as fh:
+            fh.write('ACGT\n>\nACGT\n>x\nACGTQ\n>y\n\n>z desc\nAC\r\nGT')
+        self.assertEqual(self.impl.validateFASTA(
+            self.ctx, {'file_path': f})[0]['errors'], [
+            {'record': 1, 'line': 1, 'offset': 0,
+             'error': 'The first line does not start with >'},
+            {'record': 2, 'line': 2, 'offset': 5,
+             'error': 'No sequence identifier on the header line'},
+            {'record': 3, 'line': 5, 'offset': 15,
+             'error': "Invalid character ('Q') in the sequence"},
+            {'record': 4, 'line': 6, 'offset': 21,
+             'error': 'The record has no sequence'}])
+        f = os.path.join(self.scratch, 'protein.fa')
+        with open(f, 'w') as fh:
+            fh.write('>p1\nMKVLAAGIVX*\n')
+        self.check_FASTA(f, 0)
+        self.assertEqual(self.impl.validateFASTA(
+            self.ctx, {'file_path': f, 'alphabet': 'protein'})[0]['valid'],
+            1)
+
     def fail_val_FASTA(self, filename, error, exception=ValueError):
         with self.assertRaises(exception) as context:
             self.impl.validateFASTA(self.ctx, {'file_path': filename})
@@ -600,6 +645,13 @@ class ReadsUtilsTest(unittest.TestCase):
         self.fail_val_FASTA('data/sample.txt',
                             'File data/sample.txt is not a FASTA file')
 
+    def test_FASTA_val_fail_bad_alphabet(self):
+        with self.assertRaises(ValueError) as context:
+            self.impl.validateFASTA(self.ctx, {'file_path': 'data/sample.fa',
+                                               'alphabet': 'rna'})
+        self.assertEqual('alphabet must be one of dna, protein',
+                         str(context.exception.message))
+
     def test_FASTQ_validation(self):
         self.check_fq('data/Sample1.fastq', 0, 1)
         self.check_fq('data/Sample2_interleaved_illumina.fnq', 1, 1)
@@ -634,7 +686,173 @@ class ReadsUtilsTest(unittest.TestCase):
                         'interleaved': 1},
                        {'file_path': nfn3,
                         'interleaved': 0}
-                       ])[0], [{'validated': 1}, {'validated': 1}, {'validated': 1}])
+                       ])[0], [{'validated': 1, 'errors': []},
+                               {'validated': 1, 'errors': []},
+                               {'validated': 1, 'errors': []}])
+
+    def test_FASTQ_multiple_workers(self):
+        files = [('data/Sample1.fastq', 0, 1),
+                 ('data/Sample2_interleaved_illumina.fnq', 0, 0),
+                 ('data/Sample5_interleaved_blank_lines.fastq', 1, 1),
+                 ('data/Sample1_invalid.fastq', 0, 0),
+                 ('data/small.forward.fq', 0, 1)]
+        params = []
+        for filepath, interleaved, _ in files:
+            newfn = os.path.join(self.scratch, 'workers_' +
+                                 os.path.basename(filepath))
+            shutil.copyfile(filepath, newfn)
+            params.append({'file_path': newfn, 'interleaved': interleaved,
+                           'max_workers': 3})
+        out = self.impl.validateFASTQ(self.ctx, params)[0]
+        self.assertEqual([o['validated'] for o in out],
+                         [ok for _, _, ok in files])
+        self.assertEqual(out[3]['errors'][0]['record'], 9)
+        self.assertEqual(self.md5(params[2]['file_path']),
+                         self.md5('data/Sample5_interleaved.fastq'))
+
+    def test_FASTQ_split_file(self):
+        impl = ReadsUtils(self.cfg)
+        impl.READ_BLOCK_SIZE = 64
+        files = [('data/Sample1.fastq', 0, 1),
+                 ('data/Sample3_interleaved_casava1.8.fq', 1, 1),
+                 ('data/Sample5_interleaved.fastq', 0, 0),
+                 ('data/Sample5_interleaved_blank_lines.fastq', 1, 1),
+                 ('data/Sample1_invalid.fastq', 0, 0),
+                 ('data/Sample5_interleaved_missing_line.fastq', 1, 0)]
+        for filepath, interleaved, ok in files:
+            newfn = os.path.join(self.scratch, 'split_' +
+                                 os.path.basename(filepath))
+            shutil.copyfile(filepath, newfn)
+            out = impl.validateFASTQ(self.ctx, [{
+                'file_path': newfn, 'interleaved': interleaved,
+                'max_workers': 4, 'split_file': 1}])[0][0]
+            self.assertEqual(out['validated'], ok)
+            split_md5 = self.md5(newfn)
+            shutil.copyfile(filepath, newfn)
+            self.assertEqual(out, self.impl.validateFASTQ(self.ctx, [{
+                'file_path': newfn, 'interleaved': interleaved}])[0][0])
+            self.assertEqual(split_md5, self.md5(newfn))
+
+    def test_FASTQ_split_file_repeated_id(self):
+        impl = ReadsUtils(self.cfg)
+        impl.READ_BLOCK_SIZE = 64
+        newfn = os.path.join(self.scratch, 'split_repeated_id.fastq')
+        # the first and last records share an identifier, several ranges
+        # apart
+        with open(newfn, 'w') as fh:
+            for i in list(range(20)) + [0]:
+                fh.write('@r{0}\nACGTACGTAC\n+\nIIIIIIIIII\n'.format(i))
+        self.assertGreater(len(impl._fastq_ranges(newfn, 4)), 3)
+        with patch.object(multiprocessing, 'cpu_count', return_value=4):
+            out = impl.validateFASTQ(self.ctx, [{
+                'file_path': newfn, 'max_workers': 4,
+                'split_file': 1}])[0][0]
+        self.assertEqual(out['validated'], 0)
+        self.assertEqual(out['errors'][0]['record'], 21)
+        self.assertEqual(out['errors'][0]['error'],
+                         'Repeated sequence identifier: r0')
+        self.assertEqual(out, self.impl.validateFASTQ(self.ctx, [{
+            'file_path': newfn}])[0][0])
+
+    def test_FASTQ_split_file_repeated_id_blank_lines(self):
+        impl = ReadsUtils(self.cfg)
+        impl.READ_BLOCK_SIZE = 64
+        newfn = os.path.join(self.scratch, 'split_repeated_id_blank.fastq')
+        data = ''.join('@r{0}\nACGTACGTAC\n+\nIIIIIIIIII\n{1}'.format(
+            i, '\n' if i % 7 == 3 else '') for i in [0, 1, 2, 3, 4, 5] +
+            list(range(6, 30)) + [12, 5, 30])
+        with open(newfn, 'w') as fh:
+            fh.write(data)
+        with patch.object(multiprocessing, 'cpu_count', return_value=4):
+            out = impl.validateFASTQ(self.ctx, [{
+                'file_path': newfn, 'max_workers': 4,
+                'split_file': 1}])[0][0]
+        self.assertEqual([(e['record'], e['error']) for e in out['errors']],
+                         [(31, 'Repeated sequence identifier: r12'),
+                          (32, 'Repeated sequence identifier: r5')])
+        # offsets are in the file without the blank lines
+        cleaned = data.replace('\n\n', '\n')
+        self.assertEqual(out['errors'][0]['offset'], cleaned.rindex('@r12\n'))
+        with open(newfn) as fh:
+            self.assertEqual(fh.read(), cleaned)
+
+    def test_fastq_record_start(self):
+        # quality lines starting with @ are not record starts
+        f = os.path.join(self.scratch, 'record_start.fastq')
+        with open(f, 'w') as fh:
+            fh.write('@r1\nACGTACGTAC\n+\n@@@@@@@@@@\n' +
+                     '@r2\nACGTACGTAC\n+r2\n+IIIIIIIII\n' +
+                     '@r3\nACGTACGTAC\n+\n@IIIIIIIII\n')
+        self.assertEqual(fastq_record_start(f, 0, 7), 0)
+        self.assertEqual(fastq_record_start(f, 1, 7), 28)
+        self.assertEqual(fastq_record_start(f, 16, 7), 28)
+        self.assertEqual(fastq_record_start(f, 30, 7), 58)
+        self.assertEqual(fastq_record_start(f, 59, 7), 86)
+        self.assertEqual(fastq_record_start(f, 75, 7), 86)
+
+    def test_FASTQ_val_fail_bad_split_file(self):
+        self.fail_val_FASTQ(
+            [{'file_path': 'data/Sample1.fastq', 'split_file': 2}],
+            'split_file must be 0 or 1')
+
+    def test_FASTQ_val_fail_bad_max_workers(self):
+        for workers in [0, -1, 1.5, 'foo', True]:
+            self.fail_val_FASTQ(
+                [{'file_path': 'data/Sample1.fastq', 'max_workers': workers}],
+                'max_workers must be an integer > 0')
+
+    def test_FASTQ_validation_errors(self):
+        def errors(filepath, interleaved):
+            newfn = os.path.join(self.scratch, os.path.basename(filepath))
+            shutil.copyfile(filepath, newfn)
+            ret = self.impl.validateFASTQ(
+                self.ctx, [{'file_path': newfn,
+                            'interleaved': interleaved}])[0][0]
+            self.assertEqual(ret['validated'], 0)
+            return ret['errors']
+
+        self.assertEqual(errors('data/Sample1_invalid.fastq', 0), [
+            {'record': 9, 'line': 33, 'offset': 1536,
+             'error': 'The sequence identifier line does not start with @'}])
+        self.assertEqual(errors(
+            'data/Sample5_interleaved_missing_line.fastq', 1), [
+            {'record': 3, 'line': 11, 'offset': 1420,
+             'error': 'The line after the sequence does not start with +'},
+            {'record': 4, 'line': 13, 'offset': 1724,
+             'error': 'Incomplete record, expected 4 lines, got 3'}])
+        errs = errors('data/Sample2_interleaved_illumina.fnq', 0)
+        self.assertEqual(len(errs), 10)
+        self.assertEqual(errs[0], {
+            'record': 51, 'line': 201, 'offset': 10094,
+            'error': 'Repeated sequence identifier: SRR072980.1'})
+
+        bad = os.path.join(self.scratch, 'bad_chars.fastq')
+        with open(bad, 'w') as f:
+            f.write('@r1\nACGTACGTAC\n+r1\nIIIIIIIIII\n' +
+                    '@r2\nACGTXCGTAC\n+\nIIIIIIIIII\n' +
+                    '@r3\nACGTACGTAC\n+r2\nIIIIIIIIII\n' +
+                    '@r4\nACGTACGTAC\n+\nIIIIIIIII \n' +
+                    '@r5\nACGTACGTAC\n+\nIIIIIIIII\n' +
+                    '@r6\nACGTAC\n+\nIIIIII\n')
+        self.assertEqual([(e['record'], e['line'], e['error'])
+                          for e in errors(bad, 0)], [
+            (2, 6, "Invalid character ('X') in the sequence"),
+            (3, 11, 'The sequence identifier on the + line does not ' +
+                    'match the one on the @ line'),
+            (4, 16, "Invalid character (' ') in the quality string"),
+            (5, 20, 'The quality string length, 9, does not equal the ' +
+                    'sequence length, 10'),
+            (6, 22, 'The sequence is shorter than the minimum read ' +
+                    'length of 10')])
+
+    def test_FASTQ_validation_removes_blank_lines(self):
+        newfn = os.path.join(self.scratch, 'blank_lines.fastq')
+        shutil.copyfile('data/Sample5_interleaved_blank_lines.fastq', newfn)
+        self.assertEqual(self.impl.validateFASTQ(
+            self.ctx, [{'file_path': newfn,
+                        'interleaved': 1}])[0][0]['validated'], 1)
+        self.assertEqual(self.md5(newfn),
+                         self.md5('data/Sample5_interleaved.fastq'))
 
     def check_fq(self, filepath, interleaved, ok):
         fn = os.path.basename(filepath)
@@ -704,6 +922,51 @@ class ReadsUtilsTest(unittest.TestCase):
         node = d['lib']['file']['id']
         self.delete_shock_node(node)
 
+    def test_compressed_reads_files(self):
+        with open('data/Sample1.fastq', 'rb') as f:
+            data = f.read()
+        gzfile = os.path.join(self.scratch, 'Sample1.fastq.gz')
+        shutil.copy('data/Sample1.fastq.gz', gzfile)
+        # the compression is found from the file contents, not the name
+        bzfile = os.path.join(self.scratch, 'Sample1.fastq')
+        with open(bzfile, 'wb') as f:
+            f.write(bz2.compress(data[:3000]) + bz2.compress(data[3000:]))
+        xzdir = tempfile.mkdtemp(dir=self.scratch)
+        xzfile = os.path.join(xzdir, 'Sample1.fastq.xz')
+        with open(xzfile, 'wb') as f:
+            f.write(lzma.compress(data))
+        for target in [gzfile, bzfile, xzfile]:
+            ref = self.impl.upload_reads(
+                self.ctx, {'fwd_file': target,
+                           'sequencing_tech': 'seqtech',
+                           'wsname': self.ws_info[1],
+                           'name': 'compressedreads'})
+            obj = self.dfu.get_objects(
+                {'object_refs': [ref[0]['obj_ref']]})['data'][0]
+            d = obj['data']
+            self.assertEqual(d['read_count'], 50)
+            self.check_lib(d['lib'], 2966, 'Sample1.fastq.gz',
+                           'f118ee769a5e1b40ec44629994dfc3cd')
+            self.delete_shock_node(d['lib']['file']['id'])
+
+        fwd = os.path.join(self.scratch, 'small.forward.fq.gz')
+        with gzip.open(fwd, 'wb') as f, open('data/small.forward.fq') as i:
+            f.write(i.read())
+        rev = os.path.join(self.scratch, 'small.reverse.fq.bz2')
+        with open(rev, 'wb') as f, open('data/small.reverse.fq') as i:
+            f.write(bz2.compress(i.read()))
+        ref = self.impl.upload_reads(
+            self.ctx, {'fwd_file': fwd,
+                       'rev_file': rev,
+                       'sequencing_tech': 'seqtech',
+                       'wsname': self.ws_info[1],
+                       'name': 'compressedpairs',
+                       'interleaved': 0})
+        d = self.dfu.get_objects(
+            {'object_refs': [ref[0]['obj_ref']]})['data'][0]['data']
+        self.assertEqual(d['read_count'], 25000)
+        self.delete_shock_node(d['lib1']['file']['id'])
+
     def test_single_end_reads_metagenome_objid(self):
         # single genome = 0, test saving to an object id
         ret = self.upload_file_to_shock('data/Sample5_noninterleaved.1.fastq')
@@ -1200,6 +1463,103 @@ class ReadsUtilsTest(unittest.TestCase):
                 self.ws_info[0], self.ws_info[1]),
             exception=DFUError)
 
+    def test_upload_reads_batch(self):
+        fwdtf = 'small.forward.fq'
+        revtf = 'small.reverse.fq'
+        fwdtarget = os.path.join(self.scratch, fwdtf)
+        revtarget = os.path.join(self.scratch, revtf)
+        shutil.copy('data/' + fwdtf, fwdtarget)
+        shutil.copy('data/' + revtf, revtarget)
+
+        results = self.impl.upload_reads_batch(
+            self.ctx, {'reads': [
+                {'fwd_file': fwdtarget,
+                 'rev_file': revtarget,
+                 'sequencing_tech': 'seqtech-pr1',
+                 'wsname': self.ws_info[1],
+                 'name': 'batchpaired'},
+                {'fwd_file': fwdtarget,
+                 'wsname': self.ws_info[1],
+                 'name': 'batchnotech'},
+                {'fwd_file': fwdtarget,
+                 'sequencing_tech': 'seqtech',
+                 'wsname': self.ws_info[1],
+                 'name': 'batchsingle'}],
+                'max_parallel': 2})[0]['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual(
+            results[1], {'error': 'The sequencing technology must be provided'})
+        for res, name, kbtype in [
+                (results[0], 'batchpaired', 'KBaseFile.PairedEndLibrary'),
+                (results[2], 'batchsingle', 'KBaseFile.SingleEndLibrary')]:
+            obj = self.dfu.get_objects(
+                {'object_refs': [self.ws_info[1] + '/' + name]})['data'][0]
+            self.assertEqual(res, {'obj_ref': self.make_ref(obj['info'])})
+            self.assertEqual(obj['info'][2].startswith(kbtype), True)
+        d = self.dfu.get_objects(
+            {'object_refs': [self.ws_info[1] + '/batchsingle']}
+        )['data'][0]['data']
+        self.assertEqual(d['lib']['file']['file_name'], 'small.forward.fq.gz')
+        self.assertEqual(d['sequencing_tech'], 'seqtech')
+
+    def test_upload_reads_batch_bad_entries(self):
+        fwdtarget = os.path.join(self.scratch, 'batchbad.fq')
+        shutil.copy('data/small.forward.fq', fwdtarget)
+
+        results = self.impl.upload_reads_batch(
+            self.ctx, {'reads': [
+                'small.forward.fq',
+                {'fwd_file': fwdtarget,
+                 'sequencing_tech': 'seqtech',
+                 'name': 'batchnows'},
+                {'sequencing_tech': 'seqtech',
+                 'wsname': self.ws_info[1],
+                 'name': 'batchnofile'},
+                {'fwd_file': fwdtarget,
+                 'sequencing_tech': 'seqtech',
+                 'wsname': self.ws_info[1],
+                 'name': 'batchgood'}]})[0]['results']
+        self.assertEqual(results[:3], [
+            {'error': 'Each reads library must be a mapping, not str'},
+            {'error': 'Exactly one of the workspace ID or name must be ' +
+                      'provided'},
+            {'error': 'Exactly one of a file, shock id, staging file name ' +
+                      'or file url containing a forwards reads file must ' +
+                      'be specified'}])
+        obj = self.dfu.get_objects(
+            {'object_refs': [self.ws_info[1] + '/batchgood']})['data'][0]
+        self.assertEqual(results[3], {'obj_ref': self.make_ref(obj['info'])})
+
+    def test_upload_reads_batch_shock_same_file_name(self):
+        # Shock files are named after their nodes, so nodes with the same
+        # file name must not share a download path
+        nodes = []
+        for source in ['data/Sample1.fastq', 'data/small.forward.fq']:
+            target = os.path.join(tempfile.mkdtemp(dir=self.scratch),
+                                  'reads.fastq')
+            shutil.copy(source, target)
+            node = self.upload_file_to_shock(target)
+            self.nodes_to_delete.append(node['id'])
+            nodes.append(node['id'])
+
+        results = self.impl.upload_reads_batch(
+            self.ctx, {'reads': [
+                {'fwd_id': nodes[0],
+                 'sequencing_tech': 'seqtech',
+                 'wsname': self.ws_info[1],
+                 'name': 'batchshock1'},
+                {'fwd_id': nodes[1],
+                 'sequencing_tech': 'seqtech',
+                 'wsname': self.ws_info[1],
+                 'name': 'batchshock2'}],
+                'max_parallel': 2})[0]['results']
+        for res, count in zip(results, [50, 12500]):
+            d = self.dfu.get_objects(
+                {'object_refs': [res['obj_ref']]})['data'][0]['data']
+            self.assertEqual(d['read_count'], count)
+            self.assertEqual(d['lib']['file']['file_name'], 'reads.fastq.gz')
+            self.delete_shock_node(d['lib']['file']['id'])
+
     def check_lib(self, lib, size, filename, md5):
         shock_id = lib["file"]["id"]
         print "LIB: {}".format(str(lib))
@@ -1470,13 +1830,13 @@ class ReadsUtilsTest(unittest.TestCase):
     def test_upload_fail_bad_fastq(self):
         print('*** upload_fail_bad_fastq ***')
         ret = self.upload_file_to_shock('data/Sample1_invalid.fastq')
-        self.fail_upload_reads(
+        self.fail_upload_reads_regex(
             {'sequencing_tech': 'tech',
              'wsname': self.ws_info[1],
              'fwd_id': ret['id'],
              'name': 'bar'
              },
-            'Invalid FASTQ file - Path: /kb/module/work/tmp/fwd/Sample1_invalid.fastq. ' +
+            'Invalid FASTQ file - Path: /kb/module/work/tmp/(.*)/fwd/Sample1_invalid.fastq. ' +
             'Input Shock ID : ' + ret['id'] +
             '. File Name : Sample1_invalid.fastq.')
         self.delete_shock_node(ret['id'])
@@ -1523,7 +1883,8 @@ class ReadsUtilsTest(unittest.TestCase):
                 'rev_staging_file_name': 'Sample1_invalid.fastq',
                 'name': 'bar'
                 },
-                'Invalid FASTQ file - Path: /kb/module/work/tmp/(.*).inter.fastq. ' +
+                'Invalid FASTQ file - Path: /kb/module/work/tmp/Sample1_invalid.fastq, ' +
+                'record 9, line 33. ' +
                 'Input Staging files - FWD Staging file : Sample1_invalid.fastq, ' +
                 'REV Staging file : Sample1_invalid.fastq. ' +
                 'FWD Path : /kb/module/work/tmp/Sample1_invalid.fastq. ' +
@@ -1570,7 +1931,8 @@ class ReadsUtilsTest(unittest.TestCase):
              'download_type': 'DropBox',
              'name': 'bar'
              },
-            'Invalid FASTQ file - Path: /kb/module/work/tmp/(.*).inter.fastq. ' +
+            'Invalid FASTQ file - Path: /kb/module/work/tmp/(.*)/Sample1_invalid.fastq, ' +
+            'record 9, line 33. ' +
             'Input URLs - ' +
             'FWD URL : https://www.dropbox.com/s/0qndz66qopp5kyt/Sample1_invalid.fastq, ' +
             'REV URL : https://www.dropbox.com/s/whw8ho6ipwv3gpl/Sample_rev.fq. ' +
@@ -1586,10 +1948,24 @@ class ReadsUtilsTest(unittest.TestCase):
              'rev_file': 'data/Sample_rev.fq',
              'name': 'bar'
              },
-            'Invalid FASTQ file - Path: /kb/module/work/tmp/(.*).inter.fastq. ' +
+            'Invalid FASTQ file - Path: /kb/module/test/data/Sample1_invalid.fastq, ' +
+            'record 9, line 33. ' +
             'Input Files Paths - FWD Path : /kb/module/test/data/Sample1_invalid.fastq, ' +
             'REV Path : /kb/module/test/data/Sample_rev.fq.')
 
+    def test_upload_fail_paired_bad_fastq_file_cleanup(self):
+        # the partly written upload file is removed
+        scratch = tempfile.mkdtemp(dir=self.scratch)
+        impl = ReadsUtils(dictmerge(self.cfg, {'scratch': scratch}))
+        with self.assertRaises(ValueError):
+            impl.upload_reads(self.ctx, {
+                'sequencing_tech': 'tech',
+                'wsname': self.ws_info[1],
+                'fwd_file': 'data/Sample_rev.fq',
+                'rev_file': 'data/Sample1_invalid.fastq',
+                'name': 'bar'})
+        self.assertEqual(os.listdir(scratch), [])
+
     def test_upload_fail_paired_bad_fastq(self):
         print('*** upload_fail_bad_fastq ***')
         ret1 = self.upload_file_to_shock('data/Sample1_invalid.fastq')
@@ -1601,13 +1977,14 @@ class ReadsUtilsTest(unittest.TestCase):
              'rev_id': ret2['id'],
              'name': 'bar'
              },
-            ('Invalid FASTQ file - Path: /kb/module/work/tmp/(.*).inter.fastq. ' +
+            ('Invalid FASTQ file - Path: /kb/module/work/tmp/(.*)/fwd/Sample1_invalid.fastq, ' +
+             'record 9, line 33. ' +
              'Input Shock IDs - FWD Shock ID : {}, ' +
              'REV Shock ID : {}. ' +
              'FWD File Name : Sample1_invalid.fastq. ' +
              'REV File Name : Sample_rev.fq. ' +
-             'FWD Path : /kb/module/work/tmp/fwd/Sample1_invalid.fastq. ' +
-             'REV Path : /kb/module/work/tmp/rev/Sample_rev.fq.').format(
+             'FWD Path : /kb/module/work/tmp/(.*)/fwd/Sample1_invalid.fastq. ' +
+             'REV Path : /kb/module/work/tmp/(.*)/rev/Sample_rev.fq.').format(
                 ret1['id'],
                 ret2['id']))
         self.delete_shock_node(ret1['id'])
@@ -1615,13 +1992,13 @@ class ReadsUtilsTest(unittest.TestCase):
 
     def test_upload_fail_interleaved_for_single(self):
         ret = self.upload_file_to_shock('data/Sample5_interleaved.fastq')
-        self.fail_upload_reads(
+        self.fail_upload_reads_regex(
             {'sequencing_tech': 'tech',
              'wsname': self.ws_info[1],
              'fwd_id': ret['id'],
              'name': 'bar'
              },
-            'Invalid FASTQ file - Path: /kb/module/work/tmp/fwd/Sample5_interleaved.fastq. ' +
+            'Invalid FASTQ file - Path: /kb/module/work/tmp/(.*)/fwd/Sample5_interleaved.fastq. ' +
             'Input Shock ID : ' + ret['id'] +
             '. File Name : Sample5_interleaved.fastq.')
         self.delete_shock_node(ret['id'])
@@ -1822,6 +2199,214 @@ class ReadsUtilsTest(unittest.TestCase):
             }
         )
 
+    def test_multiple_parallel(self):
+        self.download_success(
+            {'frbasic': {
+                'md5': {'fwd': self.MD5_SM_F, 'rev': self.MD5_SM_R},
+                'fileext': {'fwd': 'fwd', 'rev': 'rev'},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_P,
+                    {'files': {'type': 'paired',
+                               'otype': 'paired',
+                               'fwd_name': 'small.forward.fq',
+                               'rev_name': 'small.reverse.fq'
+                               },
+                     'ref': self.staged['frbasic']['ref']
+                     })
+            },
+                'intbasic': {
+                'md5': {'fwd': self.MD5_SM_I},
+                'fileext': {'fwd': 'inter'},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_P,
+                    {'files': {'type': 'interleaved',
+                               'otype': 'interleaved',
+                               'fwd_name': 'interleaved.fq',
+                               'rev_name': None,
+                               'rev': None
+                               },
+                     'ref': self.staged['intbasic']['ref']
+                     })
+            },
+                'single_end': {
+                'md5': {'fwd': self.MD5_SM_F},
+                'fileext': {'fwd': 'single'},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_S,
+                    {'files': {'type': 'single',
+                               'otype': 'single',
+                               'fwd_name': 'small.forward.fq',
+                               'rev_name': None,
+                               'rev': None
+                               },
+                     'ref': self.staged['single_end']['ref']
+                     })
+            }
+            }, max_parallel=3
+        )
+
+    def test_multiple_parallel_processes(self):
+        # conversions run in worker processes, not threads of this one
+        impl = ReadsUtils(self.cfg)
+        process_reads = impl.process_reads
+
+        def record_pid(*args):
+            ret = process_reads(*args)
+            ret['pid'] = os.getpid()
+            return ret
+        refs = [self.getWsName() + '/' + f for f in ['frbasic', 'intbasic']]
+        with patch.object(impl, 'process_reads', record_pid):
+            ret = impl.download_reads(self.ctx, {
+                'read_libraries': refs, 'interleaved': 'false',
+                'max_parallel': 2})[0]['files']
+        self.assertNotIn(os.getpid(), [ret[r]['pid'] for r in refs])
+        self.assertEqual(self.md5(ret[refs[1]]['files']['fwd']),
+                         self.MD5_I_TO_F)
+
+    def test_download_cache(self):
+        # the second download is served from the cache
+        for _ in range(2):
+            self.download_success(
+                {'frbasic': {
+                    'md5': {'fwd': self.MD5_FR_TO_I},
+                    'fileext': {'fwd': 'inter'},
+                    'obj': dictmerge(
+                        self.STD_OBJ_KBF_P,
+                        {'files': {'type': 'interleaved',
+                                   'otype': 'paired',
+                                   'fwd_name': 'small.forward.fq',
+                                   'rev_name': 'small.reverse.fq',
+                                   'rev': None
+                                   },
+                         'ref': self.staged['frbasic']['ref']
+                         })
+                }
+                }, interleave='true', use_cache=1
+            )
+
+    def test_download_cache_evicted_during_get(self):
+        tempdir = tempfile.mkdtemp(dir=self.scratch)
+        cache = DownloadCache(os.path.join(tempdir, 'cache'), 10 ** 9)
+        files = {}
+        for k, source in [('fwd', 'small.forward.fq'),
+                          ('rev', 'small.reverse.fq')]:
+            files[k] = os.path.join(tempdir, k + '.fastq')
+            shutil.copy('data/' + source, files[k])
+        key = DownloadCache.key(['fwdnode', 'revnode'], 'uncompress', None)
+        cache.put(key, files)
+        # the rev file goes after the fwd file is linked
+        os.remove(os.path.join(tempdir, 'cache', key, 'rev.fastq'))
+        target = tempfile.mkdtemp(dir=self.scratch)
+        self.assertIsNone(cache.get(key, target))
+        self.assertEqual(os.listdir(target), [])
+        self.assertEqual(cache.misses, 1)
+
+    def test_download_cache_put_leaves_files_writable(self):
+        tempdir = tempfile.mkdtemp(dir=self.scratch)
+        cache = DownloadCache(os.path.join(tempdir, 'cache'), 10 ** 9)
+        fwd = os.path.join(tempdir, 'fwd.fastq')
+        shutil.copy('data/small.forward.fq', fwd)
+        key = DownloadCache.key(['fwdnode'], 'uncompress', None)
+        mode = os.stat(fwd).st_mode
+        cache.put(key, {'fwd': fwd, 'rev': None})
+        # the caller can still rewrite its file in place
+        self.assertEqual(os.stat(fwd).st_mode, mode)
+        with open(fwd, 'w') as f:
+            f.write('rewritten')
+        target = tempfile.mkdtemp(dir=self.scratch)
+        cached = cache.get(key, target)['fwd']
+        self.assertFalse(os.path.samefile(fwd, cached))
+        self.assertEqual(self.md5(cached), self.md5('data/small.forward.fq'))
+        self.assertEqual(os.stat(cached).st_mode & 0o777, 0o444)
+
+    def test_download_gzip(self):
+        # gzipped Shock files that need no interleaving are passed through
+        self.download_success(
+            {'frbasic': {
+                'md5': {'fwd': self.MD5_FR_TO_I},
+                'fileext': {'fwd': 'inter'},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_P,
+                    {'files': {'type': 'interleaved',
+                               'otype': 'paired',
+                               'fwd_name': 'small.forward.fq',
+                               'rev_name': 'small.reverse.fq',
+                               'rev': None
+                               },
+                     'ref': self.staged['frbasic']['ref']
+                     })
+            },
+                'intbasic_kbassy_gz': {
+                'md5': {'fwd': self.MD5_SM_I},
+                'fileext': {'fwd': 'inter'},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBA,
+                    {'files': {'type': 'interleaved',
+                               'otype': 'interleaved',
+                               'fwd_name': 'interleaved.fq.gz',
+                               'rev_name': None,
+                               'rev': None
+                               },
+                     'ref': self.staged['intbasic_kbassy_gz']['ref']
+                     })
+            }
+            }, interleave='true', compression='gzip'
+        )
+
+    def test_download_gzip_fast_deinterleave(self):
+        self.download_success(
+            {'intbasic': {
+                'md5': {'fwd': self.MD5_I_TO_F, 'rev': self.MD5_I_TO_R},
+                'fileext': {'fwd': 'fwd', 'rev': 'rev'},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_P,
+                    {'files': {'type': 'paired',
+                               'otype': 'interleaved',
+                               'fwd_name': 'interleaved.fq',
+                               'rev_name': None
+                               },
+                     'ref': self.staged['intbasic']['ref']
+                     })
+            }
+            }, interleave='false', compression='gzip-fast'
+        )
+
+    def test_download_native(self):
+        # files are provided as stored, gzipped or not
+        self.download_success(
+            {'single_end': {
+                'md5': {'fwd': self.MD5_SM_F},
+                'fileext': {'fwd': 'single'},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_S,
+                    {'files': {'type': 'single',
+                               'otype': 'single',
+                               'fwd_name': 'small.forward.fq',
+                               'rev_name': None,
+                               'rev': None,
+                               'encoding': 'none'
+                               },
+                     'ref': self.staged['single_end']['ref']
+                     })
+            },
+                'single_end_gz': {
+                'md5': {'fwd': self.MD5_SM_F},
+                'fileext': {'fwd': 'single'},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_S,
+                    {'files': {'type': 'single',
+                               'otype': 'single',
+                               'fwd_name': 'small.forward.fq.gz',
+                               'rev_name': None,
+                               'rev': None,
+                               'encoding': 'gzip'
+                               },
+                     'ref': self.staged['single_end_gz']['ref']
+                     })
+            }
+            }, compression='native'
+        )
+
     def test_single_end(self):
         self.download_success(
             {'single_end': {
@@ -2602,6 +3187,17 @@ class ReadsUtilsTest(unittest.TestCase):
                 self.staged['bad_file_type']['ref'],
                 self.staged['bad_file_type']['fwd_node_id']))
 
+    def test_bad_file_type_multiple(self):
+        # file names are checked for all the libraries before downloading
+        self.download_error(
+            [self.getWsName() + '/frbasic',
+             self.getWsName() + '/bad_file_type'],
+            ('File type from reads Workspace object is illegal: .xls. ' +
+             'Expected FASTQ file. Reads object bad_file_type ({}). ' +
+             'Shock node {}').format(
+                self.staged['bad_file_type']['ref'],
+                self.staged['bad_file_type']['fwd_node_id']))
+
     def test_bad_file_type_good_compress_ext(self):
 
         self.download_error(
@@ -2639,6 +3235,33 @@ class ReadsUtilsTest(unittest.TestCase):
             'wubba. Allowed values are "true", "false", and null.',
             interleave='wubba')
 
+    def test_bad_max_parallel(self):
+        for max_parallel in [0, -1, 1.5, 'foo', True]:
+            with self.assertRaises(ValueError) as context:
+                self.impl.download_reads(
+                    self.ctx, {'read_libraries': ['foo'],
+                               'max_parallel': max_parallel})
+            self.assertEqual('max_parallel must be an integer > 0',
+                             str(context.exception.message))
+
+    def test_bad_use_cache(self):
+        with self.assertRaises(ValueError) as context:
+            self.impl.download_reads(
+                self.ctx, {'read_libraries': ['foo'], 'use_cache': 2})
+        self.assertEqual('use_cache must be 0 or 1',
+                         str(context.exception.message))
+
+    def test_bad_compression(self):
+        for compression in ['bzip2', 1, ['gzip']]:
+            with self.assertRaises(ValueError) as context:
+                self.impl.download_reads(
+                    self.ctx, {'read_libraries': ['foo'],
+                               'compression': compression})
+            self.assertEqual(
+                ('compression must be one of none, gzip, gzip-fast, zstd, ' +
+                 'native'),
+                str(context.exception.message))
+
     def test_bad_deinterleave(self):
         self.download_error(
             [self.getWsName() + '/int_miss_line'],
@@ -2691,6 +3314,365 @@ class ReadsUtilsTest(unittest.TestCase):
             interleave='true',
             do_startswith=True)
 
+    def test_interleave_small_blocks(self):
+        # records and blank lines split across block and batch boundaries
+        impl = ReadsUtils(self.cfg)
+        impl.READ_BLOCK_SIZE = 7
+        impl.INTERLEAVE_BATCH_RECORDS = 3
+        for fwd, rev, md5 in [
+                ('data/small.forward.fq', 'data/small.reverse.fq',
+                 self.MD5_FR_TO_I),
+                ('data/Sample5_noninterleaved.1.blank_lines.fastq',
+                 'data/Sample5_noninterleaved.2.fastq',
+                 self.MD5_FR_TO_I_BLANK)]:
+            target = os.path.join(self.scratch, 'small_blocks.inter.fastq')
+            impl.interleave(None, None, None, None, None, None, fwd, rev,
+                            target, None, None, None)
+            self.assertEqual(self.md5(target), md5)
+
+        with self.assertRaises(ValueError) as context:
+            impl.interleave(
+                None, None, None, None, None, None,
+                'data/Sample5_noninterleaved.1.missing_line.fastq',
+                'data/Sample5_noninterleaved.2.fastq', target, 'local',
+                None, None)
+        self.assertEqual(
+            'Reading FASTQ record failed - non-blank lines are not a ' +
+            'multiple of four. Shock node None, Shock filename None',
+            str(context.exception.message))
+
+    def test_fq_stats_small_blocks(self):
+        # matches the ea-utils stats in test_interleaved_with_pe_inputs
+        impl = ReadsUtils(self.cfg)
+        impl.READ_BLOCK_SIZE = 7
+        d = impl.get_fq_stats(
+            {}, 'data/Sample5_interleaved_blank_lines.fastq')
+        self.assertEqual(d['read_count'], 4)
+        self.assertEqual(d['total_bases'], 1004)
+        self.assertEqual(d['number_of_duplicates'], 0)
+        self.assertEqual(d['base_percentages'],
+                         {'A': 20, 'T': 20, 'N': 0, 'C': 26.4286,
+                          'G': 33.5714})
+        self.assertEqual(d["phred_type"], "33")
+        self.assertEqual(d["qual_mean"], 25.1143)
+        self.assertEqual(d["qual_min"], 10)
+        self.assertEqual(d["qual_max"], 40)
+        self.assertEqual(d["qual_stdev"], 10.081)
+        self.assertEqual(d["gc_content"], 0.6)
+        self.assertEqual(d["read_length_mean"], 251)
+        self.assertEqual(d["read_length_stdev"], 0)
+
+    def test_deinterleave_small_blocks(self):
+        impl = ReadsUtils(self.cfg)
+        impl.READ_BLOCK_SIZE = 7
+        impl.INTERLEAVE_BATCH_RECORDS = 3
+        fwd = os.path.join(self.scratch, 'small_blocks.fwd.fastq')
+        rev = os.path.join(self.scratch, 'small_blocks.rev.fastq')
+        impl.deinterleave(None, None, None, None,
+                          'data/Sample5_interleaved_blank_lines.fastq',
+                          fwd, rev)
+        self.assertEqual(self.md5(fwd), self.MD5_I_BLANK_TO_F)
+        self.assertEqual(self.md5(rev), self.MD5_I_BLANK_TO_R)
+
+        with self.assertRaises(ValueError) as context:
+            impl.deinterleave('1/2/3', 'foo', 'bar', 'node',
+                              'data/Sample5_interleaved_missing_line.fastq',
+                              fwd, rev)
+        self.assertEqual(
+            'Deinterleave failed - line count is not divisible by 8. ' +
+            'Workspace reads object foo (1/2/3), Shock node node, ' +
+            'Shock filename bar.', str(context.exception.message))
+        self.assertFalse(os.path.exists(fwd))
+        self.assertFalse(os.path.exists(rev))
+
+    def test_client_registry(self):
+        class StandIn(object):
+            def __init__(self, url):
+                self.url = url
+
+        clients = ClientRegistry('http://callback', 'http://ws',
+                                 dfu_class=StandIn, ws_class=StandIn)
+        dfu = clients.dfu()
+        self.assertIs(dfu, clients.dfu())
+        self.assertEqual(dfu.url, 'http://callback')
+        self.assertEqual(clients.ws().url, 'http://ws')
+        self.assertIsNot(dfu, clients.ws())
+
+        impl = ReadsUtils(self.cfg)
+        self.assertIsInstance(impl.clients.dfu(), DataFileUtil)
+        self.assertIs(impl.clients.dfu(), impl.clients.dfu())
+        self.assertIsInstance(impl.clients.ws(), Workspace)
+
+    def test_wait_for_job(self):
+        for baseclient in (dfu_baseclient, ru_baseclient):
+            self.check_wait_for_job(baseclient)
+
+    def check_wait_for_job(self, baseclient):
+        class Clock(object):
+            def __init__(self):
+                self.now = 1000.0
+                self.waits = []
+
+            def time(self):
+                return self.now
+
+            def sleep(self, seconds):
+                self.waits.append(seconds)
+                self.now += seconds
+
+            def elapsed(self):
+                # elapsed time at each job check
+                return [sum(self.waits[:i + 1])
+                        for i in range(len(self.waits))]
+
+        method = 'WaitTest.run_job'
+        baseclient._job_durations.pop(method, None)
+        self.addCleanup(baseclient._job_durations.pop, method, None)
+        client = baseclient.BaseClient('http://localhost', token='token',
+                                       async_job_check_jitter_percent=0)
+
+        def run_job(job_id, duration, client=client):
+            clock = Clock()
+            finish = clock.now + duration
+
+            def check_job(service, checked_id):
+                self.assertEqual(service, 'WaitTest')
+                self.assertEqual(checked_id, job_id)
+                return {'finished': clock.now >= finish - 1e-9}
+            with patch.object(baseclient, 'time', clock), \
+                    patch.object(client, '_check_job', check_job):
+                self.assertEqual(client._wait_for_job(method, job_id),
+                                 {'finished': True})
+            return clock
+
+        def check_late_waits(clock, after):
+            elapsed = clock.elapsed()
+            for prev, wait in zip(elapsed, clock.waits[1:]):
+                if prev >= after:
+                    self.assertLessEqual(wait, max(prev * 0.2, 1.0) + 1e-9)
+
+        def check_metrics(clock, job_id):
+            metrics = baseclient.get_job_metrics()[-1]
+            self.assertEqual(metrics['method'], method)
+            self.assertEqual(metrics['job_id'], job_id)
+            self.assertAlmostEqual(metrics['duration'], clock.now - 1000.0)
+            self.assertEqual(metrics['polls'], len(clock.waits))
+            self.assertAlmostEqual(metrics['max_notice_delay'],
+                                   clock.waits[-1])
+            return metrics['duration']
+
+        # no history: waits grow from 100 ms by 150% and are capped at 20%
+        # of the elapsed time, but never below 1 s
+        clock = run_job('job1', 10)
+        expected = [0.1, 0.15, 0.225, 0.3375, 0.50625, 0.759375,
+                    1.0, 1.0, 1.0]
+        for want, got in zip(expected, clock.waits):
+            self.assertAlmostEqual(got, want)
+        self.assertGreater(len(clock.waits), len(expected))
+        check_late_waits(clock, 0)
+        d1 = check_metrics(clock, 'job1')
+        self.assertGreaterEqual(d1, 10)
+        self.assertLessEqual(d1 - 10, clock.waits[-1])
+        self.assertAlmostEqual(baseclient._expected_job_duration(method), d1)
+
+        # with history, the check that would overshoot the expected duration
+        # is pulled in to land on it
+        clock = run_job('job2', 10)
+        self.assertAlmostEqual(clock.now - 1000.0, d1)
+        for prev, wait in zip(clock.waits, clock.waits[1:-1]):
+            self.assertAlmostEqual(wait, prev * 1.5)
+        self.assertLess(clock.waits[-1], clock.waits[-2] * 1.5)
+        d2 = check_metrics(clock, 'job2')
+        self.assertAlmostEqual(baseclient._expected_job_duration(method), d1)
+
+        # a job running past the expected duration falls back to the
+        # late cap, and the rolling average moves 30% towards it
+        clock = run_job('job3', 60)
+        self.assertIn(round(d1, 6), [round(e, 6) for e in clock.elapsed()])
+        check_late_waits(clock, d1)
+        d3 = check_metrics(clock, 'job3')
+        self.assertGreaterEqual(d3, 60)
+        self.assertLessEqual(d3 - 60, 60 * 0.2)
+        self.assertAlmostEqual(baseclient._expected_job_duration(method),
+                               d2 + 0.3 * (d3 - d2))
+
+        # jitter spreads each wait within +/- the jitter percent
+        jittery = baseclient.BaseClient('http://localhost', token='token',
+                                        async_job_check_jitter_percent=10)
+        with patch.object(baseclient._random, 'uniform',
+                          return_value=1.1) as uniform:
+            clock = run_job('job4', 0.1, client=jittery)
+        self.assertEqual(len(clock.waits), 1)
+        self.assertAlmostEqual(clock.waits[0], 0.11)
+        low, high = uniform.call_args[0]
+        self.assertAlmostEqual(low, 0.9)
+        self.assertAlmostEqual(high, 1.1)
+        self.assertAlmostEqual(baseclient.get_job_metrics()[-1][
+            'max_notice_delay'], 0.1)
+
+    def test_retry_reset_connection(self):
+        for baseclient in (dfu_baseclient, ru_baseclient):
+            self.check_retry_reset_connection(baseclient)
+
+    def check_retry_reset_connection(self, baseclient):
+        # a server that answers the first request on each connection and
+        # resets the connection on the next, like a server dropping an idle
+        # keep-alive connection as the client reuses it
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        self.addCleanup(server.close)
+        connections = []
+        body = b'{"version": "1.1", "result": [{"finished": 1}]}'
+
+        def handle(conn):
+            for answer in (True, False):
+                data = b''
+                while b'\r\n\r\n' not in data:
+                    data += conn.recv(4096)
+                head, rest = data.split(b'\r\n\r\n', 1)
+                length = int(re.search(b'(?i)content-length: *(\\d+)',
+                                       head).group(1))
+                while len(rest) < length:
+                    rest += conn.recv(4096)
+                if not answer:
+                    conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER,
+                                    struct.pack('ii', 1, 0))
+                    conn.close()
+                    return
+                conn.sendall(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n' +
+                    b'Content-Length: ' + str(len(body)).encode() +
+                    b'\r\n\r\n' + body)
+
+        def serve():
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.error:
+                    return
+                connections.append(conn)
+                t = threading.Thread(target=handle, args=(conn,))
+                t.daemon = True
+                t.start()
+        t = threading.Thread(target=serve)
+        t.daemon = True
+        t.start()
+
+        client = baseclient.BaseClient(
+            'http://127.0.0.1:{}'.format(server.getsockname()[1]),
+            token='token')
+        # job state checks are retried on a new connection
+        self.assertEqual(client._check_job('RetryTest', 'job1'),
+                         {'finished': 1})
+        self.assertEqual(client._check_job('RetryTest', 'job1'),
+                         {'finished': 1})
+        self.assertEqual(len(connections), 2)
+        # other calls may not be safe to repeat, so are not
+        self.assertEqual(client.call_method('RetryTest.run', []),
+                         {'finished': 1})
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.call_method('RetryTest.run', [])
+        self.assertEqual(len(connections), 3)
+
+    def test_session_per_process(self):
+        for baseclient in (dfu_baseclient, ru_baseclient):
+            session = baseclient._get_session('http://localhost', 2, 1)
+            self.assertIs(baseclient._get_session('http://localhost', 2, 1),
+                          session)
+            # a forked process doesn't share the connections it inherits
+            with patch.object(baseclient._os, 'getpid',
+                              return_value=os.getpid() + 1):
+                child = baseclient._get_session('http://localhost', 2, 1)
+            self.assertIsNot(child, session)
+
+    def test_workspace_id_cache(self):
+        lookups = []
+
+        def lookup(name):
+            lookups.append(name)
+            if name == 'missing':
+                raise DFUError('DFUError', -32500, 'No such workspace')
+            return 42
+
+        cache = WorkspaceIDCache(1000)
+        self.assertEqual(cache.get('ws', lookup), 42)
+        self.assertEqual(cache.get('ws', lookup), 42)
+        self.assertEqual(lookups, ['ws'])
+        cache.invalidate('ws')
+        self.assertEqual(cache.get('ws', lookup), 42)
+        self.assertEqual(lookups, ['ws', 'ws'])
+        for _ in range(2):
+            with self.assertRaises(DFUError):
+                cache.get('missing', lookup)
+        self.assertEqual(lookups, ['ws', 'ws', 'missing', 'missing'])
+
+        expired = WorkspaceIDCache(0)
+        expired.get('ws', lookup)
+        expired.get('ws', lookup)
+        self.assertEqual(lookups[-2:], ['ws', 'ws'])
+
+        impl = ReadsUtils(self.cfg)
+        wsid = impl.ws_ids.get(self.ws_info[1], self.dfu.ws_name_to_id)
+        self.assertEqual(wsid, self.ws_info[0])
+        self.assertEqual(impl.ws_ids.get(self.ws_info[1], lookup), wsid)
+
+    def test_parallel_gzip_writer(self):
+        with open('data/small.forward.fq', 'rb') as f:
+            data = f.read()
+        tempdir = tempfile.mkdtemp(dir=self.scratch)
+        single = os.path.join(tempdir, 'single.fq.gz')
+        with ParallelGzipWriter(single, 3, 4, len(data)) as w:
+            w.write(data)
+        expected = os.path.join(tempdir, 'expected', 'single.fq.gz')
+        os.mkdir(os.path.dirname(expected))
+        with gzip.open(expected, 'wb', 3) as f:
+            f.write(data)
+        # one block is the same as the gzip module writes, bar the mtime
+        self.assertEqual(os.path.getsize(single), os.path.getsize(expected))
+
+        blocks = os.path.join(tempdir, 'blocks.fq.gz')
+        with ParallelGzipWriter(blocks, 3, 4, 100000) as w:
+            for i in range(0, len(data), 65537):
+                w.write(data[i:i + 65537])
+        with gzip.open(blocks, 'rb') as f:
+            self.assertEqual(f.read(), data)
+        self.assertEqual(subprocess.check_output(['gunzip', '-c', blocks]),
+                         data)
+
+        empty = os.path.join(tempdir, 'empty.fq.gz')
+        with ParallelGzipWriter(empty, 3, 4, 100000):
+            pass
+        with gzip.open(empty, 'rb') as f:
+            self.assertEqual(f.read(), b'')
+
+    def test_parallel_gzip_reader(self):
+        with open('data/small.forward.fq', 'rb') as f:
+            data = f.read()
+        tempdir = tempfile.mkdtemp(dir=self.scratch)
+        multi = os.path.join(tempdir, 'multi.fq.gz')
+        with ParallelGzipWriter(multi, 3, 4, 100000) as w:
+            w.write(data)
+        single = os.path.join(tempdir, 'single.fq.gz')
+        with gzip.open(single, 'wb') as f:
+            f.write(data)
+        # a member after one too long to split is read serially
+        both = os.path.join(tempdir, 'both.fq.gz')
+        with open(both, 'wb') as f:
+            for path in [multi, single]:
+                with open(path, 'rb') as s:
+                    f.write(s.read())
+        for path, expected in [(multi, data), (single, data),
+                               (both, data + data)]:
+            for workers in [1, 4]:
+                with open_reads_file(path, 10000, workers) as f:
+                    out = []
+                    d = f.read(7000)
+                    while d:
+                        out.append(d)
+                        d = f.read(7000)
+                self.assertEqual(b''.join(out), expected)
+
     def download_error(self, readnames, error,
                        interleave=None, exception=ValueError, do_startswith=False):
 
@@ -2716,7 +3698,8 @@ class ReadsUtilsTest(unittest.TestCase):
         else:
             self.assertEqual(error, str(context.exception.message))
 
-    def download_success(self, testspecs, interleave=None):
+    def download_success(self, testspecs, interleave=None, max_parallel=None,
+                         use_cache=None, compression=None):
         self.maxDiff = None
         test_name = inspect.stack()[1][3]
         print('\n**** starting expected success test: ' + test_name + ' ***\n')
@@ -2726,6 +3709,16 @@ class ReadsUtilsTest(unittest.TestCase):
                   }
         if interleave != 'none':
             params['interleaved'] = interleave
+        if max_parallel:
+            params['max_parallel'] = max_parallel
+        if use_cache is not None:
+            params['use_cache'] = use_cache
+        # the expected encoding, unless the testspec files give one
+        encoding = 'none'
+        if compression:
+            params['compression'] = compression
+            if compression.startswith('gzip'):
+                encoding = 'gzip'
 
         print('Running test with {} libs. Params:'.format(len(testspecs)))
         pprint(params)
@@ -2738,15 +3731,18 @@ class ReadsUtilsTest(unittest.TestCase):
         for f in testspecs:
             wsref = self.getWsName() + '/' + f
             print('== checking testspec ' + f)
+            testspecs[f]['obj']['files'].setdefault('encoding', encoding)
+            ext, open_ = {'none': ('', open), 'gzip': ('.gz', gzip.open)}[
+                testspecs[f]['obj']['files']['encoding']]
             for dirc in testspecs[f]['md5']:
                 print('\t== checking md5s for read set ' + dirc)
                 expectedmd5 = testspecs[f]['md5'][dirc]
                 file_ = retmap[wsref]['files'][dirc]
                 fileext = testspecs[f]['fileext'][dirc]
-                if not file_.endswith('.' + fileext + '.fastq'):
-                    raise TestError('Expected file {} to end with .{}.fastq'
-                                    .format(file_, fileext))
-                self.assertEqual(expectedmd5, self.md5(file_))
+                if not file_.endswith('.' + fileext + '.fastq' + ext):
+                    raise TestError('Expected file {} to end with .{}.fastq{}'
+                                    .format(file_, fileext, ext))
+                self.assertEqual(expectedmd5, self.md5(file_, open_))
                 del retmap[wsref]['files'][dirc]
             self.assertDictEqual(testspecs[f]['obj'], retmap[wsref])
 
@@ -2775,17 +3771,45 @@ class ReadsUtilsTest(unittest.TestCase):
             self.impl.export_reads(self.ctx, {'input_ref': ref})
         self.assertEqual(error, str(context.exception.message))
 
-    def export_success(self, stagedname, fwdmd5, revmd5=None):
-        test_name = inspect.stack()[1][3]
-        print('\n*** starting expected export pass test: ' + test_name + ' **')
-        shocknode = self.impl.export_reads(
-            self.ctx,
-            {'input_ref': self.staged[stagedname]['ref']})[0]['shock_id']
+    def test_export_batch(self):
+        refs = [self.staged['frbasic']['ref'],
+                self.staged['single_end']['ref']]
+        shock_ids = self.impl.export_reads_batch(
+            self.ctx, {'input_refs': refs, 'max_parallel': 2}
+            )[0]['shock_ids']
+        self.assertEqual(sorted(shock_ids.keys()), sorted(refs))
+        self.assertNotEqual(shock_ids[refs[0]], shock_ids[refs[1]])
+        self.check_export(shock_ids[refs[0]], 'frbasic', 'test_export_batch',
+                          self.MD5_SM_F, self.MD5_SM_R)
+        self.check_export(shock_ids[refs[1]], 'single_end',
+                          'test_export_batch', self.MD5_SM_F)
+
+    def test_export_batch_single_archive(self):
+        refs = [self.staged['frbasic']['ref'],
+                self.staged['single_end']['ref']]
+        shock_ids = self.impl.export_reads_batch(
+            self.ctx, {'input_refs': refs, 'single_archive': 1}
+            )[0]['shock_ids']
+        self.assertEqual(shock_ids[refs[0]], shock_ids[refs[1]])
+        tempdir = self.download_export(
+            shock_ids[refs[0]], 'reads_export',
+            'test_export_batch_single_archive')
+        self.assertEqual(
+            sorted(d for d in os.listdir(tempdir) if not d.endswith('.zip')),
+            ['frbasic', 'single_end'])
+
+    def test_fail_export_batch_no_refs(self):
+        with self.assertRaises(ValueError) as context:
+            self.impl.export_reads_batch(self.ctx, {'input_refs': []})
+        self.assertEqual('At least one reads object must be provided',
+                         str(context.exception.message))
+
+    def download_export(self, shocknode, zipname, test_name):
         node_url = self.shockURL + '/node/' + shocknode
         headers = {'Authorization': 'OAuth ' + self.token}
         r = requests.get(node_url, headers=headers, allow_redirects=True)
         fn = r.json()['data']['file']['name']
-        self.assertEquals(fn, stagedname + '.zip')
+        self.assertEquals(fn, zipname + '.zip')
         tempdir = tempfile.mkdtemp(dir=self.scratch)
         file_path = os.path.join(tempdir, test_name) + '.zip'
         print('zip file path: ' + file_path)
@@ -2798,23 +3822,39 @@ class ReadsUtilsTest(unittest.TestCase):
                     break
                 fhandle.write(chunk)
         with ZipFile(file_path) as z:
+            for zi in z.infolist():
+                if zi.filename.endswith('.gz'):
+                    # gzipped reads aren't compressed again
+                    self.assertEqual(zi.compress_type, ZIP_STORED)
             z.extractall(tempdir)
         print('zip file contents: ' + str(os.listdir(tempdir)))
+        return tempdir
+
+    def export_success(self, stagedname, fwdmd5, revmd5=None):
+        test_name = inspect.stack()[1][3]
+        print('\n*** starting expected export pass test: ' + test_name + ' **')
+        shocknode = self.impl.export_reads(
+            self.ctx,
+            {'input_ref': self.staged[stagedname]['ref']})[0]['shock_id']
+        self.check_export(shocknode, stagedname, test_name, fwdmd5, revmd5)
+
+    def check_export(self, shocknode, stagedname, test_name, fwdmd5,
+                     revmd5=None):
+        tempdir = self.download_export(shocknode, stagedname, test_name)
         foundf = False
         foundr = False
         for f in os.listdir(tempdir):
+            open_ = gzip.open if f.endswith('.gz') else open
             if '.fwd.' in f or '.inter.' in f or '.single.' in f:
                 foundf = True
                 print('fwd reads: ' + f)
-                with open(os.path.join(tempdir, f)) as fl:
-                    md5 = hashlib.md5(fl.read()).hexdigest()
-                    self.assertEqual(md5, fwdmd5)
+                self.assertEqual(
+                    self.md5(os.path.join(tempdir, f), open_), fwdmd5)
             if '.rev.' in f:
                 foundr = True
                 print('rev reads: ' + f)
-                with open(os.path.join(tempdir, f)) as fl:
-                    md5 = hashlib.md5(fl.read()).hexdigest()
-                    self.assertEqual(md5, revmd5)
+                self.assertEqual(
+                    self.md5(os.path.join(tempdir, f), open_), revmd5)
         if not foundf:
             raise TestError('no fwd reads file')
         if revmd5 and not foundr:
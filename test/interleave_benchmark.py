@@ -0,0 +1,86 @@
+'''
+Compares the records/sec of the block based ReadsUtils.interleave with the
+original record at a time interleave loop on synthetic paired end reads.
+
+Usage: python interleave_benchmark.py [record count] [read length]
+Run from the test directory with ../lib on the PYTHONPATH.
+'''
+from __future__ import print_function
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDK_CALLBACK_URL', 'http://localhost')
+from ReadsUtils.ReadsUtilsImpl import ReadsUtils  # @IgnorePep8 # noqa
+
+
+def write_reads(path, records, length, direction):
+    with open(path, 'w') as f:
+        for i in range(records):
+            seq = ''.join(random.choice('ACGT') for _ in range(length))
+            f.write('@read{}/{}\n{}\n+\n{}\n'.format(
+                i, direction, seq, 'I' * length))
+
+
+def read_record(f):
+    # the original per record reader, without the error handling
+    r = ''
+    for _ in range(4):
+        line = f.readline()
+        while line == '\n':
+            line = f.readline()
+        if not line:
+            return ''
+        r = r + line
+    return r
+
+
+def legacy_interleave(fwdpath, revpath, targetpath):
+    with open(targetpath, 'w') as t:
+        with open(fwdpath, 'r') as f, open(revpath, 'r') as r:
+            while True:
+                frec = read_record(f)
+                rrec = read_record(r)
+                if not frec:
+                    break
+                t.write(frec)
+                t.write(rrec)
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    tempdir = tempfile.mkdtemp()
+    try:
+        fwd = os.path.join(tempdir, 'fwd.fq')
+        rev = os.path.join(tempdir, 'rev.fq')
+        print('Writing {} read pairs of length {}'.format(records, length))
+        write_reads(fwd, records, length, 1)
+        write_reads(rev, records, length, 2)
+        impl = ReadsUtils({'scratch': tempdir, 'workspace-url': None})
+
+        timings = []
+        for name, func in [
+                ('record at a time', lambda t: legacy_interleave(fwd, rev, t)),
+                ('block', lambda t: impl.interleave(
+                    None, None, None, None, None, None, fwd, rev, t,
+                    None, None, None))]:
+            target = os.path.join(tempdir, 'inter.fq')
+            start = time.time()
+            func(target)
+            elapsed = time.time() - start
+            timings.append(elapsed)
+            os.remove(target)
+            print('{}: {:.2f} s, {:.0f} records/sec'.format(
+                name, elapsed, 2 * records / elapsed))
+        print('speedup: {:.1f}x'.format(timings[0] / timings[1]))
+    finally:
+        shutil.rmtree(tempdir)
+
+
+if __name__ == '__main__':
+    main()